@@ -0,0 +1,59 @@
+from typing import Dict
+
+from board import Board
+
+# numpy is optional, only needed to score many states at once
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchHeuristics:
+    # misplaced tile and manhattan distance for many states at once, as vectorized lookups into the board's
+    # tile-by-cell cost tables, giving exactly the same costs as the scalar Heuristics.calculate_* functions
+    # instances are cached per board, see BatchHeuristics.get
+    instances: Dict[int, "BatchHeuristics"] = {}
+
+    def __init__(self, board: Board):
+        if np is None:
+            raise ImportError("batched heuristics need numpy, install it with pip install numpy")
+        self.board = board
+        # manhattan_table[tile, cell] and misplaced_table[tile, cell] as in Board, small enough for any board size
+        self.manhattan_table = np.array(board.manhattan_table, dtype=np.int32)
+        self.misplaced_table = np.array(board.misplaced_table, dtype=np.int32)
+        self.cells = np.arange(board.cells)
+        # packed states are unpacked with numpy while they fit in 64 bits, which is up to the 15-puzzle
+        self.shifts = np.array(board.shifts, dtype=np.uint64) if board.bits * board.cells <= 64 else None
+
+    @classmethod
+    def get(cls, board: Board) -> "BatchHeuristics":
+        if board.size not in cls.instances:
+            cls.instances[board.size] = cls(board)
+        return cls.instances[board.size]
+
+    def tiles(self, states) -> "np.ndarray":
+        # (N, cells) array of tiles from N states, either a sequence of packed ints or an array-like of shape
+        # (N, cells) or (N, size, size)
+        if not isinstance(states, np.ndarray):
+            states = list(states)
+            if states and isinstance(states[0], int):
+                # packed states too wide for 64 bits stay python ints
+                states = np.array(states, dtype=object if self.shifts is None else np.uint64)
+            else:
+                states = np.array(states, dtype=np.int64)
+        if states.ndim == 1:
+            if self.shifts is None:
+                tiles = [self.board.tiles(int(key)) for key in states]
+                return np.array(tiles, dtype=np.int64).reshape(len(states), self.board.cells)
+            keys = states.astype(np.uint64)
+            return ((keys[:, None] >> self.shifts[None, :]) & np.uint64(self.board.mask)).astype(np.int64)
+        return states.reshape(len(states), self.board.cells).astype(np.int64)
+
+    def manhattan_distance(self, states) -> "np.ndarray":
+        # manhattan distance of every state, a 1-d array with one cost per state
+        return self.manhattan_table[self.tiles(states), self.cells].sum(axis=1)
+
+    def misplaced_tile(self, states) -> "np.ndarray":
+        # number of misplaced tiles of every state, the blank isn't counted
+        return self.misplaced_table[self.tiles(states), self.cells].sum(axis=1)
@@ -0,0 +1,130 @@
+from typing import Iterable, Iterator, List, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import argparse
+import os
+import sys
+
+from board import Board
+from heuristics import SOLVERS, Heuristics
+from puzzle_io import check_puzzle, parse_puzzle, read_puzzle_lines, write_results
+from search_profile import SearchProfile
+from solution_cache import SolutionCache
+
+# puzzles sent to a worker at a time, enough that the cost of passing them between processes is small next to solving
+DEFAULT_CHUNK_SIZE = 16
+# solutions each process keeps in its cache, 0 turns caching off
+DEFAULT_CACHE_SIZE = 100000
+
+# cache of the current worker process, set up by prepare_worker
+worker_cache = None
+
+
+def prepare_worker(algorithm: str, cache_size: int = 0, cache_path: str = None):
+    # runs once in every worker process, solving the 8-puzzle goal state so the board tables and any heuristic tables
+    # the algorithm uses are built or memory-mapped before the first real puzzle instead of during it
+    # each worker starts its own cache from cache_path, solutions found by workers aren't saved back to it
+    global worker_cache
+    Heuristics(Board.of(3).goal_state()).solve(algorithm)
+    worker_cache = SolutionCache(cache_size, cache_path) if cache_size > 0 else None
+
+
+def solve_chunk(algorithm: str, chunk, cache: SolutionCache = None, profile: bool = False) -> List[dict]:
+    # solves a list of (index, puzzle) pairs, a puzzle is either a nested list or a line to parse
+    # uses the worker's cache if no cache is given, with profile every search is profiled (see SearchProfile)
+    cache = cache or worker_cache
+    results = []
+    for index, puzzle in chunk:
+        try:
+            if isinstance(puzzle, str):
+                puzzle = puzzle.strip()
+                puzzle = parse_puzzle(puzzle)
+            else:
+                check_puzzle(puzzle)
+            result = Heuristics(puzzle, profile=SearchProfile() if profile else None).solve(algorithm, cache).to_dict()
+        except ValueError as error:
+            result = {"status": "invalid", "error": str(error)}
+        results.append({"index": index, "puzzle": puzzle, "algorithm": algorithm, **result})
+    return results
+
+
+def solve_batch(puzzles: Iterable[Union[List[List[int]], str]], algorithm: str = "manhattan", workers: int = None,
+                ordered: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE, cache_size: int = DEFAULT_CACHE_SIZE,
+                cache_path: str = None, profile: bool = False) -> Iterator[dict]:
+    # solves a stream of puzzles across a pool of worker processes, yielding one result dict per puzzle
+    # puzzles can be nested lists or lines in the format puzzle_io.parse_puzzle reads, a puzzle that isn't valid
+    # gives a result with status "invalid" instead of stopping the batch
+    # results come back in input order if ordered, else as soon as they're done, either way "index" gives the position
+    # of the puzzle in the input
+    # only a few chunks per worker are read ahead, so memory stays flat however long the stream is
+    # workers defaults to the number of cores, with 1 everything runs in this process
+    # repeated puzzles are answered from a solution cache of cache_size entries per process, started from cache_path
+    # if given, which is only written back to when running in this process
+    # with profile, every result has the "profile" of its search
+    if algorithm not in SOLVERS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, choose from {', '.join(SOLVERS)}")
+    numbered = enumerate(puzzles)
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+
+    if workers == 1:
+        # puzzles are solved one at a time as soon as they're read, so a caller feeding them one by one gets each
+        # answer before having to send the next puzzle
+        cache = SolutionCache(cache_size, cache_path) if cache_size > 0 else None
+        for item in numbered:
+            yield from solve_chunk(algorithm, [item], cache, profile)
+        if cache is not None and cache_path is not None:
+            cache.save()
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers, initializer=prepare_worker,
+                             initargs=(algorithm, cache_size, cache_path)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, algorithm, chunk, None, profile))
+            # wait for results before reading further ahead
+            if len(pending) >= 2 * workers:
+                yield from next_results(pending, ordered)
+        while pending:
+            yield from next_results(pending, ordered)
+
+
+def next_results(pending: deque, ordered: bool) -> List[dict]:
+    # waits for the oldest chunk if ordered, else for any chunk, and removes it from pending
+    if ordered:
+        return pending.popleft().result()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    results = []
+    for future in done:
+        pending.remove(future)
+        results.extend(future.result())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many puzzles in parallel, one puzzle per input line, writing "
+                                                 "one JSON result per line.")
+    parser.add_argument("input", nargs="?", default="-", help="file of puzzles, - for standard input (default)")
+    parser.add_argument("--algorithm", choices=SOLVERS, default="manhattan", help="search to run (default manhattan)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default number of cores)")
+    parser.add_argument("--unordered", action="store_true", help="write results as they finish, not in input order")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="puzzles sent to a worker at once")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"solutions cached per process, 0 to turn off (default {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--cache-file", help="file to load cached solutions from, and save them to with --workers 1")
+    parser.add_argument("--profile", action="store_true", help="add search counters and timers to every result")
+    args = parser.parse_args(argv)
+
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    with input_file:
+        lines = read_puzzle_lines(input_file)
+        results = solve_batch(lines, args.algorithm, args.workers, not args.unordered, args.chunk_size,
+                              args.cache_size, args.cache_file, args.profile)
+        write_results(results, sys.stdout)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
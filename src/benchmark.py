@@ -0,0 +1,139 @@
+from typing import Dict, List, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import argparse
+import json
+import platform
+import random
+import resource
+import sys
+
+from board import Board
+from heuristics import SOLVERS, Heuristics
+
+# bumped whenever the output format changes, so old and new results aren't compared by mistake
+BENCHMARK_VERSION = 1
+DEFAULT_SEED = 170
+DEFAULT_PER_DEPTH = 3
+# the hardest 8-puzzle states are 31 moves from the goal
+MAX_DEPTH = 31
+
+
+def depth_layers(board: Board, max_depth: int = None) -> List[List[int]]:
+    # every reachable state up to max_depth moves from the goal grouped by its optimal depth, by breadth first search
+    # from the goal, successors are generated in a fixed order, so the layers are always in the same order too
+    layers = [[board.goal_key]]
+    seen = {board.goal_key: board.goal_blank}
+    while layers[-1] and (max_depth is None or len(layers) <= max_depth):
+        next_layer = []
+        for key in layers[-1]:
+            for child_key, child_blank, _ in board.successors(key, seen[key]):
+                if child_key not in seen:
+                    seen[child_key] = child_blank
+                    next_layer.append(child_key)
+        layers.append(next_layer)
+    return [layer for layer in layers if layer]
+
+
+def stratified_puzzles(per_depth: int = DEFAULT_PER_DEPTH, seed: int = DEFAULT_SEED,
+                       max_depth: int = MAX_DEPTH) -> List[Tuple[int, int]]:
+    # (optimal depth, packed state) of per_depth random 8-puzzles at every depth from 0 to max_depth, the same
+    # puzzles for the same seed, depths with fewer states (only 1 at depth 0 and 2 at depth 31) give all of them
+    rng = random.Random(seed)
+    puzzles = []
+    for depth, layer in enumerate(depth_layers(Board.of(3), max_depth)):
+        puzzles.extend((depth, key) for key in rng.sample(layer, min(per_depth, len(layer))))
+    return puzzles
+
+
+def empty_stats() -> dict:
+    return {"puzzles": 0, "solved": 0, "optimal": 0, "nodes_expanded": 0, "nodes_generated": 0,
+            "max_queue_size": 0, "wall_time": 0.0}
+
+
+def add_stats(stats: dict, depth: int, result) -> None:
+    stats["puzzles"] += 1
+    stats["solved"] += result.solved
+    stats["optimal"] += result.depth == depth
+    stats["nodes_expanded"] += result.nodes_expanded
+    stats["nodes_generated"] += result.nodes_generated
+    stats["max_queue_size"] = max(stats["max_queue_size"], result.max_queue_size)
+    stats["wall_time"] += result.wall_time
+
+
+def run_algorithm(algorithm: str, puzzles: Sequence[Tuple[int, int]]) -> dict:
+    # solves every puzzle with one algorithm and sums its stats per depth and overall, run in a fresh process so
+    # the peak resident set size belongs to this algorithm alone
+    board = Board.of(3)
+    # build or load any tables the algorithm uses first, so that isn't counted in the first puzzle's time
+    Heuristics(board.goal_state()).solve(algorithm)
+
+    total = empty_stats()
+    by_depth: Dict[str, dict] = {}
+    for depth, key in puzzles:
+        result = Heuristics(board.unpack(key)).solve(algorithm)
+        add_stats(total, depth, result)
+        add_stats(by_depth.setdefault(str(depth), empty_stats()), depth, result)
+
+    # kilobytes on Linux
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"total": total, "by_depth": by_depth, "peak_rss_kb": peak_rss_kb}
+
+
+def run_benchmark(algorithms: Sequence[str], per_depth: int = DEFAULT_PER_DEPTH, seed: int = DEFAULT_SEED,
+                  max_depth: int = MAX_DEPTH) -> dict:
+    # benchmarks every algorithm on the same stratified puzzles, each in its own freshly started process
+    for algorithm in algorithms:
+        if algorithm not in SOLVERS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, choose from {', '.join(SOLVERS)}")
+    puzzles = stratified_puzzles(per_depth, seed, max_depth)
+    board = Board.of(3)
+
+    results = {}
+    for algorithm in algorithms:
+        # spawned, not forked, so the process doesn't start out with this one's memory
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            results[algorithm] = executor.submit(run_algorithm, algorithm, puzzles).result()
+
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "seed": seed,
+        "per_depth": per_depth,
+        "max_depth": max_depth,
+        # in the one line format puzzle_io.parse_puzzle reads
+        "puzzles": [{"depth": depth, "puzzle": ", ".join(map(str, board.tiles(key)))} for depth, key in puzzles],
+        "results": results,
+    }
+
+
+def write_report(report: dict, path: str = "-"):
+    # writes a report as JSON to path, - for standard output, sorted keys and one value per line keep the output
+    # stable to diff between versions
+    text = json.dumps(report, indent=1, sort_keys=True) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, "w") as file:
+            file.write(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark search algorithms on seeded random 8-puzzles stratified "
+                                                 "by optimal depth, writing the stats as JSON.")
+    parser.add_argument("--algorithms", nargs="+", choices=SOLVERS, default=list(SOLVERS),
+                        help="algorithms to benchmark (default all)")
+    parser.add_argument("--per-depth", type=int, default=DEFAULT_PER_DEPTH,
+                        help=f"puzzles at each depth (default {DEFAULT_PER_DEPTH})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default {DEFAULT_SEED})")
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH,
+                        help=f"deepest puzzles to include (default {MAX_DEPTH})")
+    parser.add_argument("--output", default="-", help="file to write the JSON to (default standard output)")
+    args = parser.parse_args(argv)
+
+    write_report(run_benchmark(args.algorithms, args.per_depth, args.seed, args.max_depth), args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
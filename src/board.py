@@ -0,0 +1,189 @@
+from typing import Dict, List, Tuple
+
+
+class Board:
+    # geometry of an n x n puzzle board and the packed-integer state encoding
+    # a state is packed into a single int with a fixed number of bits per cell, cell i (row-major) stored at bit
+    # offset bits * i, so the 8-puzzle and 15-puzzle fit in 64 bits
+    # packed states are immutable, cheap to copy and hash directly, so they can go straight into sets and dicts
+    # boards hold a lot of precomputed tables, so share them through Board.of instead of creating new ones
+    instances: Dict[int, "Board"] = {}
+
+    def __init__(self, size: int = 3):
+        if size < 2:
+            raise ValueError("board size must be at least 2")
+        self.size = size
+        self.cells = size * size
+        # number of bits used for each cell (enough for the largest tile, at least 4) and the mask to extract one cell
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        # bit offset of every cell
+        self.shifts = [i * self.bits for i in range(self.cells)]
+
+        # goal state has tiles in order with the blank in the last cell
+        self.goal_key = self.pack(self.goal_state())
+        self.goal_blank = self.cells - 1
+        # tile expected at each cell in the goal state
+        self.goal_tiles = self.tiles(self.goal_key)
+
+        # manhattan_table[tile][cell] is the distance from cell to the goal cell of tile, 0 for the blank
+        # misplaced_table[tile][cell] is 1 if tile doesn't belong in cell, 0 for the blank
+        self.manhattan_table = [[0] * self.cells for _ in range(self.cells)]
+        self.misplaced_table = [[0] * self.cells for _ in range(self.cells)]
+        for tile in range(1, self.cells):
+            goal_row, goal_col = divmod(tile - 1, size)
+            for cell in range(self.cells):
+                row, col = divmod(cell, size)
+                self.manhattan_table[tile][cell] = abs(row - goal_row) + abs(col - goal_col)
+                self.misplaced_table[tile][cell] = int(cell != tile - 1)
+
+        # neighbors[blank] lists the cells the blank can move to, in left, right, up, down order
+        self.neighbors = []
+        # move_table[blank] holds (target, target shift, blank shift) for every legal move of the blank
+        self.move_table = []
+        for blank in range(self.cells):
+            row, col = divmod(blank, size)
+            targets = []
+            if col > 0:
+                targets.append(blank - 1)
+            if col < size - 1:
+                targets.append(blank + 1)
+            if row > 0:
+                targets.append(blank - size)
+            if row < size - 1:
+                targets.append(blank + size)
+            self.neighbors.append(tuple(targets))
+            self.move_table.append(tuple((target, self.shifts[target], self.shifts[blank]) for target in targets))
+
+        # transposing the board maps the goal to itself once every tile is relabeled with the goal tile of its
+        # transposed goal cell, and turns every legal move into a legal move, so a state and its transpose are the same
+        # distance from the goal, see canonical
+        # transpose_cells[cell] is the cell mirrored across the main diagonal, transpose_tiles[tile] is the new label
+        # of tile
+        self.transpose_cells = [(cell % size) * size + cell // size for cell in range(self.cells)]
+        self.transpose_tiles = [0] + [self.transpose_cells[tile - 1] + 1 for tile in range(1, self.cells)]
+        # (shift, transposed shift) of every cell
+        self.transpose_shifts = [(self.shifts[cell], self.shifts[self.transpose_cells[cell]])
+                                 for cell in range(self.cells)]
+
+        # change in each heuristic when a tile slides between two cells, see delta_table
+        self.manhattan_delta = self.delta_table(self.manhattan_table)
+        self.misplaced_delta = self.delta_table(self.misplaced_table)
+
+    def manhattan_table_to(self, target_key: int) -> List[List[int]]:
+        # like manhattan_table, but distances are to where each tile is in target_key instead of the goal state
+        table = [[0] * self.cells for _ in range(self.cells)]
+        for target_cell, tile in enumerate(self.tiles(target_key)):
+            if tile == 0:
+                continue
+            target_row, target_col = divmod(target_cell, self.size)
+            for cell in range(self.cells):
+                row, col = divmod(cell, self.size)
+                table[tile][cell] = abs(row - target_row) + abs(col - target_col)
+        return table
+
+    def delta_table(self, tile_costs: List[List[int]]) -> List[List[List[int]]]:
+        # for a heuristic that sums a cost per tile and cell, builds delta[tile][source][destination]
+        # the child's h(n) is the parent's h(n) plus the delta of the one tile that moved
+        delta = [[[0] * self.cells for _ in range(self.cells)] for _ in range(self.cells)]
+        for tile in range(1, self.cells):
+            for source in range(self.cells):
+                # tiles only ever slide to a neighboring cell
+                for destination in self.neighbors[source]:
+                    delta[tile][source][destination] = tile_costs[tile][destination] - tile_costs[tile][source]
+        return delta
+
+    @classmethod
+    def of(cls, size: int) -> "Board":
+        # shared board for the given size, its tables are built the first time it's asked for
+        if size not in cls.instances:
+            cls.instances[size] = cls(size)
+        return cls.instances[size]
+
+    def goal_state(self) -> List[List[int]]:
+        # tiles 1 to (cells - 1) in row-major order, blank (0) in the bottom right
+        return [[(row * self.size + col + 1) % self.cells for col in range(self.size)] for row in range(self.size)]
+
+    def pack(self, state: List[List[int]]) -> int:
+        # convert a nested list state into its packed int
+        key = 0
+        cell = 0
+        for row in state:
+            for tile in row:
+                key |= tile << self.shifts[cell]
+                cell += 1
+        return key
+
+    def unpack(self, key: int) -> List[List[int]]:
+        # convert a packed int back into a nested list state
+        tiles = self.tiles(key)
+        return [tiles[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+    def tiles(self, key: int) -> List[int]:
+        # flat row-major list of the tiles in a packed state
+        mask = self.mask
+        return [(key >> shift) & mask for shift in self.shifts]
+
+    def tile_at(self, key: int, cell: int) -> int:
+        return (key >> self.shifts[cell]) & self.mask
+
+    def find_blank(self, key: int) -> int:
+        # index of the cell holding the blank
+        return self.tiles(key).index(0)
+
+    def transpose(self, key: int) -> int:
+        # mirror a packed state across the main diagonal and relabel its tiles, a state and its transpose need the
+        # same number of moves to reach the goal, and transposing twice gives back the original state
+        mask = self.mask
+        transpose_tiles = self.transpose_tiles
+        transposed = 0
+        for shift, transposed_shift in self.transpose_shifts:
+            transposed |= transpose_tiles[(key >> shift) & mask] << transposed_shift
+        return transposed
+
+    def canonical(self, key: int, blank: int = None) -> Tuple[int, bool]:
+        # representative of a state and its transpose, and whether it is the transpose of key
+        # the representative has its blank on or above the main diagonal, which lets tables indexed by the blank cell
+        # skip the cells below it, with the blank on the diagonal the smaller key is used
+        if blank is None:
+            blank = self.find_blank(key)
+        row, col = divmod(blank, self.size)
+        if row < col:
+            return key, False
+        transposed = self.transpose(key)
+        if row > col or transposed < key:
+            return transposed, True
+        return key, False
+
+    def canonical_key(self, key: int, blank: int = None) -> int:
+        return self.canonical(key, blank)[0]
+
+    def is_solvable(self, key: int) -> bool:
+        # a move never changes the parity of the number of inversions plus (for even widths) the row of the blank,
+        # so a state can only reach the goal if that parity matches the goal's, which has no inversions
+        tiles = self.tiles(key)
+        blank = tiles.index(0)
+        del tiles[blank]
+        inversions = 0
+        for i, tile in enumerate(tiles):
+            for later_tile in tiles[i + 1:]:
+                if later_tile < tile:
+                    inversions += 1
+        if self.size % 2 == 0:
+            # with an even width a vertical move shifts a tile past an odd number of others
+            inversions += self.size - 1 - blank // self.size
+        return inversions % 2 == 0
+
+    def move(self, key: int, blank: int, target: int) -> int:
+        # slide the tile at target into the blank cell, doesn't check that the cells are adjacent
+        # the blank cell holds 0, so xor-ing the tile into both cells swaps them
+        tile = (key >> self.shifts[target]) & self.mask
+        return key ^ (tile << self.shifts[target]) ^ (tile << self.shifts[blank])
+
+    def successors(self, key: int, blank: int):
+        # generates (child key, child blank, moved tile) for every legal move of the blank
+        # only legal moves are in the move table, so no bounds checks are needed
+        mask = self.mask
+        for target, target_shift, blank_shift in self.move_table[blank]:
+            tile = (key >> target_shift) & mask
+            yield key ^ (tile << target_shift) ^ (tile << blank_shift), target, tile
@@ -1,54 +1,131 @@
-from heuristics import Heuristics
+import argparse
+import sys
 
+from board import Board
+from heuristics import SOLVERS, Heuristics
+from puzzle_io import read_puzzle_lines, write_results
+from search_profile import SearchProfile
+from warmup import DEFAULT_SIZES, print_warmup, warmup
+
+
+# algorithms in the menu, by the number entered to choose them: (description, Heuristics method)
+ALGORITHMS = {
+    "1": ("Uniform Cost Search", "uniform_cost_search"),
+    "2": ("A* Search with Misplaced Tile Heuristic", "a_star_misplaced_tile"),
+    "3": ("A* Search with Manhattan Distance Heuristic", "a_star_manhattan_distance"),
+    "4": ("IDA* Search with Manhattan Distance Heuristic", "ida_star_manhattan_distance"),
+    "5": ("IDA* Search with Pattern Database Heuristic", "ida_star_pattern_database"),
+    "6": ("A* Search with Manhattan Distance plus Linear Conflict Heuristic", "a_star_linear_conflict"),
+    "7": ("A* Search with Walking Distance Heuristic", "a_star_walking_distance"),
+    "8": ("IDA* Search with Walking Distance Heuristic", "ida_star_walking_distance"),
+}
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Sliding tile puzzle solver. Runs interactively unless --input is "
+                                                 "given.")
+    parser.add_argument("--input", help="solve every puzzle in this file (- for standard input) without prompting, "
+                                        "one puzzle per line with its tiles in row-major order, e.g. 1,2,3,4,5,6,0,7,8")
+    parser.add_argument("--output", default="-", help="file to write one JSON result per line to with --input "
+                                                      "(default standard output)")
+    parser.add_argument("--algorithm", choices=SOLVERS, help="search to run instead of choosing from the menu, "
+                                                             "manhattan if not given with --input")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes to solve --input with (default 1)")
+    parser.add_argument("--cache-file", help="file to keep solutions of --input puzzles in between runs")
+    parser.add_argument("--profile", action="store_true", help="print search counters and timers after solving, or "
+                                                                 "add them to every result with --input")
+    parser.add_argument("--warmup", nargs="*", type=int, metavar="SIZE",
+                        help="build every precomputed heuristic table for boards of these sizes (default 3) into the "
+                             "cache directory and exit, so no later run has to build one")
+    return parser.parse_args(argv)
+
+
+def solve_stream(input_path: str, output_path: str, algorithm: str, workers: int, cache_path: str = None,
+                 profile: bool = False):
+    # non-interactive mode, puzzles are read, solved and written one at a time, so memory use doesn't depend on
+    # the size of the input
+    # batch_solver pulls in multiprocessing, which interactive runs never need, so it's only imported here
+    from batch_solver import solve_batch
+
+    input_file = sys.stdin if input_path == "-" else open(input_path)
+    output_file = sys.stdout if output_path == "-" else open(output_path, "w")
+    try:
+        results = solve_batch(read_puzzle_lines(input_file), algorithm, workers, cache_path=cache_path, profile=profile)
+        write_results(results, output_file)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.warmup is not None:
+        print_warmup(warmup(args.warmup or DEFAULT_SIZES))
+        return 0
+
+    if args.input is not None:
+        solve_stream(args.input, args.output, args.algorithm or "manhattan", args.workers, args.cache_file,
+                     args.profile)
+        return 0
+
+    while True:
+        # take user input for board size, the 8-puzzle if left empty
+        size = input("Enter the board size, 3 for the 8-puzzle or 4 for the 15-puzzle (default 3): ").strip() or "3"
+        if size.isdigit() and int(size) >= 2:
+            board = Board.of(int(size))
+            break
+        print("Invalid input. Board size must be a whole number of at least 2.\n")
 
-def main():
     while True:
-        # take user input for initial state
+        # take user input for initial state, one row at a time
         print("Enter a valid initial state. Separate each number with a comma and a space. Use 0 to represent a blank "
               "space")
-        initial_state = [input("Enter the first row: "), input("Enter the second row: "),
-                         input("Enter the third row: ")]
+        initial_state = [input(f"Enter row {i + 1}: ") for i in range(0, board.size)]
 
-        for i in range(0, 3):
-            # split each row into an array of 3 elements
-            initial_state[i] = initial_state[i].split(", ")
-            # convert each string array to int array
-            initial_state[i] = [int(x) for x in initial_state[i]]
+        for i in range(0, board.size):
+            # split each row into an array of elements and convert each string to an int
+            initial_state[i] = [int(x) for x in initial_state[i].split(",")]
 
         check_input = True
         # check if input is valid
-        # doesn't check if it can be solved, only checks if there is 1 of each number from 0-8
-        for i in range(0, 9):
+        # only checks if there is 1 of each number from 0 to the largest tile, solvability is checked below
+        for i in range(0, board.cells):
             # check count of each number is 1
-            count = initial_state[0].count(i) + initial_state[1].count(i) + initial_state[2].count(i)
+            count = sum(row.count(i) for row in initial_state)
             if count != 1:
                 check_input = False
 
-        if check_input:
-            break
+        if not check_input:
+            print(f"Invalid Input. Initial state must contain one of each number from 1-{board.cells - 1} with 0 as a "
+                  f"blank")
+        # check the puzzle can be solved before choosing an algorithm, so it's rejected without any search
+        elif not board.is_solvable(board.pack(initial_state)):
+            print("This initial state can't be solved, no sequence of moves reaches the goal state")
         else:
-            print("Invalid Input. Initial state must contain one of each number from 1-8 with 0 as a blank")
+            break
+
+    # the profile is printed with the stats once the search is done
+    heuristics = Heuristics(initial_state, profile=SearchProfile() if args.profile else None)
 
-    heuristics = Heuristics(initial_state)
+    # skip the menu if the algorithm was given on the command line
+    if args.algorithm:
+        getattr(heuristics, SOLVERS[args.algorithm])()
+        return 0
 
     # call corresponding algorithm
-    choice = 0
-    print("1. Uniform Cost Search")
-    print("2. A* Search with Misplaced Tile Heuristic")
-    print("3. A* Search with Manhattan Distance Heuristic\n")
+    for number, (description, _) in ALGORITHMS.items():
+        print(f"{number}. {description}")
+    print()
     while True:
         choice = input("Choose which algorithm to use by entering the number next to it: ")
-        if choice not in ["1", "2", "3"]:
-            print("Invalid input. Please enter a number from 1-3 for the corresponding search.\n")
+        if choice not in ALGORITHMS:
+            print(f"Invalid input. Please enter a number from 1-{len(ALGORITHMS)} for the corresponding search.\n")
         else:
             break
 
-    if choice == "1":
-        heuristics.uniform_cost_search()
-    elif choice == "2":
-        heuristics.a_star_misplaced_tile()
-    elif choice == "3":
-        heuristics.a_star_manhattan_distance()
+    getattr(heuristics, ALGORITHMS[choice][1])()
 
     return 0
 
@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional
+from math import factorial
+import os
+
+from board import Board
+from table_cache import cache_dir, load_or_build_table
+
+
+class DistanceTable:
+    # exact distance to the goal for every reachable state, one byte per state
+    # only practical for the 8-puzzle, which has 9! / 2 = 181,440 reachable states
+    # a state is indexed by its blank cell and the Lehmer code of its tiles read in row-major order without the blank
+    # reachable states all have an even number of inversions, so the last two tiles are implied by the others and
+    # only the first (cells - 3) digits of the Lehmer code are needed, giving (cells - 1)! / 2 indexes per blank cell
+    # a state and its transpose are the same distance from the goal, so only canonical states are stored (see
+    # Board.canonical), which never have the blank below the main diagonal: 6 of the 9 blank cells, 120,960 bytes
+    # instances are cached per board, see DistanceTable.get
+    instances: Dict[int, "DistanceTable"] = {}
+    # instances are called with packed states, see heuristics.packed_heuristic
+    packed_keys = True
+
+    def __init__(self, board: Board, table=None):
+        if board.size != 3:
+            # the 15-puzzle already has 16! / 2 reachable states, and with an even width the blank row also changes
+            # the inversion parity, so the indexing above doesn't hold
+            raise ValueError("distance tables are only supported for the 8-puzzle")
+        self.board = board
+        # number of tile orders for each blank cell
+        self.orders = factorial(board.cells - 1) // 2
+        # slots[blank] is where the states with the blank in that cell start in the table, None below the diagonal
+        self.slots = [None] * board.cells
+        offset = 0
+        for blank in range(board.cells):
+            row, col = divmod(blank, board.size)
+            if row <= col:
+                self.slots[blank] = offset
+                offset += self.orders
+        self.length = offset
+        self.table = table if table is not None else self.build()
+
+    @classmethod
+    def get(cls, board: Board) -> "DistanceTable":
+        # returns the distance table for board, loading it from the cache directory or building and saving it the
+        # first time it's needed
+        if board.size not in cls.instances:
+            cls.instances[board.size] = cls.load_or_build(board)
+        return cls.instances[board.size]
+
+    @classmethod
+    def load_or_build(cls, board: Board, directory: str = None) -> "DistanceTable":
+        path = os.path.join(directory or cache_dir(), f"distances_{board.size}x{board.size}.bin")
+        header = f"distances size={board.size} symmetry=transpose"
+        return cls(board, load_or_build_table(path, header, lambda: cls(board).table))
+
+    def index(self, key: int) -> Optional[int]:
+        # table index of a packed state, None if the state can't reach the goal
+        tiles = self.board.tiles(self.board.canonical_key(key))
+        blank = tiles.index(0)
+        del tiles[blank]
+
+        rank = 0
+        inversions = 0
+        remaining = len(tiles)
+        for i, tile in enumerate(tiles):
+            # Lehmer digit: number of tiles after this one that are smaller
+            smaller = 0
+            for later_tile in tiles[i + 1:]:
+                if later_tile < tile:
+                    smaller += 1
+            inversions += smaller
+            # the last two digits are implied by the parity
+            if remaining - i > 2:
+                rank = rank * (remaining - i) + smaller
+
+        if inversions % 2:
+            return None
+        return self.slots[blank] + rank
+
+    def build(self) -> bytearray:
+        # breadth first search from the goal over the whole reachable state space, a state is skipped once it or its
+        # transpose is reached, which only leaves about half of them to expand
+        # states with the blank on the diagonal that aren't canonical are never reached and keep 255
+        board = self.board
+        table = bytearray([255]) * self.length
+        table[self.index(board.goal_key)] = 0
+        layer = [(board.goal_key, board.goal_blank)]
+        distance = 0
+
+        while layer:
+            distance += 1
+            next_layer = []
+            for key, blank in layer:
+                for child_key, child_blank, _ in board.successors(key, blank):
+                    index = self.index(child_key)
+                    if table[index] == 255:
+                        table[index] = distance
+                        next_layer.append((child_key, child_blank))
+            layer = next_layer
+
+        return table
+
+    def distance(self, key: int) -> Optional[int]:
+        # exact number of moves from a packed state to the goal, None if the goal can't be reached
+        index = self.index(key)
+        return None if index is None else self.table[index]
+
+    def __call__(self, key: int) -> int:
+        # perfect heuristic, 0 for states that can't reach the goal so the search still exhausts them
+        return self.distance(key) or 0
+
+    def solve(self, key: int) -> Optional[List[int]]:
+        # optimal path of packed states from key to the goal by always stepping to a neighbor one move closer,
+        # None if the goal can't be reached
+        distance = self.distance(key)
+        if distance is None:
+            return None
+
+        path = [key]
+        blank = self.board.find_blank(key)
+        while distance > 0:
+            for child_key, child_blank, _ in self.board.successors(key, blank):
+                if self.table[self.index(child_key)] == distance - 1:
+                    key, blank = child_key, child_blank
+                    break
+            distance -= 1
+            path.append(key)
+
+        return path
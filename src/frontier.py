@@ -0,0 +1,117 @@
+from typing import Dict, List
+import heapq
+
+# ways to order nodes with the same f(n)
+# "high_g" pops the deepest node first, which with f(n) fixed is also the one with the lowest h(n), so it heads
+# straight for the goal once the optimal f(n) is reached, "low_g" the shallowest first, None the last one pushed
+# nodes that tie on both are always popped last pushed first, so the same search always expands the same nodes
+TIE_BREAKS = (None, "high_g", "low_g")
+
+
+def check_tie_break(tie_break: str):
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"unknown tie break {tie_break!r}, choose from {', '.join(map(str, TIE_BREAKS))}")
+
+
+def check_weight(weight: float):
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, got {weight!r}")
+
+
+class HeapFrontier:
+    # open list of A* as a binary heap of (f(n), tie, -push number, node) entries
+    # every push and pop is O(log n) comparisons, which stay in C since the entries never tie up to the node
+    # with a weight, nodes are ordered by g(n) + weight * h(n) instead (weighted A*), which can be fractional
+    def __init__(self, tie_break: str = None, weight: float = 1):
+        check_tie_break(tie_break)
+        check_weight(weight)
+        self.tie_break = tie_break
+        self.weight = weight
+        self.entries = []
+        self.pushed = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, node):
+        if self.tie_break == "high_g":
+            tie = -node.depth
+        elif self.tie_break == "low_g":
+            tie = node.depth
+        else:
+            tie = 0
+        self.pushed += 1
+        heapq.heappush(self.entries, (node.depth + self.weight * node.heuristic_cost, tie, -self.pushed, node))
+
+    def pop(self):
+        if not self.entries:
+            raise IndexError("pop from an empty frontier")
+        return heapq.heappop(self.entries)[3]
+
+
+class BucketFrontier:
+    # open list of A* as buckets of nodes indexed by f(n) (Dial's algorithm), which only works because f(n) is a small
+    # non-negative integer here
+    # buckets[f] is a list of sub-buckets, one per g(n) when breaking ties on it or a single one otherwise,
+    # each a stack of nodes, so push and pop are O(1) apart from skipping empty buckets, and the lowest non-empty f
+    # only ever moves up with a consistent heuristic
+    # with a weight, nodes are ordered by g(n) + weight * h(n) instead (weighted A*), which has to be a whole number
+    # for the costs to stay integers
+    def __init__(self, tie_break: str = None, weight: int = 1):
+        check_tie_break(tie_break)
+        check_weight(weight)
+        if weight != int(weight):
+            raise ValueError(f"bucket frontiers need a whole number weight, got {weight!r}, use the heap frontier")
+        self.tie_break = tie_break
+        self.weight = int(weight)
+        self.buckets: List[List[List]] = []
+        # lowest f(n) that might have a non-empty bucket
+        self.lowest = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, node):
+        cost = node.depth + self.weight * node.heuristic_cost
+        buckets = self.buckets
+        while len(buckets) <= cost:
+            buckets.append([])
+        try:
+            bucket = buckets[cost]
+        except TypeError:
+            # a heuristic returning floats, which is fine as long as they're whole numbers
+            if cost != int(cost):
+                raise ValueError(f"bucket frontiers need whole number costs, got {cost!r}, use the heap frontier "
+                                 f"(frontier=\"heap\")") from None
+            cost = int(cost)
+            bucket = buckets[cost]
+        tie = node.depth if self.tie_break else 0
+        while len(bucket) <= tie:
+            bucket.append([])
+        bucket[tie].append(node)
+        self.size += 1
+        # an inconsistent or weighted heuristic can give a child a lower f(n) than its parent
+        if cost < self.lowest:
+            self.lowest = cost
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from an empty frontier")
+        buckets = self.buckets
+        while not any(buckets[self.lowest]):
+            self.lowest += 1
+        bucket = buckets[self.lowest]
+        # highest g(n) first with "high_g", else the lowest sub-bucket, which is the only one without tie breaking
+        sub_buckets = reversed(bucket) if self.tie_break == "high_g" else bucket
+        for nodes in sub_buckets:
+            if nodes:
+                self.size -= 1
+                return nodes.pop()
+
+
+# frontier implementations search can use, by name
+FRONTIERS: Dict[str, type] = {
+    "heap": HeapFrontier,
+    "bucket": BucketFrontier,
+}
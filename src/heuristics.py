@@ -1,11 +1,88 @@
-from typing import List
-from copy import deepcopy
+from typing import List, Optional, Tuple
 import heapq
+import time
+
+from board import Board
+from distance_table import DistanceTable
+from frontier import FRONTIERS
+from linear_conflict import LinearConflict
+from node_store import NodeStore
+from pattern_database import PatternDatabase
+from search_profile import SearchProfile
+from solution_cache import SolutionCache
+from walking_distance import WalkingDistance
+
+# board geometry and packed state encoding of the 8-puzzle, the default board for nodes
+BOARD = Board.of(3)
+
+# weight of weighted A*, and the first weight of ARA* and how much it's lowered after every solution
+DEFAULT_WEIGHT = 2
+ANYTIME_WEIGHT = 3.0
+ANYTIME_WEIGHT_STEP = 0.5
+
+# search entry points of Heuristics by short name, for callers that pick the algorithm at run time
+SOLVERS = {
+    "ucs": "uniform_cost_search",
+    "misplaced": "a_star_misplaced_tile",
+    "manhattan": "a_star_manhattan_distance",
+    "linear_conflict": "a_star_linear_conflict",
+    "walking_distance": "a_star_walking_distance",
+    "pattern_database": "a_star_pattern_database",
+    "distance_table": "a_star_distance_table",
+    "table_solve": "distance_table_solve",
+    "ida_misplaced": "ida_star_misplaced_tile",
+    "ida_manhattan": "ida_star_manhattan_distance",
+    "ida_linear_conflict": "ida_star_linear_conflict",
+    "ida_walking_distance": "ida_star_walking_distance",
+    "ida_pattern_database": "ida_star_pattern_database",
+    "bidirectional_ucs": "bidirectional_uniform_cost_search",
+    "bidirectional_manhattan": "bidirectional_manhattan_distance",
+    "weighted_manhattan": "weighted_a_star_manhattan_distance",
+    "anytime_manhattan": "ara_star_manhattan_distance",
+    "compact_ucs": "compact_uniform_cost_search",
+    "compact_manhattan": "compact_a_star_manhattan_distance",
+}
+
+# algorithms in SOLVERS that don't always find an optimal solution, with how many times the optimal cost their
+# solutions can cost at most, ARA* isn't one of them since it only stops short of optimal when it runs out of budget
+BOUNDED_SOLVERS = {
+    "weighted_manhattan": float(DEFAULT_WEIGHT),
+}
+
+
+def packed_heuristic(heuristic_function):
+    # marks a heuristic function as taking packed states, search engines call any other heuristic function with the
+    # state as a nested list, so heuristics written against that keep working, only slower since every call has to
+    # unpack the state first
+    heuristic_function.packed_keys = True
+    return heuristic_function
+
+
+@packed_heuristic
+def zero_heuristic(_) -> int:
+    # h(n) of uniform cost search
+    return 0
+
 
 class Node:
-    def __init__(self, state: List[List[int]], parent, depth):
-        # current state of the node
-        self.state = state
+    # searches can hold hundreds of thousands of nodes, slots keep each one down to its fields
+    __slots__ = ("board", "key", "parent", "depth", "heuristic_cost", "blank")
+
+    def __init__(self, state, parent, depth, blank=None, board=None):
+        # board the state is encoded for, taken from the parent or the size of a nested list state if not given,
+        # and the 8-puzzle board otherwise
+        if board is None:
+            if parent is not None:
+                board = parent.board
+            else:
+                board = BOARD if isinstance(state, int) else Board.of(len(state))
+        self.board = board
+        # current state of the node, packed into a single int (see Board)
+        # a nested list state is accepted and packed on the way in
+        if isinstance(state, int):
+            self.key = state
+        else:
+            self.key = self.board.pack(state)
         # parent of current node
         self.parent = parent
         # depth of node: g(n)
@@ -13,14 +90,23 @@ class Node:
         # heuristic cost of current node: h(n)
         self.heuristic_cost = 0
 
-        # coords of blank stored as [row, column] starting from index 0
-        self.blank_coords = []
-        # automatically finds coords of blank space on object initialization
-        for i in range(0, 3):
-            if self.state[i].count(0) != 0:
-                self.blank_coords.append(i)
-                self.blank_coords.append(self.state[i].index(0))
-                break
+        # index of the blank cell (row * size + column), automatically found on object initialization if not given
+        self.blank = self.board.find_blank(self.key) if blank is None else blank
+
+    # nested list view of the packed state
+    @property
+    def state(self) -> List[List[int]]:
+        return self.board.unpack(self.key)
+
+    # coords of blank as [row, column] starting from index 0
+    @property
+    def blank_coords(self) -> List[int]:
+        return list(divmod(self.blank, self.board.size))
+
+    # packed state shared by this state and its transpose, see Board.canonical
+    @property
+    def canonical_key(self) -> int:
+        return self.board.canonical_key(self.key, self.blank)
 
     # overriding __lt__ to allow heapq to pop the node with the lowest heuristic cost
     def __lt__(self, other):
@@ -29,118 +115,299 @@ class Node:
 
     # function for moving a single tile
     def move_tile(self, row, col):
+        blank_row, blank_col = divmod(self.blank, self.board.size)
         # first check if given coords are next to blank (0)
         # either same row and 1 away from col or same col and 1 away from row
-        if ((row == self.blank_coords[0] and abs(col - self.blank_coords[1]) == 1)
-                or (col == self.blank_coords[1] and abs(row - self.blank_coords[0]) == 1)):
+        if (row == blank_row and abs(col - blank_col) == 1) or (col == blank_col and abs(row - blank_row) == 1):
             # swap given tile and blank
-            self.state[self.blank_coords[0]][self.blank_coords[1]] = self.state[row][col]
-            self.state[row][col] = 0
-            # set blank coords to new coords
-            self.blank_coords = [row, col]
+            target = row * self.board.size + col
+            self.key = self.board.move(self.key, self.blank, target)
+            # set blank to new cell
+            self.blank = target
         else:
             print("Invalid move")
 
         return 0
 
     def print_state(self):
-        for i in range(0, 3):
-            print(self.state[i])
+        for row in self.state:
+            print(row)
+
+    # creates a child node where the blank is moved to the target cell
+    def _child(self, target):
+        return Node(self.board.move(self.key, self.blank, target), self, self.depth + 1, target, self.board)
 
     # expands the node where the blank is moved to the left
     def expand_left(self):
         # first check if possible
-        if self.blank_coords[1] > 0:
-            # create a new child node, copying the parent state
-            left_child = Node(deepcopy(self.state), self, self.depth + 1)
-            # move the blank to the left
-            left_child.move_tile(self.blank_coords[0], self.blank_coords[1] - 1)
-
-            return left_child
+        if self.blank % self.board.size > 0:
+            return self._child(self.blank - 1)
 
         return None
 
     # expands the node where the blank is moved to the right
     def expand_right(self):
         # first check if possible
-        if self.blank_coords[1] < 2:
-            # create a new child node, copying the parent state
-            right_child = Node(deepcopy(self.state), self, self.depth + 1)
-            # move the blank to the right
-            right_child.move_tile(self.blank_coords[0], self.blank_coords[1] + 1)
-
-            return right_child
+        if self.blank % self.board.size < self.board.size - 1:
+            return self._child(self.blank + 1)
 
         return None
 
     # expands the node where the blank is moved up
     def expand_up(self):
         # first check if possible
-        if self.blank_coords[0] > 0:
-            # create a new child node, copying the parent state
-            up_child = Node(deepcopy(self.state), self, self.depth + 1)
-            # move the blank up
-            up_child.move_tile(self.blank_coords[0] - 1, self.blank_coords[1])
-
-            return up_child
+        if self.blank >= self.board.size:
+            return self._child(self.blank - self.board.size)
 
         return None
 
     # expands the node where the blank is moved down
     def expand_down(self):
         # first check if possible
-        if self.blank_coords[0] < 2:
-            # create a new child node, copying the parent state
-            down_child = Node(deepcopy(self.state), self, self.depth + 1)
-            # move the blank down
-            down_child.move_tile(self.blank_coords[0] + 1, self.blank_coords[1])
-
-            return down_child
+        if self.blank < self.board.cells - self.board.size:
+            return self._child(self.blank + self.board.size)
 
         return None
 
+    # builds the chain of nodes for a path of packed states and returns the last one
+    @staticmethod
+    def from_path(path: List[int], board: Board, heuristic_function=None):
+        node = None
+        for depth, key in enumerate(path):
+            node = Node(key, node, depth, None, board)
+            if heuristic_function is not None:
+                node.heuristic_cost = heuristic_function(key)
+        return node
+
+    # generates a child node for every legal move, in left, right, up, down order
+    def successors(self):
+        depth = self.depth + 1
+        board = self.board
+        for child_key, child_blank, _ in board.successors(self.key, self.blank):
+            yield Node(child_key, self, depth, child_blank, board)
+
     # expands all possible nodes
     def expand_all(self):
-        # expand nodes in all directions
-        nodes = [self.expand_left(), self.expand_right(), self.expand_up(), self.expand_down()]
-        # filter out null nodes where node can't be expanded in that direction
-        return [node for node in nodes if node]
+        return list(self.successors())
+
+
+class SearchResult:
+    # outcome and stats of a single search, returned by the search entry points in non-verbose mode
+    def __init__(self, goal_node: Optional[Node], nodes_expanded: int, max_queue_size: int, wall_time: float,
+                 status: str = None, nodes_generated: int = 0):
+        # goal node reached by the search, None if there is no solution
+        self.goal_node = goal_node
+        self.nodes_expanded = nodes_expanded
+        # children added to the open list, or for IDA* visited, duplicates rejected before that aren't counted
+        self.nodes_generated = nodes_generated
+        self.max_queue_size = max_queue_size
+        # seconds spent searching
+        self.wall_time = wall_time
+        # "solved", "unsolvable" if the solvability check rejected the initial state before searching,
+        # "exhausted" if every reachable state was searched without finding the goal, or "budget_exceeded" if the
+        # search stopped after expanding the most nodes it was allowed to (see Heuristics.max_nodes), anytime
+        # searches keep the best solution they found before that, if any
+        self.status = status or ("solved" if goal_node else "exhausted")
+        # the solution costs at most bound times the optimal cost, 1 for optimal searches, None without a solution
+        self.bound: Optional[float] = 1.0 if goal_node else None
+        # (depth, bound, nodes expanded, seconds) of every improving solution an anytime search found, in order
+        self.solutions: List[Tuple[int, float, int, float]] = []
+        # True if the result came from a SolutionCache instead of a search
+        self.cached = False
+        # counters and timers of the search if it was profiled, see SearchProfile
+        self.profile: Optional[SearchProfile] = None
+
+    @property
+    def solved(self) -> bool:
+        return self.goal_node is not None
+
+    # length of the solution, None if there is no solution
+    @property
+    def depth(self) -> Optional[int]:
+        return self.goal_node.depth if self.goal_node else None
+
+    # packed states from the initial state to the goal state, empty if there is no solution
+    @property
+    def path_keys(self) -> List[int]:
+        path = []
+        node = self.goal_node
+        while node:
+            path.append(node.key)
+            node = node.parent
+        return path[::-1]
+
+    # states from the initial state to the goal state as nested lists
+    @property
+    def path(self) -> List[List[List[int]]]:
+        if self.goal_node is None:
+            return []
+        return [self.goal_node.board.unpack(key) for key in self.path_keys]
+
+    # tile slid at each step of the solution, a compact way to write out the path
+    @property
+    def moves(self) -> List[int]:
+        if self.goal_node is None:
+            return []
+        board = self.goal_node.board
+        path = self.path_keys
+        # the tile that moved is the one that ends up where the blank was
+        return [board.tile_at(next_key, board.find_blank(key)) for key, next_key in zip(path, path[1:])]
+
+    # stats and solution as plain values that can be written out as JSON
+    def to_dict(self) -> dict:
+        result = {
+            "status": self.status,
+            "depth": self.depth,
+            "bound": self.bound,
+            "moves": self.moves,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "max_queue_size": self.max_queue_size,
+            "wall_time": self.wall_time,
+            "cached": self.cached,
+        }
+        if self.solutions:
+            result["solutions"] = [{"depth": depth, "bound": bound, "nodes_expanded": nodes_expanded,
+                                    "wall_time": wall_time}
+                                   for depth, bound, nodes_expanded, wall_time in self.solutions]
+        if self.profile is not None:
+            result["profile"] = self.profile.to_dict()
+        return result
+
+
+class SearchDirection:
+    # open and closed lists of one direction of a bidirectional search, see Heuristics.meet_in_the_middle_search
+    def __init__(self, board: Board, root_key: int, heuristic_function):
+        self.heuristic_function = heuristic_function
+        root_heuristic_cost = heuristic_function(root_key)
+        # open list heap of (priority, g(n), packed state, blank cell), entries are stale once their state
+        # is closed or reached with a lower g(n)
+        self.frontier = [(root_heuristic_cost, 0, root_key, board.find_blank(root_key))]
+        # best g(n) of every state reached so far and the state it was reached from
+        self.depths = {root_key: 0}
+        self.parents = {root_key: None}
+        # states that are open, and how many open states have each g(n) and f(n)
+        self.open = {root_key}
+        self.depth_counts = {0: 1}
+        self.cost_counts = {root_heuristic_cost: 1}
+
+    # drops stale entries from the top of the heap, returns the lowest priority or None if nothing is open
+    def min_priority(self):
+        while self.frontier:
+            _, depth, key, _ = self.frontier[0]
+            if key in self.open and self.depths[key] == depth:
+                return self.frontier[0][0]
+            heapq.heappop(self.frontier)
+        return None
+
+    # adds or removes one open state from the g(n) and f(n) counts
+    def count(self, depth, cost, change):
+        self.depth_counts[depth] = self.depth_counts.get(depth, 0) + change
+        self.cost_counts[cost] = self.cost_counts.get(cost, 0) + change
+
+    def min_depth(self):
+        return min(depth for depth, count in self.depth_counts.items() if count > 0)
+
+    def min_cost(self):
+        return min(cost for cost, count in self.cost_counts.items() if count > 0)
 
 
 class Heuristics:
-    # static goal state
+    # static goal state of the 8-puzzle, instances use the goal state for the size of their initial state
     goal_state = [[1, 2, 3],
                   [4, 5, 6],
                   [7, 8, 0]]
     
-    def __init__(self, initial_state: List[List[int]]):
+    def __init__(self, initial_state: List[List[int]], check_solvable=True, profile: SearchProfile = None,
+                 max_nodes: int = None):
         self.initial_state = initial_state
+        # board size is taken from the initial state, e.g. 4 rows for the 15-puzzle
+        self.board = Board.of(len(initial_state))
+        self.goal_state = self.board.goal_state()
+        # reject unsolvable initial states with an inversion parity check instead of exhausting the state space
+        # set to False to always run the full search
+        self.check_solvable = check_solvable
+        # searches are instrumented with this profile if given, it's reset at the start of every search and attached
+        # to its result
+        self.profile = profile
+        # searches give up with status "budget_exceeded" instead of expanding more than this many nodes if given
+        self.max_nodes = max_nodes
+
+    # checks the initial state before any expansion, returns the unsolvable result or None if the search should run
+    def precheck(self) -> Optional[SearchResult]:
+        if self.check_solvable and not self.board.is_solvable(self.board.pack(self.initial_state)):
+            return SearchResult(None, 0, 0, 0.0, "unsolvable")
+        return None
+
+    # node budget of a search, infinite if max_nodes isn't set, searches stop once they've expanded that many nodes
+    def node_limit(self):
+        return float("inf") if self.max_nodes is None else self.max_nodes
+
+    # heuristic_function as a function of packed states, heuristics not marked with packed_heuristic are called with
+    # the state unpacked into a nested list
+    def packed(self, heuristic_function):
+        if getattr(heuristic_function, "packed_keys", False):
+            return heuristic_function
+        unpack = self.board.unpack
+        return lambda key: heuristic_function(unpack(key))
 
-    def calculate_misplaced_tile(self, state: List[List[int]]) -> int:
+    # fills in the profile, if there is one, from a finished search and attaches it to its result
+    def profiled(self, result: SearchResult, duplicates=0, stale_pops=0, heuristic_updates=0) -> SearchResult:
+        profile = self.profile
+        if profile is not None:
+            profile.stop()
+            profile.counters["expansions"] = result.nodes_expanded
+            profile.record(result.nodes_generated, duplicates, stale_pops, heuristic_updates)
+            result.profile = profile
+        return result
+
+    # heuristic functions take either a nested list state or a packed state, and are marked as taking packed states
+    # so searches call them without unpacking
+    @packed_heuristic
+    def calculate_misplaced_tile(self, state) -> int:
+        if not isinstance(state, int):
+            state = self.board.pack(state)
         misplaced_tile_heuristic = 0
         # loop through each tile in state
-        for i in range(0, 3):
-            for j in range(0, 3):
-                # increment misplaced_tile_heuristic for every tile not equal to goal_state
-                if state[i][j] != 0 and (state[i][j] != Heuristics.goal_state[i][j]):
-                    misplaced_tile_heuristic += 1
+        for tile, goal_tile in zip(self.board.tiles(state), self.board.goal_tiles):
+            # increment misplaced_tile_heuristic for every tile not equal to goal_state
+            if tile != 0 and tile != goal_tile:
+                misplaced_tile_heuristic += 1
         return misplaced_tile_heuristic
 
-    def calculate_manhattan_distance(self, state: List[List[int]]) -> int:
+    @packed_heuristic
+    def calculate_manhattan_distance(self, state) -> int:
+        if not isinstance(state, int):
+            state = self.board.pack(state)
         manhattan_distance_heuristic = 0
-        # loop through each tile in state
-        for i in range(0, 3):
-            for j in range(0, 3):
-                # if tile isn't equal to goal_state, find distance
-                tile = state[i][j]
-                if tile != 0 and (tile != Heuristics.goal_state[i][j]):
-                    # find where tile should be
-                    goal_coords = ((tile - 1) // 3, (tile - 1) % 3)
-                    # add the distance to manhattan_distance_heuristic
-                    manhattan_distance_heuristic += abs(i - goal_coords[0]) + abs(j - goal_coords[1])
+        manhattan_table = self.board.manhattan_table
+        # loop through each tile in state, adding its precomputed distance from where it should be
+        for cell, tile in enumerate(self.board.tiles(state)):
+            manhattan_distance_heuristic += manhattan_table[tile][cell]
 
         return manhattan_distance_heuristic
 
+    @packed_heuristic
+    def calculate_linear_conflict(self, state) -> int:
+        if not isinstance(state, int):
+            state = self.board.pack(state)
+        # manhattan distance plus 2 moves for every tile that has to leave its goal row or column to let another pass
+        return LinearConflict.get(self.board)(state)
+
+    @packed_heuristic
+    def calculate_walking_distance(self, state) -> int:
+        if not isinstance(state, int):
+            state = self.board.pack(state)
+        # vertical plus horizontal walking distance, the table is built on first use
+        return WalkingDistance.get(self.board)(state)
+
+    @packed_heuristic
+    def calculate_pattern_database(self, state) -> int:
+        if not isinstance(state, int):
+            state = self.board.pack(state)
+        # additive disjoint pattern database, loaded from the cache directory or built on first use
+        return PatternDatabase.get(self.board)(state)
+
     def print_solution(self, goal_node: Node):
         # takes the goal_node as a parameter to print steps to solution
         # create a list for the path to the goal state
@@ -178,17 +445,103 @@ class Heuristics:
         end
     '''
 
-    def a_star_search(self, heuristic_function):
+    # trace hook used in verbose mode, prints every expanded node
+    @staticmethod
+    def print_expansion(node: Node):
+        print(f"\nThe best state to expand with a g(n) = {node.depth} and h(n) = {node.heuristic_cost} is:")
+        node.print_state()
+
+    # progress hook of ara_star_search in verbose mode, prints every improving solution
+    @staticmethod
+    def print_improvement(depth: int, bound: float, nodes_expanded: int, wall_time: float):
+        print(f"\nFound a solution of depth {depth} within {bound:.3g} times the optimal cost after expanding "
+              f"{nodes_expanded} nodes in {wall_time:.3f}s")
+
+    # prints the stats of a finished search and returns what the verbose entry points have always returned
+    def report(self, result: SearchResult):
+        if result.profile is not None:
+            result.profile.print_report()
+        if result.status == "budget_exceeded":
+            if not result.solved:
+                print(f"Gave up after expanding {result.nodes_expanded} nodes without finding a solution.")
+                return None
+            print(f"Stopped after expanding {result.nodes_expanded} nodes, keeping the best solution found.")
+        if not result.solved:
+            if result.status == "unsolvable":
+                print("The initial state has the wrong inversion parity to reach the goal state.")
+            print("There is no solution for given initial state: ")
+            Node(self.initial_state, None, 0, None, self.board).print_state()
+            return None
+
+        print(f"\nDepth of solution: {result.depth}")
+        print(f"Number of nodes expanded: {result.nodes_expanded}")
+        print(f"Maximum queue size: {result.max_queue_size}")
+        if result.bound > 1:
+            print(f"Solution cost is at most {result.bound:.3g} times the optimal cost")
+        return result.goal_node
+
+    def a_star_search(self, heuristic_function, delta_table=None, verbose=True, trace=None, symmetric=False,
+                      frontier="heap", tie_break="high_g", weight=1):
+        # heuristic_function is called with the state as a nested list, or as a packed state if it's marked with
+        # packed_heuristic
+        # if delta_table is given (see Board.delta_table), children get h(n) incrementally from their parent
+        # instead of calling heuristic_function, which is then only used for the root
+        # trace is an optional hook called with every expanded node
+        # if symmetric, a state and its transpose (see Board.canonical) share one visited entry, so only one of them
+        # is expanded, this keeps the solution optimal as long as the heuristic is consistent and gives a state and
+        # its transpose the same cost, which holds for uniform cost, misplaced tile, manhattan distance and the
+        # distance table but not the pattern database
+        # frontier names the open list implementation in frontier.FRONTIERS, "heap" (the default) or "bucket", which
+        # is faster but needs whole number costs, the built-in heuristics all use it, and
+        # tie_break how it orders nodes with the same f(n), see frontier.TIE_BREAKS, the deepest first by default
+        # a weight over 1 runs weighted A*, ordering nodes by g(n) + weight * h(n), which finds a solution with far
+        # fewer expansions but only guarantees it costs at most weight times the optimal cost, the result's bound,
+        # the bucket frontier only takes whole number weights
+        # verbose mode traces with print_expansion, prints the stats and returns the goal node (None if no solution)
+        # otherwise nothing is printed and a SearchResult is returned
+        if verbose:
+            result = self.search(heuristic_function, delta_table, trace or Heuristics.print_expansion, symmetric,
+                                 frontier, tie_break, weight)
+            return self.report(result)
+        return self.search(heuristic_function, delta_table, trace, symmetric, frontier, tie_break, weight)
+
+    def search(self, heuristic_function, delta_table=None, trace=None, symmetric=False, frontier="heap",
+               tie_break="high_g", weight=1) -> SearchResult:
+        # silent A* search, see a_star_search for the parameters
+        if frontier not in FRONTIERS:
+            raise ValueError(f"unknown frontier {frontier!r}, choose from {', '.join(FRONTIERS)}")
+        unsolvable = self.precheck()
+        if unsolvable:
+            return unsolvable
+
+        start_time = time.perf_counter()
+        board = self.board
+        heuristic_function = self.packed(heuristic_function)
+        profile = self.profile
+        if profile is not None:
+            profile.start(frontier=True)
+            heuristic_function = profile.wrap_heuristic(heuristic_function)
+            trace = profile.wrap_trace(trace)
         # create the root node with the initial state
-        initial_node = Node(deepcopy(self.initial_state), None, 0)
+        initial_node = Node(self.initial_state, None, 0, None, board)
+        initial_node.heuristic_cost = heuristic_function(initial_node.key)
         # nodes = MAKE-QUEUE(MAKE-NODE(problem.INITIAL-STATE))
-        frontier_nodes = [initial_node]
-        # convert frontier_nodes into a heap
-        heapq.heapify(frontier_nodes)
-        # keep track of visited nodes
-        visited = set()
-        # counter for number of nodes expanded
+        frontier_nodes = FRONTIERS[frontier](tie_break, weight)
+        if profile is not None:
+            frontier_nodes = profile.wrap_frontier(frontier_nodes)
+        frontier_nodes.push(initial_node)
+        # best g(n) each state has been pushed with, a state reached again is only pushed if it's cheaper, so the
+        # frontier holds at most one node per state and g(n), and a node popped with a higher g(n) than the best is
+        # a stale duplicate
+        # with a consistent heuristic a state is expanded at most once, so this also keeps track of visited nodes
+        best_depths = {board.canonical_key(initial_node.key, initial_node.blank) if symmetric else initial_node.key: 0}
+        # counter for number of nodes expanded and pushed
         nodes_expanded = 0
+        nodes_generated = 0
+        # counters for children and popped nodes dropped as duplicates
+        duplicates = 0
+        stale_pops = 0
+        max_nodes = self.node_limit()
         # keep track of maximum size of queue
         max_queue_size = 0
 
@@ -198,58 +551,736 @@ class Heuristics:
 
             # if EMPTY(nodes) then return "failure" (we have proved there is no solution!)
             if len(frontier_nodes) == 0:
-                # return null as there is no solution
-                print("There is no solution for given initial state: ")
-                initial_node.print_state()
-                return None
-            
+                # no goal node as there is no solution
+                result = SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      nodes_generated=nodes_generated)
+                return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
+
             # node = REMOVE-FRONT(nodes)
-            node = heapq.heappop(frontier_nodes)
+            node = frontier_nodes.pop()
             # if problem.GOAL - TEST(node.STATE) succeeds
-            if node.state == Heuristics.goal_state:
+            if node.key == board.goal_key:
                 # goal state reached
-                print(f"\nDepth of solution: {node.depth}")
-                print(f"Number of nodes expanded: {nodes_expanded}")
-                print(f"Maximum queue size: {max_queue_size}")
-                return node
-
-            # convert state to tuple for hashing
-            state_tuple = tuple(map(tuple, node.state))
-            # check if state is already visited
-            if state_tuple in visited:
+                result = SearchResult(node, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      nodes_generated=nodes_generated)
+                result.bound = float(weight)
+                return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
+
+            # skip nodes that were pushed again with a lower g(n), packed states hash directly
+            if node.depth > best_depths[board.canonical_key(node.key, node.blank) if symmetric else node.key]:
+                stale_pops += 1
                 continue
 
-            # add the tuple to visited set
-            visited.add(state_tuple)
+            if nodes_expanded >= max_nodes:
+                result = SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      "budget_exceeded", nodes_generated)
+                return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
 
             # nodes = QUEUEING-FUNCTION(nodes, EXPAND(node, problem.OPERATORS))
-            print(f"\nThe best state to expand with a g(n) = {node.depth} and h(n) = {node.heuristic_cost} is:")
-            node.print_state()
-            expanded_nodes = node.expand_all()
+            if trace is not None:
+                if profile is not None:
+                    profile.record(nodes_generated, duplicates, stale_pops, nodes_generated if delta_table else 0)
+                trace(node)
             # increment the number of nodes expanded
             nodes_expanded += 1
-            for expanded_node in expanded_nodes:
-                # check if the child is already visited
-                child_tuple = tuple(map(tuple, expanded_node.state))
-                if child_tuple not in visited:
+            child_depth = node.depth + 1
+            for child_key, child_blank, tile in board.successors(node.key, node.blank):
+                # check if the child was already reached at least as cheaply before creating a node for it
+                best_key = board.canonical_key(child_key, child_blank) if symmetric else child_key
+                if best_depths.get(best_key, child_depth + 1) > child_depth:
+                    best_depths[best_key] = child_depth
+                    expanded_node = Node(child_key, node, child_depth, child_blank, board)
                     # calculate heuristic cost of expanded nodes
-                    expanded_node.heuristic_cost = heuristic_function(expanded_node.state)
+                    if delta_table is None:
+                        expanded_node.heuristic_cost = heuristic_function(child_key)
+                    else:
+                        # the tile moved from the child's blank cell into the parent's blank cell
+                        expanded_node.heuristic_cost = node.heuristic_cost + delta_table[tile][child_blank][node.blank]
                     # push expanded nodes to queue
-                    heapq.heappush(frontier_nodes, expanded_node)
+                    frontier_nodes.push(expanded_node)
+                    nodes_generated += 1
+                else:
+                    duplicates += 1
+
+    def ara_star_search(self, heuristic_function, delta_table=None, verbose=True, trace=None, weight=ANYTIME_WEIGHT,
+                        weight_step=ANYTIME_WEIGHT_STEP, time_limit=None):
+        # anytime repairing A* (ARA*, Likhachev, Gordon and Thrun), takes the same heuristic_function, delta_table and
+        # trace as a_star_search
+        # a first solution is found quickly by weighted A* with weight, then the weight is lowered by weight_step and
+        # the search repaired, reusing everything it has expanded so far, for a better solution each time until the
+        # weight is 1 and the solution optimal
+        # the search stops early after time_limit seconds or Heuristics.max_nodes expansions with status
+        # "budget_exceeded", keeping the best solution found so far, the result's bound is the one proven for its
+        # solution and result.solutions lists every improving solution
+        # verbose mode also prints every improving solution as it's found
+        if verbose:
+            result = self.anytime_search(heuristic_function, delta_table, trace or Heuristics.print_expansion, weight,
+                                         weight_step, time_limit, Heuristics.print_improvement)
+            return self.report(result)
+        return self.anytime_search(heuristic_function, delta_table, trace, weight, weight_step, time_limit)
+
+    def anytime_search(self, heuristic_function, delta_table=None, trace=None, weight=ANYTIME_WEIGHT,
+                       weight_step=ANYTIME_WEIGHT_STEP, time_limit=None, on_solution=None) -> SearchResult:
+        # silent ARA* search, see ara_star_search for the parameters
+        # on_solution is called with (depth, bound, nodes expanded, seconds) of every improving solution
+        if weight < 1 or weight_step <= 0:
+            raise ValueError(f"weight must be at least 1 and weight_step positive, got {weight!r} and {weight_step!r}")
+        unsolvable = self.precheck()
+        if unsolvable:
+            return unsolvable
+
+        start_time = time.perf_counter()
+        deadline = None if time_limit is None else start_time + time_limit
+        board = self.board
+        heuristic_function = self.packed(heuristic_function)
+        profile = self.profile
+        if profile is not None:
+            profile.start()
+            heuristic_function = profile.wrap_heuristic(heuristic_function)
+            trace = profile.wrap_trace(trace)
+        goal_key = board.goal_key
+        root_key = board.pack(self.initial_state)
+        # best g(n), h(n), blank cell and parent state of every state reached so far
+        depths = {root_key: 0}
+        heuristic_costs = {root_key: heuristic_function(root_key)}
+        blanks = {root_key: board.find_blank(root_key)}
+        parents = {root_key: None}
+        # open states, states expanded in the current pass, and states expanded in the current pass whose g(n) was
+        # lowered after that, which are only reopened for the next pass
+        open_states = {root_key}
+        closed = set()
+        inconsistent = set()
+        # heap of (g(n) + weight * h(n), -g(n), state) of the open states, deepest first on ties, entries are stale
+        # once their state is closed or reached with a lower g(n)
+        frontier = [(weight * heuristic_costs[root_key], 0, root_key)]
+        nodes_expanded = 0
+        nodes_generated = 0
+        duplicates = 0
+        stale_pops = 0
+        max_queue_size = 1
+        max_nodes = self.node_limit()
+        # solutions found so far, and the path and bound of the best one
+        solutions = []
+        best_path = None
+        best_bound = None
+        status = None
+
+        while status is None:
+            # improve the solution with the current weight until no open state could lead to a cheaper one
+            while frontier:
+                cost, negative_depth, key = frontier[0]
+                if key not in open_states or depths[key] != -negative_depth:
+                    heapq.heappop(frontier)
+                    stale_pops += 1
+                    continue
+                goal_depth = depths.get(goal_key)
+                if goal_depth is not None and goal_depth <= cost:
+                    break
+                if nodes_expanded >= max_nodes or (deadline is not None and time.perf_counter() >= deadline):
+                    status = "budget_exceeded"
+                    break
+
+                heapq.heappop(frontier)
+                open_states.discard(key)
+                closed.add(key)
+                depth = -negative_depth
+                blank = blanks[key]
+                heuristic_cost = heuristic_costs[key]
+                if trace is not None:
+                    if profile is not None:
+                        profile.record(nodes_generated, duplicates, stale_pops,
+                                       len(heuristic_costs) - 1 if delta_table else 0)
+                    node = Node(key, None, depth, blank, board)
+                    node.heuristic_cost = heuristic_cost
+                    trace(node)
+                nodes_expanded += 1
+
+                child_depth = depth + 1
+                for child_key, child_blank, tile in board.successors(key, blank):
+                    if depths.get(child_key, child_depth + 1) <= child_depth:
+                        duplicates += 1
+                        continue
+                    depths[child_key] = child_depth
+                    parents[child_key] = key
+                    child_heuristic_cost = heuristic_costs.get(child_key)
+                    if child_heuristic_cost is None:
+                        blanks[child_key] = child_blank
+                        if delta_table is None:
+                            child_heuristic_cost = heuristic_function(child_key)
+                        else:
+                            # the tile moved from the child's blank cell into the parent's blank cell
+                            child_heuristic_cost = heuristic_cost + delta_table[tile][child_blank][blank]
+                        heuristic_costs[child_key] = child_heuristic_cost
+                    if child_key in closed:
+                        inconsistent.add(child_key)
+                    else:
+                        open_states.add(child_key)
+                        heapq.heappush(frontier, (child_depth + weight * child_heuristic_cost, -child_depth, child_key))
+                    nodes_generated += 1
+                max_queue_size = max(max_queue_size, len(open_states) + len(inconsistent))
+
+            if status is not None:
+                break
+            goal_depth = depths.get(goal_key)
+            if goal_depth is None:
+                # every reachable state was expanded without reaching the goal
+                status = "exhausted"
+                break
+
+            # no solution costs less than the lowest f(n) of the states that could still be improved
+            lower_bound = min((depths[key] + heuristic_costs[key] for key in open_states | inconsistent), default=None)
+            if goal_depth == 0 or not lower_bound:
+                bound = 1.0
+            else:
+                bound = max(1.0, min(float(weight), goal_depth / lower_bound))
+            if best_path is None or goal_depth < len(best_path) - 1:
+                best_path = [goal_key]
+                while parents[best_path[-1]] is not None:
+                    best_path.append(parents[best_path[-1]])
+                best_path.reverse()
+                solutions.append((goal_depth, bound, nodes_expanded, time.perf_counter() - start_time))
+                if on_solution is not None:
+                    on_solution(*solutions[-1])
+            # a lower weight can prove a tighter bound for the same solution
+            best_bound = bound if best_bound is None else min(best_bound, bound)
+            if bound == 1:
+                status = "solved"
+                break
+
+            # repair with a lower weight, starting from every open and inconsistent state
+            weight = max(1, weight - weight_step)
+            open_states |= inconsistent
+            inconsistent.clear()
+            closed.clear()
+            frontier = [(depths[key] + weight * heuristic_costs[key], -depths[key], key) for key in open_states]
+            heapq.heapify(frontier)
+
+        goal_node = Node.from_path(best_path, board, heuristic_costs.__getitem__) if best_path else None
+        result = SearchResult(goal_node, nodes_expanded, max_queue_size, time.perf_counter() - start_time, status,
+                              nodes_generated)
+        result.bound = best_bound
+        result.solutions = solutions
+        return self.profiled(result, duplicates, stale_pops, len(heuristic_costs) - 1 if delta_table else 0)
+
+    def compact_a_star_search(self, heuristic_function, delta_table=None, verbose=True, trace=None):
+        # A* keeping every reached state in a NodeStore instead of a dict and a Node per state, takes the same
+        # heuristic_function, delta_table and trace as a_star_search
+        # the open list holds plain ints in buckets by f(n) and g(n), deepest first on ties like the bucket frontier,
+        # and the solution path is rebuilt by replaying the recorded moves, so memory is a fixed 1.25 bytes per
+        # possible state plus the open list, only up to the 8-puzzle though
+        # it expands exactly the states a_star_search does with a consistent heuristic
+        if verbose:
+            result = self.compact_search(heuristic_function, delta_table, trace or Heuristics.print_expansion)
+            return self.report(result)
+        return self.compact_search(heuristic_function, delta_table, trace)
+
+    def compact_search(self, heuristic_function, delta_table=None, trace=None) -> SearchResult:
+        # silent compact A* search, see compact_a_star_search for the parameters
+        board = self.board
+        store = NodeStore(board)
+        unsolvable = self.precheck()
+        if unsolvable:
+            return unsolvable
+
+        start_time = time.perf_counter()
+        heuristic_function = self.packed(heuristic_function)
+        # h(n) of the states on the solution path, which isn't counted as search work in the profile
+        path_heuristic = heuristic_function
+        profile = self.profile
+        if profile is not None:
+            profile.start()
+            heuristic_function = profile.wrap_heuristic(heuristic_function)
+            trace = profile.wrap_trace(trace)
+        rank = store.rank
+        depths = store.depths
+        reach = store.reach
+        goal_key = board.goal_key
+        root_key = board.pack(self.initial_state)
+        root_blank = board.find_blank(root_key)
+        depths[rank(root_key)] = 0
+        # buckets[f][g] is a stack of the open states with that f(n) and g(n), each packed with its blank cell as
+        # key << 4 | blank, h(n) is f(n) - g(n)
+        lowest = heuristic_function(root_key)
+        buckets: List[List[List[int]]] = [[] for _ in range(lowest)] + [[[root_key << 4 | root_blank]]]
+        open_size = 1
+        nodes_expanded = 0
+        nodes_generated = 0
+        duplicates = 0
+        stale_pops = 0
+        max_nodes = self.node_limit()
+        max_queue_size = 1
+
+        while open_size:
+            # lowest f(n) first, then highest g(n)
+            while not any(buckets[lowest]):
+                lowest += 1
+            bucket = buckets[lowest]
+            depth = len(bucket) - 1
+            while not bucket[depth]:
+                depth -= 1
+            entry = bucket[depth].pop()
+            open_size -= 1
+            key = entry >> 4
+            blank = entry & 15
+            heuristic_cost = lowest - depth
+
+            if key == goal_key:
+                goal_node = Node.from_path(store.path(key, blank, root_key), board, path_heuristic)
+                result = SearchResult(goal_node, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      nodes_generated=nodes_generated)
+                return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
+            # skip states that were pushed again with a lower g(n)
+            if depths[rank(key)] < depth:
+                stale_pops += 1
+                continue
+            if nodes_expanded >= max_nodes:
+                result = SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      "budget_exceeded", nodes_generated)
+                return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
+
+            if trace is not None:
+                if profile is not None:
+                    profile.record(nodes_generated, duplicates, stale_pops, nodes_generated if delta_table else 0)
+                node = Node(key, None, depth, blank, board)
+                node.heuristic_cost = heuristic_cost
+                trace(node)
+            nodes_expanded += 1
+            child_depth = depth + 1
+            for child_key, child_blank, tile in board.successors(key, blank):
+                child_rank = rank(child_key)
+                if depths[child_rank] <= child_depth:
+                    duplicates += 1
+                    continue
+                reach(child_rank, child_depth, blank, child_blank)
+                if delta_table is None:
+                    child_cost = child_depth + heuristic_function(child_key)
+                else:
+                    # the tile moved from the child's blank cell into the parent's blank cell
+                    child_cost = child_depth + heuristic_cost + delta_table[tile][child_blank][blank]
+                while len(buckets) <= child_cost:
+                    buckets.append([])
+                child_bucket = buckets[child_cost]
+                while len(child_bucket) <= child_depth:
+                    child_bucket.append([])
+                child_bucket[child_depth].append(child_key << 4 | child_blank)
+                open_size += 1
+                # an inconsistent heuristic can give a child a lower f(n) than its parent
+                if child_cost < lowest:
+                    lowest = child_cost
+                nodes_generated += 1
+            max_queue_size = max(max_queue_size, open_size)
+
+        result = SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                              nodes_generated=nodes_generated)
+        return self.profiled(result, duplicates, stale_pops, nodes_generated if delta_table else 0)
+
+    def ida_star_search(self, heuristic_function, delta_table=None, verbose=True, trace=None):
+        # iterative deepening A*, takes the same parameters as a_star_search
+        # memory only grows with the depth of the solution: a single path of packed states is kept, moves are applied
+        # by pushing the child state and undone by popping it, and no Node is created per child
+        if verbose:
+            result = self.iterative_deepening_search(heuristic_function, delta_table,
+                                                     trace or Heuristics.print_expansion)
+            return self.report(result)
+        return self.iterative_deepening_search(heuristic_function, delta_table, trace)
+
+    def iterative_deepening_search(self, heuristic_function, delta_table=None, trace=None) -> SearchResult:
+        # silent IDA* search, see ida_star_search for the parameters
+        # the max_queue_size of the result is the longest path held in memory
+        # IDA* can't tell when it has exhausted the state space, so unsolvable states are always rejected up front
+        unsolvable = self.precheck()
+        if unsolvable or not self.board.is_solvable(self.board.pack(self.initial_state)):
+            return unsolvable or SearchResult(None, 0, 0, 0.0, "unsolvable")
+
+        start_time = time.perf_counter()
+        board = self.board
+        heuristic_function = self.packed(heuristic_function)
+        # h(n) of the states on the solution path, which isn't counted as search work in the profile
+        path_heuristic = heuristic_function
+        profile = self.profile
+        if profile is not None:
+            profile.start()
+            heuristic_function = profile.wrap_heuristic(heuristic_function)
+            trace = profile.wrap_trace(trace)
+        root_key = board.pack(self.initial_state)
+        root_heuristic_cost = heuristic_function(root_key)
+        # current path from the root, the goal is found when the last state is the goal state
+        path = [root_key]
+        successors = board.successors
+        goal_key = board.goal_key
+        nodes_expanded = 0
+        nodes_generated = 0
+        max_path_length = 1
+        max_nodes = self.node_limit()
+        # f(n) limit of the current iteration
+        threshold = root_heuristic_cost
+
+        # depth first search below threshold, returns -1 if the goal was found, -2 if the node budget ran out, else the
+        # smallest f(n) over threshold
+        def bounded_search(key, blank, previous_blank, depth, heuristic_cost):
+            nonlocal nodes_expanded, nodes_generated, max_path_length
+            cost = depth + heuristic_cost
+            if cost > threshold:
+                return cost
+            if key == goal_key:
+                return -1
+            if nodes_expanded >= max_nodes:
+                return -2
+
+            if trace is not None:
+                if profile is not None:
+                    profile.record(nodes_generated, heuristic_updates=nodes_generated if delta_table else 0)
+                node = Node(key, None, depth, blank, board)
+                node.heuristic_cost = heuristic_cost
+                trace(node)
+            nodes_expanded += 1
+            max_path_length = max(max_path_length, depth + 2)
+
+            next_threshold = float("inf")
+            for child_key, child_blank, tile in successors(key, blank):
+                # moving the blank straight back would undo the last move
+                if child_blank == previous_blank:
+                    continue
+                nodes_generated += 1
+                if delta_table is None:
+                    child_heuristic_cost = heuristic_function(child_key)
+                else:
+                    child_heuristic_cost = heuristic_cost + delta_table[tile][child_blank][blank]
+
+                # apply the move
+                path.append(child_key)
+                child_cost = bounded_search(child_key, child_blank, blank, depth + 1, child_heuristic_cost)
+                if child_cost < 0:
+                    return child_cost
+                # undo the move
+                path.pop()
+                next_threshold = min(next_threshold, child_cost)
+
+            return next_threshold
+
+        root_blank = board.find_blank(root_key)
+        while True:
+            next_threshold = bounded_search(root_key, root_blank, -1, 0, root_heuristic_cost)
+            if next_threshold == -2:
+                result = SearchResult(None, nodes_expanded, max_path_length, time.perf_counter() - start_time,
+                                      "budget_exceeded", nodes_generated)
+                return self.profiled(result, heuristic_updates=nodes_generated if delta_table else 0)
+            if next_threshold < 0:
+                goal_node = Node.from_path(path, board, path_heuristic)
+                result = SearchResult(goal_node, nodes_expanded, max_path_length, time.perf_counter() - start_time,
+                                      nodes_generated=nodes_generated)
+                return self.profiled(result, heuristic_updates=nodes_generated if delta_table else 0)
+            if next_threshold == float("inf"):
+                result = SearchResult(None, nodes_expanded, max_path_length, time.perf_counter() - start_time,
+                                      nodes_generated=nodes_generated)
+                return self.profiled(result, heuristic_updates=nodes_generated if delta_table else 0)
+            threshold = next_threshold
+
+    def bidirectional_search(self, forward_heuristic, backward_heuristic, verbose=True, trace=None):
+        # bidirectional search that meets in the middle (MM), one search goes forward from the initial state and one
+        # goes backward from the goal state, taking turns
+        # forward_heuristic estimates the distance of a state to the goal, backward_heuristic its distance to the
+        # initial state, both must be admissible, with both returning 0 this is a bidirectional uniform cost search
+        # they are called with states the same way as the heuristic_function of a_star_search
+        # verbose and trace work the same as in a_star_search
+        if verbose:
+            result = self.meet_in_the_middle_search(forward_heuristic, backward_heuristic,
+                                                    trace or Heuristics.print_expansion)
+            return self.report(result)
+        return self.meet_in_the_middle_search(forward_heuristic, backward_heuristic, trace)
+
+    def meet_in_the_middle_search(self, forward_heuristic, backward_heuristic, trace=None) -> SearchResult:
+        # silent MM search, see bidirectional_search for the parameters
+        # each direction orders its open list by priority max(f(n), 2 * g(n)), so neither search goes past the
+        # middle of the solution before the other, and it stops once the best path found through a state reached by
+        # both directions is no longer than the lower bound given by both open lists
+        unsolvable = self.precheck()
+        if unsolvable:
+            return unsolvable
+
+        start_time = time.perf_counter()
+        board = self.board
+        max_nodes = self.node_limit()
+        forward_heuristic = self.packed(forward_heuristic)
+        backward_heuristic = self.packed(backward_heuristic)
+        # h(n) of the states on the solution path, which isn't counted as search work in the profile
+        path_heuristic = forward_heuristic
+        profile = self.profile
+        if profile is not None:
+            profile.start()
+            forward_heuristic = profile.wrap_heuristic(forward_heuristic)
+            backward_heuristic = profile.wrap_heuristic(backward_heuristic)
+            trace = profile.wrap_trace(trace)
+        initial_key = board.pack(self.initial_state)
+        if initial_key == board.goal_key:
+            return self.profiled(SearchResult(Node(initial_key, None, 0, None, board), 0, 1,
+                                              time.perf_counter() - start_time))
+
+        forward = SearchDirection(board, initial_key, forward_heuristic)
+        backward = SearchDirection(board, board.goal_key, backward_heuristic)
+        # length of the best path found so far and the state where its two halves meet
+        best_cost = float("inf")
+        meeting_key = None
+        nodes_expanded = 0
+        nodes_generated = 0
+        duplicates = 0
+        max_queue_size = 2
+
+        while True:
+            forward_priority = forward.min_priority()
+            backward_priority = backward.min_priority()
+            if forward_priority is None or backward_priority is None:
+                # one direction ran out of states, so the best path found (if any) is the only one
+                break
+            # stop once no open state can lead to a shorter path
+            lower_bound = max(min(forward_priority, backward_priority), forward.min_cost(), backward.min_cost(),
+                              forward.min_depth() + backward.min_depth() + 1)
+            if best_cost <= lower_bound:
+                break
+            if nodes_expanded >= max_nodes:
+                result = SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                      "budget_exceeded", nodes_generated)
+                return self.profiled(result, duplicates)
+
+            # expand the direction with the lower priority, the smaller open list on ties
+            if (forward_priority, len(forward.open)) <= (backward_priority, len(backward.open)):
+                direction, other = forward, backward
+            else:
+                direction, other = backward, forward
+            _, depth, key, blank = heapq.heappop(direction.frontier)
+            heuristic_cost = direction.heuristic_function(key)
+            direction.open.discard(key)
+            direction.count(depth, depth + heuristic_cost, -1)
+
+            if trace is not None:
+                if profile is not None:
+                    profile.record(nodes_generated, duplicates)
+                node = Node(key, None, depth, blank, board)
+                node.heuristic_cost = heuristic_cost
+                trace(node)
+            nodes_expanded += 1
+
+            child_depth = depth + 1
+            for child_key, child_blank, _ in board.successors(key, blank):
+                previous_depth = direction.depths.get(child_key)
+                if previous_depth is not None and previous_depth <= child_depth:
+                    duplicates += 1
+                    continue
+                if child_key in direction.open:
+                    # the child is reached with a lower g(n) than its stale open entry
+                    direction.count(previous_depth, previous_depth + direction.heuristic_function(child_key), -1)
+                # closed states reached with a lower g(n) are reopened
+                direction.open.add(child_key)
+                direction.depths[child_key] = child_depth
+                direction.parents[child_key] = key
+                child_heuristic_cost = direction.heuristic_function(child_key)
+                direction.count(child_depth, child_depth + child_heuristic_cost, 1)
+                heapq.heappush(direction.frontier, (max(child_depth + child_heuristic_cost, 2 * child_depth),
+                                                    child_depth, child_key, child_blank))
+                nodes_generated += 1
+
+                # the child has been reached from the other side too, which gives a full path
+                other_depth = other.depths.get(child_key)
+                if other_depth is not None and child_depth + other_depth < best_cost:
+                    best_cost = child_depth + other_depth
+                    meeting_key = child_key
+
+            max_queue_size = max(max_queue_size, len(forward.open) + len(backward.open))
 
+        if meeting_key is None:
+            return self.profiled(SearchResult(None, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                              nodes_generated=nodes_generated), duplicates)
 
-    def uniform_cost_search(self):
-        print("\nUniform Cost Search")
+        # join the forward parent chain up to the meeting state with the backward chain from it to the goal
+        path = []
+        key = meeting_key
+        while key is not None:
+            path.append(key)
+            key = forward.parents[key]
+        path.reverse()
+        key = backward.parents[meeting_key]
+        while key is not None:
+            path.append(key)
+            key = backward.parents[key]
+
+        goal_node = Node.from_path(path, board, path_heuristic)
+        return self.profiled(SearchResult(goal_node, nodes_expanded, max_queue_size, time.perf_counter() - start_time,
+                                          nodes_generated=nodes_generated), duplicates)
+
+    def solve(self, algorithm: str, cache: SolutionCache = None) -> SearchResult:
+        # runs the entry point named algorithm in SOLVERS silently
+        # with a cache, a solution cached for the initial state is returned without searching, and new solutions
+        # are added to it
+        if algorithm not in SOLVERS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, choose from {', '.join(SOLVERS)}")
+        if cache is None:
+            return getattr(self, SOLVERS[algorithm])(verbose=False)
+
+        start_time = time.perf_counter()
+        initial_key = self.board.pack(self.initial_state)
+        cached = cache.lookup(algorithm, self.board.size, initial_key)
+        if cached is not None:
+            status, path = cached
+            goal_node = Node.from_path(path, self.board) if path else None
+            result = SearchResult(goal_node, 0, 0, time.perf_counter() - start_time, status)
+            result.cached = True
+            if goal_node is not None:
+                result.bound = BOUNDED_SOLVERS.get(algorithm, 1.0)
+            return result
+
+        result = getattr(self, SOLVERS[algorithm])(verbose=False)
+        if result.status == "budget_exceeded":
+            # another search with a bigger budget could still solve it, or find a better solution
+            return result
+        # the rest of a solution that's only within a bound of optimal isn't within that bound from the later states
+        cache.store(algorithm, self.board.size, initial_key, result.status, result.path_keys if result.solved else None,
+                    suffixes=algorithm not in BOUNDED_SOLVERS)
+        return result
+
+    def uniform_cost_search(self, verbose=True, trace=None):
+        if verbose:
+            print("\nUniform Cost Search")
         # call reusable A* function and pass heuristic function as parameter
         # hard code heuristic function to return 0
-        return self.a_star_search(lambda _: 0)
+        return self.a_star_search(zero_heuristic, None, verbose, trace, frontier="bucket")
 
-    def a_star_misplaced_tile(self):
-        print("\nA* with misplaced tile heuristic")
+    def a_star_misplaced_tile(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with misplaced tile heuristic")
         # call reusable A* function and pass misplaced tile heuristic function as parameter
-        return self.a_star_search(self.calculate_misplaced_tile)
+        # misplaced tile is updated incrementally, the full scan is only used for the initial state
+        return self.a_star_search(self.calculate_misplaced_tile, self.board.misplaced_delta, verbose, trace,
+                                  frontier="bucket")
 
-    def a_star_manhattan_distance(self):
-        print("\nA* with manhattan distance heuristic")
+    def a_star_manhattan_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with manhattan distance heuristic")
         # call reusable A* function and pass manhattan distance heuristic function as parameter
-        return self.a_star_search(self.calculate_manhattan_distance)
\ No newline at end of file
+        # manhattan distance is updated incrementally, the full scan is only used for the initial state
+        return self.a_star_search(self.calculate_manhattan_distance, self.board.manhattan_delta, verbose, trace,
+                                  frontier="bucket")
+
+    def weighted_a_star_manhattan_distance(self, verbose=True, trace=None, weight=DEFAULT_WEIGHT):
+        if verbose:
+            print(f"\nWeighted A* with manhattan distance heuristic, weight {weight:g}")
+        # the bucket frontier only orders by whole number weights
+        frontier = "bucket" if weight == int(weight) else "heap"
+        return self.a_star_search(self.calculate_manhattan_distance, self.board.manhattan_delta, verbose, trace,
+                                  frontier=frontier, weight=weight)
+
+    def ara_star_manhattan_distance(self, verbose=True, trace=None, weight=ANYTIME_WEIGHT, time_limit=None):
+        if verbose:
+            print("\nARA* with manhattan distance heuristic")
+        return self.ara_star_search(self.calculate_manhattan_distance, self.board.manhattan_delta, verbose, trace,
+                                    weight, time_limit=time_limit)
+
+    def compact_uniform_cost_search(self, verbose=True, trace=None):
+        if verbose:
+            print("\nUniform Cost Search with a compact node store")
+        return self.compact_a_star_search(zero_heuristic, None, verbose, trace)
+
+    def compact_a_star_manhattan_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with manhattan distance heuristic and a compact node store")
+        return self.compact_a_star_search(self.calculate_manhattan_distance, self.board.manhattan_delta, verbose,
+                                          trace)
+
+    def a_star_linear_conflict(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with manhattan distance plus linear conflict heuristic")
+        return self.a_star_search(LinearConflict.get(self.board), None, verbose, trace, frontier="bucket")
+
+    def a_star_walking_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with walking distance heuristic")
+        # build the walking distance table before searching so it isn't counted in the search time
+        walking_distance = WalkingDistance.get(self.board)
+        return self.a_star_search(walking_distance, None, verbose, trace, frontier="bucket")
+
+    def a_star_pattern_database(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with pattern database heuristic")
+        # load the pattern database before searching so it isn't counted in the search time
+        pattern_database = PatternDatabase.get(self.board)
+        return self.a_star_search(pattern_database, None, verbose, trace, frontier="bucket")
+
+    def a_star_distance_table(self, verbose=True, trace=None):
+        if verbose:
+            print("\nA* with exact distance table heuristic")
+        # the distance table is a perfect heuristic, so A* only expands nodes on optimal paths
+        distance_table = DistanceTable.get(self.board)
+        return self.a_star_search(distance_table, None, verbose, trace, frontier="bucket")
+
+    def distance_table_solve(self, verbose=True, trace=None):
+        if verbose:
+            print("\nSolving with exact distance table")
+        unsolvable = self.precheck()
+        if unsolvable:
+            return self.report(unsolvable) if verbose else unsolvable
+
+        distance_table = DistanceTable.get(self.board)
+        start_time = time.perf_counter()
+        # no search at all, just walk down the table from the initial state
+        path = distance_table.solve(self.board.pack(self.initial_state))
+        goal_node = None
+        if path is not None:
+            for depth, key in enumerate(path):
+                goal_node = Node(key, goal_node, depth, None, self.board)
+                goal_node.heuristic_cost = len(path) - 1 - depth
+                # every state on the path except the goal is expanded once
+                if trace is not None and depth < len(path) - 1:
+                    trace(goal_node)
+        nodes_expanded = goal_node.depth if goal_node else 0
+        # the next state on the path is the only one generated at each step
+        result = SearchResult(goal_node, nodes_expanded, 0, time.perf_counter() - start_time,
+                              nodes_generated=nodes_expanded)
+        return self.report(result) if verbose else result
+
+    def ida_star_misplaced_tile(self, verbose=True, trace=None):
+        if verbose:
+            print("\nIDA* with misplaced tile heuristic")
+        return self.ida_star_search(self.calculate_misplaced_tile, self.board.misplaced_delta, verbose, trace)
+
+    def ida_star_manhattan_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nIDA* with manhattan distance heuristic")
+        return self.ida_star_search(self.calculate_manhattan_distance, self.board.manhattan_delta, verbose, trace)
+
+    def ida_star_linear_conflict(self, verbose=True, trace=None):
+        if verbose:
+            print("\nIDA* with manhattan distance plus linear conflict heuristic")
+        return self.ida_star_search(LinearConflict.get(self.board), None, verbose, trace)
+
+    def ida_star_walking_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nIDA* with walking distance heuristic")
+        walking_distance = WalkingDistance.get(self.board)
+        return self.ida_star_search(walking_distance, None, verbose, trace)
+
+    def ida_star_pattern_database(self, verbose=True, trace=None):
+        if verbose:
+            print("\nIDA* with pattern database heuristic")
+        # the strongest memory-bounded option, meant for the 15-puzzle
+        pattern_database = PatternDatabase.get(self.board)
+        return self.ida_star_search(pattern_database, None, verbose, trace)
+
+    def bidirectional_uniform_cost_search(self, verbose=True, trace=None):
+        if verbose:
+            print("\nBidirectional Uniform Cost Search")
+        # no heuristic in either direction, both searches grow one layer at a time until they meet
+        return self.bidirectional_search(zero_heuristic, zero_heuristic, verbose, trace)
+
+    def bidirectional_manhattan_distance(self, verbose=True, trace=None):
+        if verbose:
+            print("\nBidirectional MM search with manhattan distance heuristic")
+        # the backward search estimates the distance to the initial state with manhattan distances to where each
+        # tile starts
+        to_initial_table = self.board.manhattan_table_to(self.board.pack(self.initial_state))
+        tiles = self.board.tiles
+
+        @packed_heuristic
+        def manhattan_distance_to_initial(key):
+            return sum(to_initial_table[tile][cell] for cell, tile in enumerate(tiles(key)))
+
+        return self.bidirectional_search(self.calculate_manhattan_distance, manhattan_distance_to_initial, verbose,
+                                         trace)
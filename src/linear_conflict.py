@@ -0,0 +1,68 @@
+from typing import Dict, List, Sequence, Tuple
+
+from board import Board
+
+
+def longest_increasing(values: Sequence[int]) -> int:
+    # length of the longest strictly increasing subsequence, lines are at most a few cells long so O(n^2) is plenty
+    lengths = []
+    for i, value in enumerate(values):
+        lengths.append(1 + max([lengths[j] for j in range(i) if values[j] < value], default=0))
+    return max(lengths, default=0)
+
+
+class LinearConflict:
+    # manhattan distance plus linear conflicts
+    # two tiles in their goal row (or column) but in the wrong order relative to each other are in conflict: one of
+    # them has to leave the line and come back, which costs 2 moves manhattan distance doesn't count
+    # for every line, the tiles that have to leave are all those not in the longest set already in order, so each line
+    # adds 2 * (tiles in their goal line - longest increasing subsequence of their goal positions), which keeps the
+    # heuristic admissible since moves out of one line are never moves out of another line of the same direction
+    # instances are cached per board, see LinearConflict.get
+    instances: Dict[int, "LinearConflict"] = {}
+    # instances are called with packed states, see heuristics.packed_heuristic
+    packed_keys = True
+
+    def __init__(self, board: Board):
+        self.board = board
+        # penalties[line] maps the tiles of a line to its conflict cost, filled in as lines are seen
+        # lines 0 to size - 1 are the rows, the rest are the columns
+        self.penalties: List[Dict[Tuple[int, ...], int]] = [{} for _ in range(2 * board.size)]
+
+    @classmethod
+    def get(cls, board: Board) -> "LinearConflict":
+        if board.size not in cls.instances:
+            cls.instances[board.size] = cls(board)
+        return cls.instances[board.size]
+
+    def line_penalty(self, line: int, line_tiles: Tuple[int, ...]) -> int:
+        # conflict cost of the tiles of a row (line < size) or column, in order along the line
+        size = self.board.size
+        if line < size:
+            # goal columns of the tiles whose goal row is this row
+            positions = [(tile - 1) % size for tile in line_tiles if tile and (tile - 1) // size == line]
+        else:
+            # goal rows of the tiles whose goal column is this column
+            positions = [(tile - 1) // size for tile in line_tiles if tile and (tile - 1) % size == line - size]
+        return 2 * (len(positions) - longest_increasing(positions))
+
+    def __call__(self, key: int) -> int:
+        board = self.board
+        size = board.size
+        tiles = board.tiles(key)
+        manhattan_table = board.manhattan_table
+        cost = 0
+        for cell, tile in enumerate(tiles):
+            cost += manhattan_table[tile][cell]
+
+        penalties = self.penalties
+        for line in range(2 * size):
+            if line < size:
+                line_tiles = tuple(tiles[line * size:(line + 1) * size])
+            else:
+                line_tiles = tuple(tiles[line - size::size])
+            penalty = penalties[line].get(line_tiles)
+            if penalty is None:
+                penalty = penalties[line][line_tiles] = self.line_penalty(line, line_tiles)
+            cost += penalty
+        return cost
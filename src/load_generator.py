@@ -0,0 +1,118 @@
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from board import Board
+from benchmark import DEFAULT_PER_DEPTH, DEFAULT_SEED, stratified_puzzles
+from heuristics import SOLVERS
+from solver_service import DEFAULT_HOST, DEFAULT_PORT, request
+
+DEFAULT_REQUESTS = 200
+DEFAULT_CONCURRENCY = 8
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # nearest rank percentile of already sorted values
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def request_stream(requests: int, per_depth: int, seed: int) -> List[str]:
+    # puzzle lines for every request, drawn with replacement from the stratified puzzles so some puzzles are asked
+    # for while they're still being solved, which is what the service coalesces
+    board = Board.of(3)
+    puzzles = [", ".join(map(str, board.tiles(key))) for _, key in stratified_puzzles(per_depth, seed)]
+    rng = random.Random(seed)
+    return [rng.choice(puzzles) for _ in range(requests)]
+
+
+async def run_load(host: str, port: int, puzzles: List[str], concurrency: int = DEFAULT_CONCURRENCY,
+                   algorithm: str = "manhattan", timeout: float = None, max_nodes: int = None) -> dict:
+    # closed loop: each of concurrency clients has its own connection and sends its next request as soon as the
+    # last one is answered, until every puzzle has been asked for
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_request = iter(enumerate(puzzles))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for request_id, puzzle in next_request:
+                payload = {"id": request_id, "puzzle": puzzle, "algorithm": algorithm}
+                if timeout is not None:
+                    payload["timeout"] = timeout
+                if max_nodes is not None:
+                    payload["max_nodes"] = max_nodes
+                start = time.perf_counter()
+                response = await request(reader, writer, payload)
+                latencies.append(time.perf_counter() - start)
+                statuses[response["status"]] = statuses.get(response["status"], 0) + 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, len(puzzles)) or 1)))
+    elapsed = time.perf_counter() - start
+
+    # the service's own counters, to see how many requests were coalesced
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        service_stats = (await request(reader, writer, {"stats": True}))["stats"]
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "algorithm": algorithm,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "statuses": statuses,
+        "service": service_stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send seeded random 8-puzzles to a running solver service from "
+                                                 "concurrent clients and report throughput and latency as JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"service address (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"service port (default {DEFAULT_PORT})")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS,
+                        help=f"requests to send (default {DEFAULT_REQUESTS})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"clients sending requests at the same time (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--algorithm", choices=SOLVERS, default="manhattan",
+                        help="algorithm to ask for (default manhattan)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="seconds the service waits for each search (default the service's)")
+    parser.add_argument("--max-nodes", type=int, default=None,
+                        help="node budget for each search (default the service's)")
+    parser.add_argument("--per-depth", type=int, default=DEFAULT_PER_DEPTH,
+                        help=f"distinct puzzles at each depth to draw from (default {DEFAULT_PER_DEPTH})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default {DEFAULT_SEED})")
+    args = parser.parse_args(argv)
+
+    puzzles = request_stream(args.requests, args.per_depth, args.seed)
+    report = asyncio.run(run_load(args.host, args.port, puzzles, args.concurrency, args.algorithm, args.timeout,
+                                  args.max_nodes))
+    sys.stdout.write(json.dumps(report, indent=1, sort_keys=True) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
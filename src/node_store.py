@@ -0,0 +1,68 @@
+from typing import List
+from math import factorial
+
+from board import Board
+
+# depth of a state that hasn't been reached, states are never that deep on the boards a store supports
+UNSEEN = 255
+
+
+class NodeStore:
+    # g(n) and the move that reached every state of a search, kept in flat byte arrays indexed by the permutation
+    # rank of the state instead of a dict of states and a chain of nodes, one byte and 2 bits per possible state
+    # a move is recorded as the direction the blank moved in, so the path to a state is rebuilt by replaying those
+    # moves backwards from it until the root
+    # there's a slot for every permutation, so searches that exhaust the unreachable half of the states fit too,
+    # which is 9! = 362,880 states and about 450 KB for the 8-puzzle
+    def __init__(self, board: Board):
+        if board.size > 3:
+            # the 15-puzzle already has 16! permutations
+            raise ValueError("node stores are only supported up to the 8-puzzle")
+        self.board = board
+        self.states = factorial(board.cells)
+        # depths[rank] is the lowest g(n) the state has been reached with, UNSEEN if it hasn't been reached
+        self.depths = bytearray([UNSEEN]) * self.states
+        # 2-bit move code of the move that last lowered each state's g(n), 4 states to a byte
+        self.moves = bytearray((self.states + 3) // 4)
+        # change in the blank cell for each move code: left, right, up, down
+        self.offsets = (-1, 1, -board.size, board.size)
+        self.codes = {offset: code for code, offset in enumerate(self.offsets)}
+        # (shift, weight) of the Lehmer digit of every cell but the last, which is always 0
+        self.digits = [(board.shifts[cell], factorial(board.cells - 1 - cell)) for cell in range(board.cells - 1)]
+        # lower_counts[tiles] is the number of tiles in a bitmask of tiles
+        self.lower_counts = [bin(tiles).count("1") for tiles in range(1 << board.cells)]
+
+    def rank(self, key: int) -> int:
+        # index of a packed state among all permutations of the tiles, by its Lehmer code, each digit is the number
+        # of tiles smaller than the one in that cell that aren't in an earlier cell
+        mask = self.board.mask
+        lower_counts = self.lower_counts
+        placed = 0
+        rank = 0
+        for shift, weight in self.digits:
+            tile = (key >> shift) & mask
+            rank += (tile - lower_counts[placed & ((1 << tile) - 1)]) * weight
+            placed |= 1 << tile
+        return rank
+
+    def move_code(self, rank: int) -> int:
+        return (self.moves[rank >> 2] >> ((rank & 3) << 1)) & 3
+
+    def reach(self, rank: int, depth: int, blank: int, child_blank: int):
+        # records that the state with this rank was reached with g(n) depth by moving the blank from blank to
+        # child_blank
+        self.depths[rank] = depth
+        shift = (rank & 3) << 1
+        self.moves[rank >> 2] = (self.moves[rank >> 2] & ~(3 << shift)) | (self.codes[child_blank - blank] << shift)
+
+    def path(self, key: int, blank: int, root_key: int) -> List[int]:
+        # packed states from root_key to key, by undoing the recorded moves from key
+        board = self.board
+        path = [key]
+        while key != root_key:
+            parent_blank = blank - self.offsets[self.move_code(self.rank(key))]
+            key = board.move(key, blank, parent_blank)
+            blank = parent_blank
+            path.append(key)
+        path.reverse()
+        return path
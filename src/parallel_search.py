@@ -0,0 +1,334 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+
+from board import Board
+from benchmark import DEFAULT_SEED, stratified_puzzles
+from heuristics import Heuristics, Node, SearchResult
+
+# heuristics a parallel search can use, by the same names as in SOLVERS, as the Heuristics method computing it on a
+# packed state and the Board delta table updating it from the parent's, either can be None
+HEURISTICS: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    "ucs": (None, None),
+    "misplaced": ("calculate_misplaced_tile", "misplaced_delta"),
+    "manhattan": ("calculate_manhattan_distance", "manhattan_delta"),
+    "linear_conflict": ("calculate_linear_conflict", None),
+    "walking_distance": ("calculate_walking_distance", None),
+}
+# random moves away from the goal of the 15-puzzle instances in the speedup report
+FIFTEEN_PUZZLE_MOVES = 40
+
+
+def owner(key: int, workers: int) -> int:
+    # worker a packed state belongs to, the key is multiplied by a large odd constant first so the high bits, which
+    # depend on every tile, decide instead of the tile in the first cell
+    return ((key * 0x9E3779B97F4A7C15) >> 32) % workers
+
+
+def heuristic_for(board: Board, name: str):
+    # (heuristic function on packed states, delta table or None) for a name in HEURISTICS
+    if name not in HEURISTICS:
+        raise ValueError(f"unknown heuristic {name!r}, choose from {', '.join(HEURISTICS)}")
+    method, delta = HEURISTICS[name]
+    if method is None:
+        return (lambda _: 0), None
+    heuristic_function = getattr(Heuristics(board.goal_state()), method)
+    return heuristic_function, getattr(board, delta) if delta else None
+
+
+class Partition:
+    # the states one worker of a parallel search owns: their best g(n), parent state and an open list heap of
+    # (f(n), -g(n), state, blank cell) entries, deepest first on ties, stale once the state is reached more cheaply
+    def __init__(self, index: int, workers: int, size: int, heuristic: str):
+        self.index = index
+        self.workers = workers
+        self.board = Board.of(size)
+        self.heuristic_function, self.delta_table = heuristic_for(self.board, heuristic)
+        self.depths: Dict[int, int] = {}
+        self.parents: Dict[int, Optional[int]] = {}
+        self.frontier: List[Tuple[int, int, int, int]] = []
+        self.nodes_generated = 0
+
+    def add(self, key: int, blank: int, depth: int, parent: Optional[int], heuristic_cost: int):
+        # opens a state reached with g(n) depth unless it was already reached at least as cheaply
+        if self.depths.get(key, depth + 1) <= depth:
+            return
+        self.depths[key] = depth
+        self.parents[key] = parent
+        heapq.heappush(self.frontier, (depth + heuristic_cost, -depth, key, blank))
+        self.nodes_generated += 1
+
+    def min_cost(self) -> Optional[int]:
+        # lowest f(n) of the open states, dropping stale entries from the top of the heap, None if nothing is open
+        frontier = self.frontier
+        while frontier:
+            _, negative_depth, key, _ = frontier[0]
+            if self.depths[key] == -negative_depth:
+                return frontier[0][0]
+            heapq.heappop(frontier)
+        return None
+
+    def expand(self, cost_bound: int) -> Tuple[List[List[tuple]], int]:
+        # expands every open state with f(n) up to cost_bound, including children of this worker's own that come in
+        # under it, the goal is never expanded since no path through it is shorter
+        # reaching the goal with a g(n) of cost_bound, the lowest f(n) still open anywhere, proves that solution
+        # optimal, so the round ends there
+        # returns the children owned by every other worker as (state, blank, g(n), parent, h(n)), and the number of
+        # states expanded
+        board = self.board
+        goal_key = board.goal_key
+        heuristic_function = self.heuristic_function
+        delta_table = self.delta_table
+        workers = self.workers
+        outboxes: List[List[tuple]] = [[] for _ in range(workers)]
+        nodes_expanded = 0
+        solved = False
+        while not solved and self.frontier and self.frontier[0][0] <= cost_bound:
+            cost, negative_depth, key, blank = heapq.heappop(self.frontier)
+            depth = -negative_depth
+            if self.depths[key] < depth or key == goal_key:
+                continue
+            nodes_expanded += 1
+            heuristic_cost = cost - depth
+            for child_key, child_blank, tile in board.successors(key, blank):
+                if delta_table is None:
+                    child_heuristic_cost = heuristic_function(child_key)
+                else:
+                    # the tile moved from the child's blank cell into the parent's blank cell
+                    child_heuristic_cost = heuristic_cost + delta_table[tile][child_blank][blank]
+                if child_key == goal_key and depth + 1 <= cost_bound:
+                    solved = True
+                child_owner = owner(child_key, workers)
+                if child_owner == self.index:
+                    self.add(child_key, child_blank, depth + 1, key, child_heuristic_cost)
+                else:
+                    outboxes[child_owner].append((child_key, child_blank, depth + 1, key, child_heuristic_cost))
+        return outboxes, nodes_expanded
+
+
+def run_worker(connection: Connection, index: int, workers: int):
+    # loop of a worker process, answering the coordinator's messages until told to stop
+    # ("start", size, heuristic) starts a new search, ("round", cost bound, children) adds the children sent to this
+    # worker and expands up to the bound, ("parent", state) asks for the parent of an owned state
+    partition = None
+    while True:
+        message = connection.recv()
+        if message[0] == "start":
+            partition = Partition(index, workers, message[1], message[2])
+            connection.send(None)
+        elif message[0] == "round":
+            for child in message[2]:
+                partition.add(*child)
+            outboxes, nodes_expanded = partition.expand(message[1])
+            connection.send((outboxes, nodes_expanded, partition.min_cost(),
+                             partition.depths.get(partition.board.goal_key), len(partition.frontier),
+                             partition.nodes_generated))
+        elif message[0] == "parent":
+            connection.send(partition.parents[message[1]])
+        else:
+            return
+
+
+class ParallelAStar:
+    # hash-distributed A* (HDA*, Kishimoto, Fukunaga and Botea) across worker processes, run in bulk synchronous
+    # rounds: every state is owned by one worker chosen by hashing it (see owner), which keeps its g(n), parent and
+    # open entry, and a child generated by another worker is sent to its owner by the coordinator between rounds
+    # each round every worker expands all its open states with the lowest f(n) over all workers and the children
+    # in flight, so states are expanded in the same f(n) order as sequential A*
+    # the goal is never expanded, the search ends once its g(n) is no more than that lowest f(n), at which point no
+    # open state can lead to a cheaper solution, so with a consistent heuristic the solution is optimal
+    # workers are started once and reused for every solve, use it as a context manager or call close
+    def __init__(self, workers: int = None, heuristic: str = "manhattan"):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {heuristic!r}, choose from {', '.join(HEURISTICS)}")
+        self.workers = workers or os.cpu_count() or 1
+        self.heuristic = heuristic
+        self.connections: List[Connection] = []
+        self.processes: List[Process] = []
+        # synchronized rounds the last search took
+        self.rounds = 0
+        for index in range(self.workers):
+            connection, worker_connection = Pipe()
+            process = Process(target=run_worker, args=(worker_connection, index, self.workers), daemon=True)
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("stop",))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def solve(self, heuristics: Heuristics) -> SearchResult:
+        # searches from the initial state of heuristics, honouring its check_solvable and max_nodes, a search over
+        # budget stops after the round that went over it
+        # max_queue_size is the most states open across all workers after a round
+        unsolvable = heuristics.precheck()
+        if unsolvable:
+            return unsolvable
+
+        start_time = time.perf_counter()
+        board = heuristics.board
+        connections = self.connections
+        heuristic_function, _ = heuristic_for(board, self.heuristic)
+        for connection in connections:
+            connection.send(("start", board.size, self.heuristic))
+        for connection in connections:
+            connection.recv()
+
+        root_key = board.pack(heuristics.initial_state)
+        inboxes: List[List[tuple]] = [[] for _ in connections]
+        inboxes[owner(root_key, self.workers)].append((root_key, board.find_blank(root_key), 0, None,
+                                                       heuristic_function(root_key)))
+        # lowest f(n) of every worker's open states, None if it has none
+        min_costs: List[Optional[int]] = [None] * self.workers
+        # cheapest g(n) the goal has been reached with
+        goal_depth = None
+        nodes_expanded = 0
+        nodes_generated = 0
+        max_queue_size = 0
+        rounds = 0
+        status = None
+
+        while True:
+            # f(n) of the children on their way to their owners count as open too
+            in_flight = [depth + heuristic_cost for inbox in inboxes for _, _, depth, _, heuristic_cost in inbox]
+            open_costs = [cost for cost in min_costs + in_flight if cost is not None]
+            if goal_depth is not None and (not open_costs or goal_depth <= min(open_costs)):
+                break
+            if not open_costs:
+                status = "exhausted"
+                break
+            if heuristics.max_nodes is not None and nodes_expanded >= heuristics.max_nodes:
+                status = "budget_exceeded"
+                break
+
+            cost_bound = min(open_costs)
+            for connection, inbox in zip(connections, inboxes):
+                connection.send(("round", cost_bound, inbox))
+            inboxes = [[] for _ in connections]
+            queue_size = 0
+            # workers count the states they generated over the whole search
+            nodes_generated = 0
+            for index, connection in enumerate(connections):
+                (outboxes, expanded, min_costs[index], worker_goal_depth, worker_queue_size,
+                 worker_generated) = connection.recv()
+                for target, outbox in enumerate(outboxes):
+                    inboxes[target].extend(outbox)
+                nodes_expanded += expanded
+                queue_size += worker_queue_size
+                nodes_generated += worker_generated
+                if worker_goal_depth is not None and (goal_depth is None or worker_goal_depth < goal_depth):
+                    goal_depth = worker_goal_depth
+            max_queue_size = max(max_queue_size, queue_size)
+            rounds += 1
+
+        goal_node = None
+        if status is None:
+            # follow the parents back from the goal, asking the owner of each state
+            path = [board.goal_key]
+            while True:
+                connection = connections[owner(path[-1], self.workers)]
+                connection.send(("parent", path[-1]))
+                parent = connection.recv()
+                if parent is None:
+                    break
+                path.append(parent)
+            path.reverse()
+            goal_node = Node.from_path(path, board, heuristic_function)
+
+        self.rounds = rounds
+        return SearchResult(goal_node, nodes_expanded, max_queue_size, time.perf_counter() - start_time, status,
+                            nodes_generated)
+
+
+def fifteen_puzzles(count: int, moves: int = FIFTEEN_PUZZLE_MOVES, seed: int = DEFAULT_SEED) -> List[int]:
+    # packed 15-puzzle states a seeded random walk of moves moves away from the goal, never undoing the last move
+    board = Board.of(4)
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        key, blank, previous_blank = board.goal_key, board.goal_blank, None
+        for _ in range(moves):
+            children = [(child_key, child_blank) for child_key, child_blank, _ in board.successors(key, blank)
+                        if child_blank != previous_blank]
+            previous_blank = blank
+            key, blank = rng.choice(children)
+        puzzles.append(key)
+    return puzzles
+
+
+def measure_speedup(puzzles: Sequence[Tuple[int, int]], heuristic: str = "manhattan", workers: int = None) -> dict:
+    # solves every (board size, packed state) puzzle with sequential A* and the parallel search, checking they agree
+    # on the depth, and reports the time and expansions of both
+    results = []
+    with ParallelAStar(workers, heuristic) as search:
+        for size, key in puzzles:
+            board = Board.of(size)
+            sequential = Heuristics(board.unpack(key)).solve(heuristic)
+            parallel = search.solve(Heuristics(board.unpack(key)))
+            if parallel.depth != sequential.depth:
+                raise AssertionError(f"parallel search found depth {parallel.depth} instead of {sequential.depth}")
+            results.append({
+                "size": size,
+                "puzzle": ", ".join(map(str, board.tiles(key))),
+                "depth": sequential.depth,
+                "sequential_time": sequential.wall_time,
+                "parallel_time": parallel.wall_time,
+                "speedup": sequential.wall_time / parallel.wall_time if parallel.wall_time else 0.0,
+                "sequential_expanded": sequential.nodes_expanded,
+                "parallel_expanded": parallel.nodes_expanded,
+                "rounds": search.rounds,
+            })
+        workers = search.workers
+
+    sequential_time = sum(result["sequential_time"] for result in results)
+    parallel_time = sum(result["parallel_time"] for result in results)
+    return {
+        "heuristic": heuristic,
+        "workers": workers,
+        "cores": os.cpu_count(),
+        "sequential_time": sequential_time,
+        "parallel_time": parallel_time,
+        "speedup": sequential_time / parallel_time if parallel_time else 0.0,
+        "puzzles": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare hash-distributed parallel A* against sequential A* on "
+                                                 "seeded benchmark puzzles, writing the speedup as JSON.")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="manhattan",
+                        help="heuristic for both searches (default manhattan)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default number of cores)")
+    parser.add_argument("--per-depth", type=int, default=1, help="8-puzzles at each depth (default 1)")
+    parser.add_argument("--min-depth", type=int, default=20, help="shallowest 8-puzzles to include (default 20)")
+    parser.add_argument("--fifteen", type=int, default=3, help="15-puzzle instances to include (default 3)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default {DEFAULT_SEED})")
+    args = parser.parse_args(argv)
+
+    puzzles = [(3, key) for depth, key in stratified_puzzles(args.per_depth, args.seed) if depth >= args.min_depth]
+    puzzles += [(4, key) for key in fifteen_puzzles(args.fifteen, seed=args.seed)]
+    report = measure_speedup(puzzles, args.heuristic, args.workers)
+    sys.stdout.write(json.dumps(report, indent=1, sort_keys=True) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
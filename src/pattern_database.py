@@ -0,0 +1,116 @@
+from typing import Dict, List, Sequence, Tuple
+from collections import deque
+import os
+
+from board import Board
+from table_cache import cache_dir, load_or_build_table
+
+# tile groups used when none are given, the groups must be disjoint for their costs to add up
+# the 15-puzzle is split into its four quadrants, larger groups give a stronger heuristic but take much longer to build
+DEFAULT_GROUPS = {3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+                  4: [(1, 2, 5, 6), (3, 4, 7, 8), (9, 10, 13, 14), (11, 12, 15)]}
+
+
+class PatternDatabase:
+    # additive disjoint pattern database heuristic
+    # the tiles are split into disjoint groups, and for every group a table stores the exact number of moves of that
+    # group's tiles needed to bring them home from any placement, with the other tiles treated as indistinguishable
+    # only moves of a group's own tiles are counted, so the costs of all groups can be added and stay admissible
+    # instances are cached per board and groups, see PatternDatabase.get
+    instances: Dict[Tuple, "PatternDatabase"] = {}
+    # instances are called with packed states, see heuristics.packed_heuristic
+    packed_keys = True
+
+    def __init__(self, board: Board, groups: Sequence[Sequence[int]], tables=None):
+        self.board = board
+        self.groups = [tuple(group) for group in groups]
+        # group_of[tile] is the group index of tile, -1 for the blank
+        self.group_of = [-1] * board.cells
+        # weights[tile][cell] is what tile at cell adds to its group's table index
+        # a group's placement is indexed as the sum of position * cells ** i over its tiles
+        self.weights = [[0] * board.cells for _ in range(board.cells)]
+        for group_index, group in enumerate(self.groups):
+            for i, tile in enumerate(group):
+                self.group_of[tile] = group_index
+                self.weights[tile] = [cell * board.cells ** i for cell in range(board.cells)]
+        # one table per group, built by retrograde search from the goal if not given
+        self.tables = tables if tables is not None else [self.build(group) for group in self.groups]
+
+    @classmethod
+    def get(cls, board: Board, groups: Sequence[Sequence[int]] = None) -> "PatternDatabase":
+        # returns the pattern database for board, loading it from the cache directory or building and saving it the
+        # first time it's needed
+        if not groups and board.size not in DEFAULT_GROUPS:
+            raise ValueError(f"no default pattern database groups for a {board.size}x{board.size} board")
+        groups = [tuple(group) for group in (groups or DEFAULT_GROUPS[board.size])]
+        instance_key = (board.size, tuple(groups))
+        if instance_key not in cls.instances:
+            cls.instances[instance_key] = cls.load_or_build(board, groups)
+        return cls.instances[instance_key]
+
+    @classmethod
+    def load_or_build(cls, board: Board, groups: Sequence[Sequence[int]], directory: str = None) -> "PatternDatabase":
+        directory = directory or cache_dir()
+        tables = []
+        for group in groups:
+            path = os.path.join(directory, cls.file_name(board, group))
+            tables.append(load_or_build_table(path, cls.header(board, group), lambda: cls(board, [group]).tables[0]))
+        return cls(board, groups, tables)
+
+    @staticmethod
+    def file_name(board: Board, group: Sequence[int]) -> str:
+        return f"pdb_{board.size}x{board.size}_{'-'.join(map(str, group))}.bin"
+
+    @staticmethod
+    def header(board: Board, group: Sequence[int]) -> str:
+        return f"pdb size={board.size} tiles={','.join(map(str, group))}"
+
+    def index(self, group: Sequence[int], positions: Sequence[int]) -> int:
+        # table index of a group given the cell of each of its tiles
+        return sum(self.weights[tile][cell] for tile, cell in zip(group, positions))
+
+    def build(self, group: Sequence[int]) -> bytearray:
+        # retrograde 0-1 breadth first search from the goal over placements of the group's tiles and the blank
+        # moving a group tile costs 1, moving any other tile costs 0 since those moves aren't counted
+        board = self.board
+        goal_positions = tuple(tile - 1 for tile in group)
+        # distance for every (placement, blank) pair, 255 for not reached yet
+        distances = bytearray([255]) * (board.cells ** len(group) * board.cells)
+        table = bytearray([255]) * (board.cells ** len(group))
+        queue = deque([(0, goal_positions, board.goal_blank)])
+
+        while queue:
+            distance, positions, blank = queue.popleft()
+            index = self.index(group, positions)
+            if distances[index * board.cells + blank] <= distance:
+                continue
+            distances[index * board.cells + blank] = distance
+            # the table keeps the best distance over every blank cell
+            if distance < table[index]:
+                table[index] = distance
+
+            for target in board.neighbors[blank]:
+                if target in positions:
+                    # a group tile slides from target into the blank
+                    moved = positions.index(target)
+                    child_positions = positions[:moved] + (blank,) + positions[moved + 1:]
+                    queue.append((distance + 1, child_positions, target))
+                else:
+                    queue.appendleft((distance, positions, target))
+
+        return table
+
+    def __call__(self, key: int) -> int:
+        # heuristic cost of a packed state, the sum of every group's table entry
+        indexes = [0] * len(self.groups)
+        group_of = self.group_of
+        weights = self.weights
+        for cell, tile in enumerate(self.board.tiles(key)):
+            group_index = group_of[tile]
+            if group_index >= 0:
+                indexes[group_index] += weights[tile][cell]
+        return sum(table[index] for table, index in zip(self.tables, indexes))
+
+    def sizes(self) -> List[int]:
+        # number of bytes used by each group's table
+        return [len(table) for table in self.tables]
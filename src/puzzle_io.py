@@ -0,0 +1,43 @@
+from typing import IO, Iterable, Iterator, List
+import json
+import math
+
+
+def parse_puzzle(line: str) -> List[List[int]]:
+    # parses one puzzle written on a single line as its tiles in row-major order, separated by commas and/or spaces
+    # the board size is taken from the number of tiles, e.g. "1, 2, 3, 4, 5, 6, 7, 0, 8" is an 8-puzzle
+    tiles = [int(tile) for tile in line.replace(",", " ").split()]
+    size = math.isqrt(len(tiles))
+    if size < 2 or size * size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+        raise ValueError(f"not a valid puzzle: {line.strip()!r}")
+    return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+
+def check_puzzle(puzzle: List[List[int]]) -> List[List[int]]:
+    # checks a puzzle given as a nested list holds the same as a line parse_puzzle accepts, a square of rows with
+    # every tile from 0 to the largest once, and returns it
+    size = len(puzzle)
+    if all(isinstance(row, list) and len(row) == size for row in puzzle):
+        tiles = [tile for row in puzzle for tile in row]
+        if size >= 2 and all(isinstance(tile, int) for tile in tiles) and sorted(tiles) == list(range(size * size)):
+            return puzzle
+    raise ValueError(f"not a valid puzzle: {puzzle!r}")
+
+
+def read_puzzle_lines(file: IO[str]) -> Iterator[str]:
+    # lazily yields the puzzle lines of a file one at a time, skipping blank lines and # comments
+    # lines are parsed by whoever solves them, so a bad line only fails that puzzle
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def write_results(results: Iterable[dict], file: IO[str]) -> int:
+    # writes each result as one line of JSON as soon as it's available, returns the number written
+    count = 0
+    for result in results:
+        file.write(json.dumps(result) + "\n")
+        file.flush()
+        count += 1
+    return count
@@ -0,0 +1,128 @@
+from typing import Callable, Dict, Optional
+import time
+
+
+class SearchProfile:
+    # opt-in counters and timers for a search, given to Heuristics(profile=...)
+    # the search only wraps its heuristic function, trace hook and frontier when a profile is given, so searches
+    # without one run exactly as before
+    # progress, if given, is called with the profile every progress_interval expansions while the search runs
+    def __init__(self, progress: Callable[["SearchProfile"], None] = None, progress_interval: int = 10000):
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.counters: Dict[str, int] = {}
+        # seconds spent in each part, "total" is the whole search and "other" whatever isn't timed separately
+        # (successor generation, node creation, hashing the states)
+        self.timers: Dict[str, float] = {}
+        self.start_time: Optional[float] = None
+        self.reset()
+
+    def reset(self, frontier: bool = False):
+        # zeroes every counter and timer, the frontier ones are only there with frontier, for searches that keep
+        # their open list in a frontier they wrap with wrap_frontier, the others never count pushes and pops
+        # the dicts are updated in place, so wrappers made before stay connected to them
+        counters = self.counters
+        counters.clear()
+        counters.update({
+            "expansions": 0,
+            "generations": 0,
+            # children not pushed because their state was already reached at least as cheaply
+            "duplicates": 0,
+            # popped nodes skipped because their state was pushed again with a lower g(n)
+            "stale_pops": 0,
+            "heuristic_calls": 0,
+            # h(n) of a child updated from its parent's with a delta table instead of a heuristic call
+            "heuristic_updates": 0,
+        })
+        self.timers.clear()
+        self.timers["heuristic"] = 0.0
+        if frontier:
+            counters.update({"pushes": 0, "pops": 0})
+            self.timers.update({"push": 0.0, "pop": 0.0})
+        self.timers.update({"other": 0.0, "total": 0.0})
+
+    def start(self, frontier: bool = False):
+        self.reset(frontier)
+        self.start_time = time.perf_counter()
+
+    def record(self, generations: int, duplicates: int = 0, stale_pops: int = 0, heuristic_updates: int = 0):
+        # counts the search keeps in its own variables, set by the search before every expansion it traces and once
+        # it's done, so progress callbacks see them as of the node being expanded
+        counters = self.counters
+        counters["generations"] = generations
+        counters["duplicates"] = duplicates
+        counters["stale_pops"] = stale_pops
+        counters["heuristic_updates"] = heuristic_updates
+
+    def stop(self):
+        timers = self.timers
+        timers["total"] = time.perf_counter() - self.start_time
+        timers["other"] = max(0.0, timers["total"] - timers["heuristic"] - timers.get("push", 0.0)
+                             - timers.get("pop", 0.0))
+
+    def wrap_heuristic(self, heuristic_function):
+        # heuristic_function counting and timing every call
+        counters = self.counters
+        timers = self.timers
+        perf_counter = time.perf_counter
+
+        def timed_heuristic(key):
+            start = perf_counter()
+            cost = heuristic_function(key)
+            timers["heuristic"] += perf_counter() - start
+            counters["heuristic_calls"] += 1
+            return cost
+
+        return timed_heuristic
+
+    def wrap_trace(self, trace):
+        # trace hook counting expansions and reporting progress, still calling trace if there is one
+        counters = self.counters
+
+        def counting_trace(node):
+            counters["expansions"] += 1
+            if self.progress is not None and counters["expansions"] % self.progress_interval == 0:
+                self.progress(self)
+            if trace is not None:
+                trace(node)
+
+        return counting_trace
+
+    def wrap_frontier(self, frontier) -> "ProfiledFrontier":
+        # only after start(frontier=True)
+        return ProfiledFrontier(frontier, self)
+
+    def to_dict(self) -> dict:
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+    def print_report(self):
+        print("\nProfile:")
+        for name, count in self.counters.items():
+            print(f"  {name}: {count}")
+        total = self.timers["total"] or 1.0
+        for name, seconds in self.timers.items():
+            print(f"  {name} time: {seconds:.6f}s ({100 * seconds / total:.1f}%)")
+
+
+class ProfiledFrontier:
+    # frontier counting and timing every push and pop of the frontier it wraps
+    def __init__(self, frontier, profile: SearchProfile):
+        self.frontier = frontier
+        self.counters = profile.counters
+        self.timers = profile.timers
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def push(self, node):
+        start = time.perf_counter()
+        self.frontier.push(node)
+        self.timers["push"] += time.perf_counter() - start
+        self.counters["pushes"] += 1
+
+    def pop(self):
+        start = time.perf_counter()
+        node = self.frontier.pop()
+        self.timers["pop"] += time.perf_counter() - start
+        self.counters["pops"] += 1
+        return node
@@ -0,0 +1,95 @@
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+import json
+import os
+
+from board import Board
+
+class SolutionCache:
+    # least recently used cache of solutions, keyed by algorithm, board size and packed initial state
+    # each state along an optimal solution path is stored too, with the rest of the path as its own optimal solution,
+    # all entries of one solve share a single tuple of the path
+    # a state and its transpose share one entry under their canonical state (see Board.canonical), the path of the
+    # other one is found by transposing every state of the cached path
+    # entries are (status, path tuple or None, offset of the entry's state in the path, whether that state is the
+    # transpose of the canonical state, whether the later states of the path were stored too)
+    def __init__(self, max_entries: int = 100000, path: str = None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # file the cache is loaded from if it exists and saved to by save()
+        self.path = path
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, algorithm: str, size: int, key: int) -> Optional[Tuple[str, Optional[List[int]]]]:
+        # returns (status, packed path to the goal or None if unsolved) for a cached state, None on a miss
+        board = Board.of(size)
+        canonical_key, transposed = board.canonical(key)
+        entry = self.entries.get((algorithm, size, canonical_key))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end((algorithm, size, canonical_key))
+        status, path, offset, path_transposed, _ = entry
+        if path is None:
+            return status, None
+        if transposed != path_transposed:
+            return status, [board.transpose(path_key) for path_key in path[offset:]]
+        return status, list(path[offset:])
+
+    def store(self, algorithm: str, size: int, key: int, status: str, path: Optional[List[int]] = None,
+              suffixes: bool = True):
+        # caches the outcome of solving key, and for a solution every later state on its path unless suffixes is
+        # False, which is for solutions that aren't optimal
+        if self.max_entries <= 0:
+            return
+        canonical = Board.of(size).canonical
+        if path is None:
+            self.put((algorithm, size, canonical(key)[0]), (status, None, 0, False, False))
+            return
+        path = tuple(path)
+        # store the later states first so the initial state ends up most recently used
+        for offset in range(len(path) - 1 if suffixes else 0, -1, -1):
+            canonical_key, transposed = canonical(path[offset])
+            self.put((algorithm, size, canonical_key), (status, path, offset, transposed, suffixes))
+
+    def put(self, cache_key, entry):
+        self.entries[cache_key] = entry
+        self.entries.move_to_end(cache_key)
+        # evict least recently used entries
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self, path: str = None):
+        # writes the cache as JSON, each solution once, from least to most recently used
+        path = path or self.path
+        solutions = []
+        saved_paths = set()
+        for (algorithm, size, key), (status, solution, _, _, suffixes) in self.entries.items():
+            if solution is None:
+                solutions.append([algorithm, size, status, [key], False])
+            elif id(solution) not in saved_paths:
+                saved_paths.add(id(solution))
+                solutions.append([algorithm, size, status, list(solution), suffixes])
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"version": 2, "solutions": solutions}, file)
+        os.replace(temp_path, path)
+
+    def load(self, path: str):
+        # adds the solutions saved in path, a file written by a different version is ignored
+        with open(path) as file:
+            saved = json.load(file)
+        if saved.get("version") != 2:
+            return
+        for algorithm, size, status, solution, suffixes in saved["solutions"]:
+            if status == "solved":
+                self.store(algorithm, size, solution[0], status, solution, suffixes)
+            else:
+                self.store(algorithm, size, solution[0], status)
@@ -0,0 +1,178 @@
+from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import sys
+
+from heuristics import SOLVERS, Heuristics
+from puzzle_io import parse_puzzle
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8170
+# seconds a request waits for its result unless it asks for something else
+DEFAULT_TIMEOUT = 30.0
+
+
+def puzzle_line(puzzle: Union[str, List[List[int]]]) -> str:
+    # a puzzle as the line parse_puzzle reads, requests can give either
+    return puzzle if isinstance(puzzle, str) else ", ".join(str(tile) for row in puzzle for tile in row)
+
+
+def solve_puzzle(algorithm: str, puzzle: List[List[int]], max_nodes: Optional[int]) -> dict:
+    # runs in a worker process, a search that expands max_nodes nodes stops with status "budget_exceeded"
+    return Heuristics(puzzle, max_nodes=max_nodes).solve(algorithm).to_dict()
+
+
+class SolverService:
+    # asyncio front end that solves puzzles in a pool of worker processes, so a slow search never blocks the event
+    # loop or the requests behind it
+    # a request for a puzzle that is already being solved with the same algorithm and node budget waits for that
+    # search instead of starting another one
+    # a request whose search raises gets status "error" with the exception message
+    # a request that times out gets status "timeout", its search keeps running in the pool for any other requests
+    # waiting on it, since a running search can't be interrupted, node budgets are what bound the work
+    def __init__(self, executor: Executor = None, timeout: float = DEFAULT_TIMEOUT, max_nodes: int = None):
+        self.executor = executor or ProcessPoolExecutor()
+        self.timeout = timeout
+        # node budget for requests that don't give one, and the largest one a request can ask for
+        self.max_nodes = max_nodes
+        # searches running right now by (algorithm, tiles, node budget)
+        self.in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.stats = {"requests": 0, "searches": 0, "coalesced": 0, "timeouts": 0, "invalid": 0, "errors": 0}
+
+    def node_budget(self, requested: Optional[int]) -> Optional[int]:
+        # the budget a request gets, anything but a positive whole number of nodes is rejected, so a request can't
+        # get past the service's own budget
+        if requested is None:
+            return self.max_nodes
+        if isinstance(requested, bool) or not isinstance(requested, int) or requested < 1:
+            raise ValueError(f"max_nodes must be a positive whole number, got {requested!r}")
+        if self.max_nodes is None:
+            return requested
+        return min(requested, self.max_nodes)
+
+    async def solve(self, request: dict) -> dict:
+        # answers one request: {"puzzle": puzzle line or nested list, "algorithm": name in SOLVERS (default
+        # "manhattan"), "timeout": seconds, "max_nodes": node budget}, "id" is passed back as is
+        self.stats["requests"] += 1
+        response = {"id": request.get("id")}
+        try:
+            puzzle = parse_puzzle(puzzle_line(request["puzzle"]))
+            algorithm = request.get("algorithm", "manhattan")
+            if algorithm not in SOLVERS:
+                raise ValueError(f"unknown algorithm {algorithm!r}, choose from {', '.join(SOLVERS)}")
+            max_nodes = self.node_budget(request.get("max_nodes"))
+            timeout = float(request.get("timeout", self.timeout))
+        except (KeyError, TypeError, ValueError) as error:
+            self.stats["invalid"] += 1
+            return {**response, "status": "invalid", "error": str(error)}
+
+        search_key = (algorithm, tuple(tile for row in puzzle for tile in row), max_nodes)
+        search = self.in_flight.get(search_key)
+        if search is None:
+            self.stats["searches"] += 1
+            search = asyncio.get_running_loop().run_in_executor(self.executor, solve_puzzle, algorithm, puzzle,
+                                                                max_nodes)
+            self.in_flight[search_key] = search
+            search.add_done_callback(lambda _: self.in_flight.pop(search_key, None))
+        else:
+            self.stats["coalesced"] += 1
+
+        try:
+            # shielded so one request timing out doesn't cancel the search for the others
+            result = await asyncio.wait_for(asyncio.shield(search), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return {**response, "status": "timeout"}
+        except Exception as error:
+            # a search that fails, such as a table heuristic on a board it doesn't support, fails only this request
+            self.stats["errors"] += 1
+            return {**response, "status": "error", "error": str(error)}
+        return {**response, "puzzle": puzzle, "algorithm": algorithm, **result}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # one JSON request per line, each answered with one line of JSON as soon as it's done, so responses can come
+        # back in a different order than the requests, matched up by "id"
+        # {"stats": true} instead of a request returns the service counters
+        write_lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(line: bytes):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as error:
+                self.stats["invalid"] += 1
+                response = {"id": None, "status": "invalid", "error": str(error)}
+            else:
+                response = {"stats": dict(self.stats)} if request.get("stats") else await self.solve(request)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(respond(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            # answer everything already asked for before closing
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        # starts listening, port 0 picks a free port, see server.sockets[0].getsockname()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        server = await self.start(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Solving puzzles on {address[0]}:{address[1]}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: dict) -> dict:
+    # sends one request on a connection and waits for the next response, for clients that only have one request
+    # at a time in flight on a connection
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("the service closed the connection")
+    return json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve puzzle solving over TCP, one JSON request and response per "
+                                                 "line.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default number of cores)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds a request waits by default (default {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--max-nodes", type=int, default=None,
+                        help="most nodes a search may expand, also caps budgets asked for by requests")
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        service = SolverService(executor, args.timeout, args.max_nodes)
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
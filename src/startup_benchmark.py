@@ -0,0 +1,98 @@
+from typing import Dict, List, Sequence
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark import write_report
+from heuristics import SOLVERS
+
+# bumped whenever the output format changes, so old and new results aren't compared by mistake
+STARTUP_BENCHMARK_VERSION = 1
+DEFAULT_REPEAT = 3
+DEFAULT_ALGORITHMS = ("manhattan", "walking_distance", "pattern_database", "distance_table")
+# a few moves from the goal, so the first solve is mostly loading or building the heuristic's table
+DEFAULT_PUZZLE = [[0, 1, 2], [4, 5, 3], [7, 8, 6]]
+
+# run in a fresh interpreter for each measurement, importing the command line solver and solving one puzzle the way
+# a run of cs170_project1.py would, then printing how long each took as JSON
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import cs170_project1
+from heuristics import Heuristics
+imported = time.perf_counter()
+Heuristics(json.loads(sys.argv[2])).solve(sys.argv[1])
+print(json.dumps({"import": imported - start, "first_solve": time.perf_counter() - imported}))
+"""
+
+
+def run_probe(algorithm: str, puzzle: List[List[int]], directory: str) -> Dict[str, float]:
+    # seconds the whole process, the import and the first solve took, with tables cached in directory and
+    # bytecode compiled to it too, so an empty directory gives a cold start and a reused one a warm start
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+                                                      env.get("PYTHONPATH")]))
+    env["CS170_CACHE_DIR"] = os.path.join(directory, "tables")
+    env["PYTHONPYCACHEPREFIX"] = os.path.join(directory, "bytecode")
+    # a warm start reuses the bytecode of the cold one, which isn't written at all with this set
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", PROBE, algorithm, json.dumps(puzzle)], env=env,
+                               capture_output=True, text=True, check=True)
+    timings = json.loads(completed.stdout)
+    timings["process"] = time.perf_counter() - start
+    return timings
+
+
+def median_timings(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {phase: statistics.median(run[phase] for run in runs) for phase in runs[0]}
+
+
+def measure_startup(algorithms: Sequence[str] = DEFAULT_ALGORITHMS, puzzle: List[List[int]] = None,
+                    repeat: int = DEFAULT_REPEAT) -> dict:
+    # median cold and warm start of every algorithm, a cold start runs with an empty cache directory and a warm one
+    # right after it with the same directory, so it finds every table and module it needs already built
+    puzzle = puzzle or DEFAULT_PUZZLE
+    results = {}
+    for algorithm in algorithms:
+        cold_runs = []
+        warm_runs = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as directory:
+                cold_runs.append(run_probe(algorithm, puzzle, directory))
+                warm_runs.append(run_probe(algorithm, puzzle, directory))
+        cold = median_timings(cold_runs)
+        warm = median_timings(warm_runs)
+        results[algorithm] = {"cold": cold, "warm": warm, "warm_speedup": cold["process"] / warm["process"]}
+    return {
+        "version": STARTUP_BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "puzzle": puzzle,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how long a fresh solver process takes to import and solve "
+                                                 "its first puzzle, with cold and warm table caches, writing the "
+                                                 "timings as JSON.")
+    parser.add_argument("--algorithms", nargs="+", choices=SOLVERS, default=list(DEFAULT_ALGORITHMS),
+                        help=f"algorithms to measure (default {' '.join(DEFAULT_ALGORITHMS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"cold and warm starts of each algorithm to take the median of (default {DEFAULT_REPEAT})")
+    parser.add_argument("--output", default="-", help="file to write the JSON to (default standard output)")
+    args = parser.parse_args(argv)
+
+    write_report(measure_startup(args.algorithms, repeat=args.repeat), args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
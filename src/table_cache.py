@@ -0,0 +1,53 @@
+from typing import Callable, Optional, Union
+import mmap
+import os
+
+# every cached table file starts with a single header line naming what it holds, followed by the raw bytes
+HEADER_PREFIX = b"CS170TABLE "
+# version of the layout of cached tables, part of every header line so files written by another version are rebuilt
+# instead of misread, bump it whenever the bytes a table is saved as change
+TABLE_FORMAT = 2
+
+
+def cache_dir() -> str:
+    # directory precomputed tables are cached in, can be overridden with the CS170_CACHE_DIR environment variable
+    return os.environ.get("CS170_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "cs170-project-1")
+
+
+def header_line(header: str) -> bytes:
+    return HEADER_PREFIX + f"format={TABLE_FORMAT} {header}".encode() + b"\n"
+
+
+def save_table(path: str, header: str, data: bytes):
+    # write to a temporary file first so a concurrent reader never sees a half written table
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(header_line(header))
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def load_table(path: str, header: str) -> Optional[memoryview]:
+    # memory-map a table written by save_table, returns None if the file is missing or was written for a different
+    # header or table format, in which case the caller should rebuild it
+    expected = header_line(header)
+    try:
+        with open(path, "rb") as file:
+            if file.read(len(expected)) != expected:
+                return None
+            # the mapping stays valid after the file is closed
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    return memoryview(mapped)[len(expected):]
+
+
+def load_or_build_table(path: str, header: str, build: Callable[[], bytes]) -> Union[memoryview, bytes]:
+    # memory-maps the table cached in path, or builds it with build() and caches it there the first time it's needed,
+    # so a table is only ever built once per cache directory and later processes just map it
+    table = load_table(path, header)
+    if table is None:
+        table = build()
+        save_table(path, header, table)
+    return table
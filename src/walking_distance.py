@@ -0,0 +1,105 @@
+from typing import Dict, List, Tuple
+import os
+
+from board import Board
+from table_cache import cache_dir, load_or_build_table
+
+
+class WalkingDistance:
+    # walking distance heuristic (Takahashi)
+    # vertically, a state is reduced to how many tiles of each goal row are in each row, plus the row of the blank,
+    # and the table gives the exact number of vertical moves needed to bring every tile into its goal row when tiles
+    # are only told apart by their goal row, which is solved by breadth first search over these configurations
+    # horizontal moves never change the vertical configuration and the other way around, so the vertical and
+    # horizontal distances add up and stay admissible, and since the blank's goal cell is on the main diagonal the
+    # columns of a state give a configuration of the same table
+    # it counts tiles that share a line and have to get past each other, which manhattan distance misses
+    # instances are cached per board and the table in the cache directory, see WalkingDistance.get
+    instances: Dict[int, "WalkingDistance"] = {}
+    # instances are called with packed states, see heuristics.packed_heuristic
+    packed_keys = True
+
+    def __init__(self, board: Board, table: Dict[Tuple[int, ...], int] = None):
+        if board.size > 4:
+            # the number of configurations explodes past the 15-puzzle
+            raise ValueError("walking distance tables are only supported up to the 15-puzzle")
+        self.board = board
+        # distance of every configuration, a tuple of counts[row * size + goal row] followed by the blank row
+        self.table = table if table is not None else self.build()
+
+    @classmethod
+    def get(cls, board: Board) -> "WalkingDistance":
+        # returns the walking distance heuristic for board, loading its table from the cache directory or building and
+        # saving it the first time it's needed
+        if board.size not in cls.instances:
+            cls.instances[board.size] = cls.load_or_build(board)
+        return cls.instances[board.size]
+
+    @classmethod
+    def load_or_build(cls, board: Board, directory: str = None) -> "WalkingDistance":
+        path = os.path.join(directory or cache_dir(), f"walking_distance_{board.size}x{board.size}.bin")
+        header = f"walking_distance size={board.size}"
+        data = load_or_build_table(path, header, lambda: cls.encode(cls(board).table))
+        return cls(board, cls.decode(board, data))
+
+    @staticmethod
+    def encode(table: Dict[Tuple[int, ...], int]) -> bytes:
+        # a record per configuration: its counts and blank row, then its distance, one byte each
+        return b"".join(bytes(configuration + (distance,)) for configuration, distance in table.items())
+
+    @staticmethod
+    def decode(board: Board, data: bytes) -> Dict[Tuple[int, ...], int]:
+        # table from the records written by encode, which is several times faster than searching for it again
+        record = board.cells + 2
+        return {tuple(data[start:start + record - 1]): data[start + record - 1]
+                for start in range(0, len(data), record)}
+
+    def build(self) -> Dict[Tuple[int, ...], int]:
+        # breadth first search from the goal configuration, a move of the blank to the next row takes a tile of
+        # any goal row from that row into the blank's row
+        size = self.board.size
+        goal = [0] * (size * size)
+        for row in range(size):
+            goal[row * size + row] = size
+        goal[-1] -= 1
+        goal_configuration = tuple(goal) + (size - 1,)
+        table = {goal_configuration: 0}
+        layer: List[Tuple[int, ...]] = [goal_configuration]
+        distance = 0
+
+        while layer:
+            distance += 1
+            next_layer = []
+            for configuration in layer:
+                blank_row = configuration[-1]
+                for row in (blank_row - 1, blank_row + 1):
+                    if not 0 <= row < size:
+                        continue
+                    for goal_row in range(size):
+                        if configuration[row * size + goal_row]:
+                            child = list(configuration)
+                            child[row * size + goal_row] -= 1
+                            child[blank_row * size + goal_row] += 1
+                            child[-1] = row
+                            child = tuple(child)
+                            if child not in table:
+                                table[child] = distance
+                                next_layer.append(child)
+            layer = next_layer
+
+        return table
+
+    def __call__(self, key: int) -> int:
+        size = self.board.size
+        vertical = [0] * (size * size + 1)
+        horizontal = [0] * (size * size + 1)
+        for cell, tile in enumerate(self.board.tiles(key)):
+            row, col = divmod(cell, size)
+            if tile:
+                goal_row, goal_col = divmod(tile - 1, size)
+                vertical[row * size + goal_row] += 1
+                horizontal[col * size + goal_col] += 1
+            else:
+                vertical[-1] = row
+                horizontal[-1] = col
+        return self.table[tuple(vertical)] + self.table[tuple(horizontal)]
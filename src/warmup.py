@@ -0,0 +1,73 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+import argparse
+import os
+import sys
+import time
+
+from board import Board
+from distance_table import DistanceTable
+from pattern_database import DEFAULT_GROUPS, PatternDatabase
+from table_cache import cache_dir
+from walking_distance import WalkingDistance
+
+DEFAULT_SIZES = (3,)
+
+# precomputed tables searches load or build on first use, by the name of the heuristic that uses them:
+# (returns the table of a board, whether a board size is supported)
+TABLES: Dict[str, Tuple[Callable[[Board], object], Callable[[int], bool]]] = {
+    "distance_table": (DistanceTable.get, lambda size: size == 3),
+    "pattern_database": (PatternDatabase.get, lambda size: size in DEFAULT_GROUPS),
+    "walking_distance": (WalkingDistance.get, lambda size: size <= 4),
+}
+
+
+def file_times(directory: str) -> Dict[str, int]:
+    # modification time of every file in the cache directory, to tell which ones a table was (re)written to
+    if not os.path.isdir(directory):
+        return {}
+    return {name: os.stat(os.path.join(directory, name)).st_mtime_ns for name in os.listdir(directory)}
+
+
+def warmup(sizes: Sequence[int] = DEFAULT_SIZES, tables: Sequence[str] = None) -> List[dict]:
+    # loads every precomputed table for boards of the given sizes, building and caching the ones that are missing or
+    # were written for another table format, so later processes only have to memory-map them
+    # returns what was done for each table: its name, board size, seconds taken and the cache files written
+    directory = cache_dir()
+    results = []
+    for size in sizes:
+        for name in tables or TABLES:
+            get, supported = TABLES[name]
+            if not supported(size):
+                continue
+            before = file_times(directory)
+            start = time.perf_counter()
+            get(Board.of(size))
+            seconds = time.perf_counter() - start
+            written = sorted(file for file, mtime in file_times(directory).items() if before.get(file) != mtime)
+            results.append({"table": name, "size": size, "seconds": seconds, "written": written})
+    return results
+
+
+def print_warmup(results: List[dict]):
+    for result in results:
+        action = "Built and cached" if result["written"] else "Loaded"
+        print(f"{action} {result['table']} for the {result['size']}x{result['size']} board in "
+              f"{result['seconds']:.3f} seconds")
+    print(f"Tables are cached in {cache_dir()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build every precomputed heuristic table into the cache directory "
+                                                 "(CS170_CACHE_DIR), so solving never has to build one.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help=f"board sizes to build tables for (default {' '.join(map(str, DEFAULT_SIZES))}), the "
+                             f"15-puzzle pattern database takes a few seconds")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, help="tables to build (default all)")
+    args = parser.parse_args(argv)
+
+    print_warmup(warmup(args.sizes, args.tables))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import random
+import unittest
+from board import Board
+from heuristics import BOARD, Heuristics
+from batch_heuristics import BatchHeuristics, np
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchHeuristics(unittest.TestCase):
+    def random_keys(self, board, count):
+        # random states, not all of them solvable
+        rng = random.Random(170)
+        keys = []
+        for _ in range(count):
+            tiles = list(range(board.cells))
+            rng.shuffle(tiles)
+            keys.append(board.pack([tiles[row * board.size:(row + 1) * board.size] for row in range(board.size)]))
+        return keys
+
+    def test_matches_scalar_heuristics(self):
+        """Test batched costs match the scalar heuristics for packed, nested list and flat array states"""
+        keys = self.random_keys(BOARD, 500)
+        heuristics = Heuristics(Heuristics.goal_state)
+        manhattan = [heuristics.calculate_manhattan_distance(key) for key in keys]
+        misplaced = [heuristics.calculate_misplaced_tile(key) for key in keys]
+
+        batch = BatchHeuristics.get(BOARD)
+        states = [BOARD.unpack(key) for key in keys]
+        flat = np.array([BOARD.tiles(key) for key in keys])
+        for batch_states in [keys, np.array(keys, dtype=np.uint64), states, flat]:
+            self.assertEqual(batch.manhattan_distance(batch_states).tolist(), manhattan)
+            self.assertEqual(batch.misplaced_tile(batch_states).tolist(), misplaced)
+        self.assertEqual(batch.manhattan_distance([]).tolist(), [])
+
+    def test_larger_boards(self):
+        """Test batched costs on boards whose packed states don't fit in 64 bits"""
+        for size in [4, 5]:
+            board = Board.of(size)
+            keys = self.random_keys(board, 50)
+            heuristics = Heuristics(board.goal_state())
+            batch = BatchHeuristics.get(board)
+            self.assertEqual(batch.manhattan_distance(keys).tolist(),
+                             [heuristics.calculate_manhattan_distance(key) for key in keys])
+            self.assertEqual(batch.misplaced_tile([board.unpack(key) for key in keys]).tolist(),
+                             [heuristics.calculate_misplaced_tile(key) for key in keys])
@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from batch_solver import main, solve_batch
+from puzzle_io import check_puzzle, parse_puzzle
+
+
+class TestBatchSolver(unittest.TestCase):
+    def setUp(self):
+        # puzzles with known solution depths
+        self.puzzles = [([[1, 2, 3], [4, 5, 6], [7, 8, 0]], 0),
+                        ([[1, 2, 3], [4, 5, 6], [0, 7, 8]], 2),
+                        ([[1, 3, 6], [5, 0, 2], [4, 7, 8]], 8),
+                        ([[7, 1, 2], [4, 8, 5], [6, 3, 0]], 20),
+                        ([[1, 2, 3, 4], [5, 6, 0, 8], [9, 10, 7, 11], [13, 14, 15, 12]], 3)]
+
+    def test_parse_puzzle(self):
+        """Test puzzles are parsed from one line with the board size taken from the number of tiles"""
+        self.assertEqual(parse_puzzle("1, 2, 3, 4, 5, 6, 0, 7, 8"), [[1, 2, 3], [4, 5, 6], [0, 7, 8]])
+        self.assertEqual(parse_puzzle("1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15")[3], [13, 14, 0, 15])
+        for line in ["1, 2, 3", "1, 2, 3, 4, 5, 6, 7, 8, 8", "a, b"]:
+            with self.assertRaises(ValueError):
+                parse_puzzle(line)
+
+    def test_invalid_nested_puzzles(self):
+        """Test nested list puzzles are checked like lines, so a bad one only fails its own result"""
+        self.assertEqual(check_puzzle([[1, 2], [3, 0]]), [[1, 2], [3, 0]])
+        bad_puzzles = [[[1, 2, 3], [4, 5, 6]], [[1, 2, 3], [4, 0, 6], [7, 8, 5, 9]], [[0]], [[1, 2], [3, 3]],
+                       [[1, "2"], [3, 0]], [1, 2, 3, 0]]
+        for puzzle in bad_puzzles:
+            with self.assertRaises(ValueError):
+                check_puzzle(puzzle)
+        results = list(solve_batch(bad_puzzles + [self.puzzles[2][0]], "manhattan", workers=1))
+        self.assertEqual([result["status"] for result in results], ["invalid"] * len(bad_puzzles) + ["solved"])
+        self.assertEqual(results[-1]["depth"], 8)
+
+    def test_in_process_batch(self):
+        """Test a batch solved in this process comes back in input order"""
+        results = list(solve_batch([puzzle for puzzle, _ in self.puzzles], "manhattan", workers=1, chunk_size=2))
+        self.assertEqual([result["index"] for result in results], list(range(len(self.puzzles))))
+        self.assertEqual([result["depth"] for result in results], [depth for _, depth in self.puzzles])
+
+    def test_process_pool_batch(self):
+        """Test a batch spread over worker processes gives the same results ordered or unordered"""
+        lines = [", ".join(str(tile) for row in puzzle for tile in row) for puzzle, _ in self.puzzles]
+        lines.append("not a puzzle")
+        ordered = list(solve_batch(lines, "ida_manhattan", workers=2, chunk_size=1))
+        self.assertEqual([result["index"] for result in ordered], list(range(len(lines))))
+        self.assertEqual([result["depth"] for result in ordered[:-1]], [depth for _, depth in self.puzzles])
+        self.assertEqual(ordered[-1]["status"], "invalid")
+
+        unordered = list(solve_batch(lines, "ida_manhattan", workers=2, ordered=False, chunk_size=1))
+        self.assertEqual(sorted(unordered, key=lambda result: result["index"])[0]["puzzle"], self.puzzles[0][0])
+        self.assertEqual(len(unordered), len(lines))
+
+    def test_unknown_algorithm(self):
+        """Test an unknown algorithm name is rejected before any work starts"""
+        with self.assertRaises(ValueError):
+            next(solve_batch([], "bogo"))
+
+    def test_command_line(self):
+        """Test the command line writes one JSON result per puzzle line"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "puzzles.txt")
+            with open(path, "w") as file:
+                file.write("# comment\n1, 2, 3, 4, 5, 6, 0, 7, 8\n\n8, 1, 2, 0, 4, 3, 7, 6, 5\n")
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(main([path, "--workers", "1"]), 0)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result["status"] for result in results], ["solved", "unsolvable"])
+        self.assertEqual(results[0]["moves"], [7, 8])
@@ -0,0 +1,42 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from benchmark import depth_layers, main, stratified_puzzles
+from heuristics import BOARD, Heuristics
+from puzzle_io import parse_puzzle
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_depth_layers(self):
+        """Test states are grouped by their optimal depth"""
+        layers = depth_layers(BOARD, 4)
+        self.assertEqual([len(layer) for layer in layers], [1, 2, 4, 8, 16])
+        for depth, layer in enumerate(layers):
+            for key in layer:
+                self.assertEqual(Heuristics(BOARD.unpack(key)).a_star_manhattan_distance(verbose=False).depth, depth)
+
+    def test_stratified_puzzles_are_seeded(self):
+        """Test the same seed always gives the same puzzles, with up to the asked number at every depth"""
+        puzzles = stratified_puzzles(3, 170, 10)
+        self.assertEqual(puzzles, stratified_puzzles(3, 170, 10))
+        self.assertNotEqual(puzzles, stratified_puzzles(3, 171, 10))
+        self.assertEqual([depth for depth, _ in puzzles],
+                         [0, 1, 1] + [depth for depth in range(2, 11) for _ in range(3)])
+
+    def test_json_report(self):
+        """Test the report has the stats of every algorithm overall and by depth"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--algorithms", "manhattan", "ida_linear_conflict", "--per-depth", "2", "--max-depth", "12"])
+        report = json.loads(output.getvalue())
+        self.assertEqual(len(report["puzzles"]), 1 + 12 * 2)
+        self.assertEqual(parse_puzzle(report["puzzles"][0]["puzzle"]), Heuristics.goal_state)
+        self.assertEqual(set(report["results"]), {"manhattan", "ida_linear_conflict"})
+        for stats in report["results"].values():
+            self.assertEqual(stats["total"]["optimal"], 25)
+            self.assertEqual(stats["by_depth"]["12"]["puzzles"], 2)
+            self.assertGreater(stats["total"]["nodes_generated"], stats["total"]["nodes_expanded"])
+            self.assertGreater(stats["peak_rss_kb"], 0)
+            for key in ["nodes_expanded", "max_queue_size", "wall_time"]:
+                self.assertIn(key, stats["total"])
@@ -1,5 +1,40 @@
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
-from heuristics import Heuristics, Node
+from contextlib import redirect_stdout
+from unittest import mock
+from board import Board
+import cs170_project1
+from cs170_project1 import main
+from distance_table import DistanceTable
+from heuristics import BOARD, Heuristics, Node, SearchResult, packed_heuristic
+from pattern_database import PatternDatabase
+from puzzle_io import read_puzzle_lines
+from walking_distance import WalkingDistance
+
+# directory the tables built by these tests are cached in, instead of the user's cache directory
+cache = None
+
+
+def setUpModule():
+    global cache
+    cache = tempfile.TemporaryDirectory()
+    os.environ["CS170_CACHE_DIR"] = cache.name
+    for table in (DistanceTable, PatternDatabase, WalkingDistance):
+        table.instances.clear()
+
+
+def tearDownModule():
+    for table in (DistanceTable, PatternDatabase, WalkingDistance):
+        table.instances.clear()
+    del os.environ["CS170_CACHE_DIR"]
+    cache.cleanup()
 
 
 class TestEightPuzzle(unittest.TestCase):
@@ -335,4 +370,345 @@ class TestEightPuzzle(unittest.TestCase):
 
         # Test A* search with manhattan distance heuristic
         manhattan_distance_result = self.heuristics_no_solution.a_star_manhattan_distance()
-        self.assertIsNone(manhattan_distance_result)    # Should not solve
\ No newline at end of file
+        self.assertIsNone(manhattan_distance_result)    # Should not solve
+
+    def test_packed_state_round_trip(self):
+        """Test packing a state into an int and unpacking it again"""
+        node = Node(self.depth_24_puzzle, None, 0)
+        self.assertIsInstance(node.key, int)
+        self.assertEqual(node.state, self.depth_24_puzzle)
+        self.assertEqual(node.blank_coords, [0, 0])
+        self.assertEqual(Node(Heuristics.goal_state, None, 0).key, BOARD.goal_key)
+
+    def test_heuristics_on_packed_state(self):
+        """Test heuristics give the same cost for nested list and packed states"""
+        for puzzle in [self.depth_8_puzzle, self.depth_12_puzzle, self.depth_24_puzzle]:
+            key = BOARD.pack(puzzle)
+            self.assertEqual(self.heuristics_depth_0.calculate_misplaced_tile(key),
+                             self.heuristics_depth_0.calculate_misplaced_tile(puzzle))
+            self.assertEqual(self.heuristics_depth_0.calculate_manhattan_distance(key),
+                             self.heuristics_depth_0.calculate_manhattan_distance(puzzle))
+
+    def test_nested_list_heuristics(self):
+        """Test custom heuristics get nested list states unless marked as taking packed states"""
+        states = []
+
+        def manhattan_distance(state):
+            states.append(state)
+            return sum(abs(row - (tile - 1) // 3) + abs(col - (tile - 1) % 3)
+                       for row, tiles in enumerate(state) for col, tile in enumerate(tiles) if tile)
+
+        expected = self.heuristics_depth_20.a_star_manhattan_distance(verbose=False)
+        for search in ["a_star_search", "ida_star_search", "compact_a_star_search", "ara_star_search"]:
+            result = getattr(self.heuristics_depth_20, search)(manhattan_distance, None, False)
+            self.assertEqual(result.depth, 20, search)
+        result = self.heuristics_depth_20.a_star_search(manhattan_distance, None, False)
+        self.assertEqual(result.nodes_expanded, expected.nodes_expanded)
+        self.assertEqual(self.heuristics_depth_20.bidirectional_search(manhattan_distance, lambda state: 0,
+                                                                       False).depth, 20)
+        self.assertEqual(states[0], self.depth_20_puzzle)
+        self.assertTrue(all(isinstance(state, list) for state in states))
+
+        keys = []
+        packed_manhattan_distance = packed_heuristic(
+            lambda key: keys.append(key) or self.heuristics_depth_0.calculate_manhattan_distance(key))
+        self.assertEqual(self.heuristics_depth_20.a_star_search(packed_manhattan_distance, None, False).depth, 20)
+        self.assertTrue(all(isinstance(key, int) for key in keys))
+
+    def test_successors_only_legal_moves(self):
+        """Test successor generation yields only legal moves of the blank"""
+        # blank in a corner has 2 moves, on an edge 3 moves, in the center 4 moves
+        self.assertEqual(len(Node(self.depth_0_puzzle, None, 0).expand_all()), 2)
+        self.assertEqual(len(Node(self.depth_2_puzzle, None, 0).expand_all()), 2)
+        self.assertEqual(len(Node([[1, 2, 3], [4, 5, 0], [7, 8, 6]], None, 0).expand_all()), 3)
+        children = list(BOARD.successors(BOARD.goal_key, BOARD.goal_blank))
+        self.assertEqual([(blank, tile) for _, blank, tile in children], [(7, 8), (5, 6)])
+        self.assertEqual(BOARD.unpack(children[0][0]), [[1, 2, 3], [4, 5, 6], [7, 0, 8]])
+
+    def test_incremental_heuristics_match_full_scan(self):
+        """Test delta tables give the same h(n) as recalculating from scratch along a random walk"""
+        rng = random.Random(170)
+        heuristics = self.heuristics_depth_0
+        key, blank = BOARD.pack(self.depth_24_puzzle), 0
+        manhattan = heuristics.calculate_manhattan_distance(key)
+        misplaced = heuristics.calculate_misplaced_tile(key)
+        for _ in range(200):
+            child_key, child_blank, tile = rng.choice(list(BOARD.successors(key, blank)))
+            manhattan += BOARD.manhattan_delta[tile][child_blank][blank]
+            misplaced += BOARD.misplaced_delta[tile][child_blank][blank]
+            key, blank = child_key, child_blank
+            self.assertEqual(manhattan, heuristics.calculate_manhattan_distance(key))
+            self.assertEqual(misplaced, heuristics.calculate_misplaced_tile(key))
+
+    def test_silent_search_result(self):
+        """Test non-verbose searches return a SearchResult with the solution path and stats"""
+        traced = []
+        result = self.heuristics_depth_8.a_star_manhattan_distance(verbose=False, trace=traced.append)
+        self.assertIsInstance(result, SearchResult)
+        self.assertTrue(result.solved)
+        self.assertEqual(result.depth, 8)
+        self.assertEqual(len(result.path), 9)
+        self.assertEqual(result.path[0], self.depth_8_puzzle)
+        self.assertEqual(result.path[-1], Heuristics.goal_state)
+        self.assertEqual(result.nodes_expanded, len(traced))
+        self.assertGreater(result.max_queue_size, 0)
+        self.assertGreaterEqual(result.wall_time, 0)
+
+        result = self.heuristics_depth_4.uniform_cost_search(verbose=False)
+        self.assertEqual(result.depth, 4)
+        result = self.heuristics_depth_4.a_star_misplaced_tile(verbose=False)
+        self.assertEqual(result.depth, 4)
+
+    def test_solvability_check(self):
+        """Test inversion parity check rejects unsolvable puzzles before any expansion"""
+        self.assertTrue(BOARD.is_solvable(BOARD.pack(self.depth_24_puzzle)))
+        self.assertFalse(BOARD.is_solvable(BOARD.pack(self.no_solution_puzzle)))
+
+        result = self.heuristics_no_solution.a_star_manhattan_distance(verbose=False)
+        self.assertEqual(result.status, "unsolvable")
+        self.assertEqual(result.nodes_expanded, 0)
+        self.assertEqual(self.heuristics_depth_4.a_star_manhattan_distance(verbose=False).status, "solved")
+
+    def test_no_solution_exhaustive_search(self):
+        """Test the full search still proves there is no solution when the check is turned off"""
+        result = Heuristics(self.no_solution_puzzle, check_solvable=False).a_star_manhattan_distance(verbose=False)
+        self.assertEqual(result.status, "exhausted")
+        self.assertEqual(result.nodes_expanded, 181440)
+
+    def test_ida_star_search(self):
+        """Test IDA* finds the same optimal depths as A* while only holding one path in memory"""
+        for heuristics, depth in [(self.heuristics_depth_0, 0), (self.heuristics_depth_8, 8),
+                                  (self.heuristics_depth_20, 20), (self.heuristics_depth_24, 24)]:
+            result = heuristics.ida_star_manhattan_distance(verbose=False)
+            self.assertEqual(result.depth, depth)
+            self.assertEqual(result.path[-1], Heuristics.goal_state)
+            self.assertLessEqual(result.max_queue_size, depth + 1)
+
+        self.assertEqual(self.heuristics_depth_12.ida_star_misplaced_tile(verbose=False).depth, 12)
+        self.assertEqual(self.heuristics_depth_12.ida_star_manhattan_distance().depth, 12)
+        self.assertEqual(self.heuristics_no_solution.ida_star_manhattan_distance(verbose=False).status, "unsolvable")
+
+    def test_bidirectional_search(self):
+        """Test bidirectional searches find optimal paths with far fewer expansions than one direction"""
+        for heuristics, depth in [(self.heuristics_depth_0, 0), (self.heuristics_depth_2, 2),
+                                  (self.heuristics_depth_16, 16), (self.heuristics_depth_24, 24)]:
+            for result in [heuristics.bidirectional_uniform_cost_search(verbose=False),
+                           heuristics.bidirectional_manhattan_distance(verbose=False)]:
+                self.assertEqual(result.depth, depth)
+                self.assertEqual(result.path[0], heuristics.initial_state)
+                self.assertEqual(result.path[-1], Heuristics.goal_state)
+                for key, next_key in zip(result.path_keys, result.path_keys[1:]):
+                    self.assertIn(next_key, [child for child, _, _ in BOARD.successors(key, BOARD.find_blank(key))])
+
+        bidirectional_result = self.heuristics_depth_24.bidirectional_uniform_cost_search(verbose=False)
+        unidirectional_result = self.heuristics_depth_24.uniform_cost_search(verbose=False)
+        self.assertLess(bidirectional_result.nodes_expanded * 10, unidirectional_result.nodes_expanded)
+        self.assertEqual(self.heuristics_depth_8.bidirectional_uniform_cost_search().depth, 8)
+
+    def test_linear_conflict_and_walking_distance(self):
+        """Test the stronger heuristics keep solutions optimal while expanding fewer nodes than manhattan distance"""
+        # 2 and 1 are in their goal row but swapped, one of them has to leave the row
+        self.assertEqual(self.heuristics_depth_0.calculate_linear_conflict([[2, 1, 3], [4, 5, 6], [7, 8, 0]]), 4)
+        self.assertEqual(self.heuristics_depth_0.calculate_walking_distance([[2, 1, 3], [4, 5, 6], [7, 8, 0]]), 4)
+        self.assertEqual(self.heuristics_depth_0.calculate_linear_conflict(Heuristics.goal_state), 0)
+        self.assertEqual(self.heuristics_depth_0.calculate_walking_distance(Heuristics.goal_state), 0)
+
+        for heuristics, depth in [(self.heuristics_depth_8, 8), (self.heuristics_depth_20, 20),
+                                  (self.heuristics_depth_24, 24)]:
+            manhattan_result = heuristics.a_star_manhattan_distance(verbose=False)
+            for result in [heuristics.a_star_linear_conflict(verbose=False),
+                           heuristics.a_star_walking_distance(verbose=False),
+                           heuristics.ida_star_linear_conflict(verbose=False),
+                           heuristics.ida_star_walking_distance(verbose=False)]:
+                self.assertEqual(result.depth, depth)
+            self.assertLessEqual(heuristics.a_star_linear_conflict(verbose=False).nodes_expanded,
+                                 manhattan_result.nodes_expanded)
+        self.assertLess(self.heuristics_depth_24.a_star_linear_conflict(verbose=False).nodes_expanded,
+                        self.heuristics_depth_24.a_star_manhattan_distance(verbose=False).nodes_expanded)
+        self.assertLess(self.heuristics_depth_24.a_star_walking_distance(verbose=False).nodes_expanded,
+                        self.heuristics_depth_24.a_star_manhattan_distance(verbose=False).nodes_expanded)
+        self.assertEqual(self.heuristics_depth_12.a_star_linear_conflict().depth, 12)
+
+    def test_weighted_and_anytime_search(self):
+        """Test weighted A* and ARA* find solutions within the bound they report, ARA* improving them to optimal"""
+        for heuristics, depth in [(self.heuristics_depth_0, 0), (self.heuristics_depth_8, 8),
+                                  (self.heuristics_depth_20, 20), (self.heuristics_depth_24, 24)]:
+            optimal_result = heuristics.a_star_manhattan_distance(verbose=False)
+            self.assertEqual(optimal_result.bound, 1.0)
+            for weight in (2, 1.5):
+                result = heuristics.weighted_a_star_manhattan_distance(verbose=False, weight=weight)
+                self.assertEqual(result.bound, weight)
+                self.assertGreaterEqual(result.depth, depth)
+                self.assertLessEqual(result.depth, weight * depth)
+                self.assertEqual(len(result.path_keys), result.depth + 1)
+
+            result = heuristics.ara_star_manhattan_distance(verbose=False)
+            self.assertEqual(result.status, "solved")
+            self.assertEqual((result.depth, result.bound), (depth, 1.0))
+            self.assertEqual(len(result.path_keys), depth + 1)
+            # every solution is better than the last, and within its bound
+            solution_depths = [solution_depth for solution_depth, _, _, _ in result.solutions]
+            self.assertEqual(solution_depths, sorted(set(solution_depths), reverse=True))
+            for solution_depth, bound, _, _ in result.solutions:
+                self.assertLessEqual(solution_depth, bound * depth)
+
+        # weighted A* gives up optimality for far fewer expansions
+        weighted_result = self.heuristics_depth_24.weighted_a_star_manhattan_distance(verbose=False)
+        self.assertLess(weighted_result.nodes_expanded * 2,
+                        self.heuristics_depth_24.a_star_manhattan_distance(verbose=False).nodes_expanded)
+        self.assertIsNone(self.heuristics_no_solution.weighted_a_star_manhattan_distance(verbose=False).bound)
+        self.assertEqual(self.heuristics_no_solution.ara_star_manhattan_distance(verbose=False).status, "unsolvable")
+        self.assertRaises(ValueError, self.heuristics_depth_8.a_star_search, lambda _: 0, None, False,
+                          frontier="bucket", weight=1.5)
+        self.assertEqual(self.heuristics_depth_8.a_star_search(lambda _: 0, None, False, weight=1.5).depth, 8)
+        self.assertRaises(ValueError, self.heuristics_depth_8.anytime_search, lambda _: 0, weight=0.5)
+
+        # out of budget, ARA* keeps the best solution it found with the bound proven for it
+        heuristics = Heuristics(self.depth_24_puzzle, max_nodes=400)
+        result = heuristics.ara_star_manhattan_distance(verbose=False)
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertTrue(result.solved)
+        self.assertGreater(result.bound, 1)
+        self.assertLessEqual(result.depth, result.bound * 24)
+        self.assertEqual(result.to_dict()["solutions"][-1]["depth"], result.depth)
+        self.assertIsNone(heuristics.ara_star_manhattan_distance(time_limit=0))
+        self.assertEqual(self.heuristics_depth_8.ara_star_manhattan_distance().depth, 8)
+
+    def test_transpose_symmetry(self):
+        """Test a state and its transpose share a canonical state and are solved in the same number of moves"""
+        key = BOARD.pack(self.depth_20_puzzle)
+        transposed_key = BOARD.transpose(key)
+        self.assertEqual(BOARD.unpack(transposed_key), [[3, 2, 8], [1, 6, 7], [4, 5, 0]])
+        self.assertEqual(BOARD.transpose(transposed_key), key)
+        self.assertEqual(BOARD.transpose(BOARD.goal_key), BOARD.goal_key)
+        # with the blank on the diagonal the smaller key is canonical
+        self.assertEqual(BOARD.canonical(key), (key, False))
+        self.assertEqual(BOARD.canonical(transposed_key), (key, True))
+        # otherwise the state with the blank above the diagonal is
+        below_key = BOARD.pack([[1, 2, 3], [4, 5, 6], [7, 0, 8]])
+        self.assertEqual(BOARD.unpack(BOARD.canonical(below_key)[0]), [[1, 2, 3], [4, 5, 0], [7, 8, 6]])
+        self.assertTrue(BOARD.canonical(below_key)[1])
+        self.assertEqual(Node(self.depth_20_puzzle, None, 0).canonical_key, key)
+        self.assertEqual(Heuristics(BOARD.unpack(transposed_key)).a_star_manhattan_distance(verbose=False).depth, 20)
+
+        # sharing visited entries between a state and its transpose expands fewer nodes for the same depth
+        result = self.heuristics_depth_24.a_star_search(lambda _: 0, None, False, None, symmetric=True)
+        self.assertEqual(result.depth, 24)
+        self.assertLess(result.nodes_expanded,
+                        self.heuristics_depth_24.uniform_cost_search(verbose=False).nodes_expanded)
+
+
+class TestLargerBoards(unittest.TestCase):
+    def setUp(self):
+        self.depth_3_15_puzzle = [[1, 2, 3, 4],
+                                   [5, 6, 0, 8],
+                                   [9, 10, 7, 11],
+                                   [13, 14, 15, 12]]
+
+        self.depth_28_15_puzzle = [[1, 10, 2, 7],
+                                   [13, 5, 3, 8],
+                                   [9, 6, 11, 4],
+                                   [14, 0, 15, 12]]
+
+        # swapping two tiles of a solvable state makes it unsolvable
+        self.no_solution_15_puzzle = [[1, 2, 3, 4],
+                                      [5, 6, 7, 8],
+                                      [9, 10, 11, 12],
+                                      [13, 15, 14, 0]]
+
+    def test_board_geometry(self):
+        """Test boards derive their goal state and cell width from the size"""
+        board = Board.of(4)
+        self.assertIs(board, Board.of(4))
+        self.assertEqual(board.goal_state(), [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]])
+        self.assertEqual(board.bits, 4)
+        self.assertEqual(Board.of(5).bits, 5)
+        self.assertEqual(Board.of(5).unpack(Board.of(5).goal_key), Board.of(5).goal_state())
+        self.assertEqual(Heuristics(self.depth_3_15_puzzle).goal_state, board.goal_state())
+
+    def test_even_width_solvability(self):
+        """Test the solvability check accounts for the blank row on even width boards"""
+        board = Board.of(4)
+        self.assertTrue(board.is_solvable(board.pack(self.depth_28_15_puzzle)))
+        self.assertFalse(board.is_solvable(board.pack(self.no_solution_15_puzzle)))
+        for child_key, _, _ in board.successors(board.goal_key, board.goal_blank):
+            self.assertTrue(board.is_solvable(child_key))
+
+    def test_15_puzzle_search(self):
+        """Test A* and IDA* solve the 15-puzzle optimally"""
+        heuristics = Heuristics(self.depth_3_15_puzzle)
+        self.assertEqual(heuristics.a_star_manhattan_distance(verbose=False).depth, 3)
+        self.assertEqual(heuristics.a_star_misplaced_tile(verbose=False).depth, 3)
+
+        result = Heuristics(self.depth_28_15_puzzle).ida_star_manhattan_distance(verbose=False)
+        self.assertEqual(result.depth, 28)
+        self.assertEqual(Heuristics(self.depth_28_15_puzzle).ida_star_linear_conflict(verbose=False).depth, 28)
+        self.assertEqual(Heuristics(self.depth_28_15_puzzle).ida_star_walking_distance(verbose=False).depth, 28)
+        self.assertEqual(result.path[-1], Board.of(4).goal_state())
+        self.assertEqual(Heuristics(self.depth_28_15_puzzle).a_star_manhattan_distance(verbose=False).depth, 28)
+        self.assertEqual(Heuristics(self.no_solution_15_puzzle).a_star_manhattan_distance(verbose=False).status,
+                         "unsolvable")
+
+    def test_24_puzzle_nodes(self):
+        """Test nodes on the 24-puzzle board move and expand like on the 8-puzzle"""
+        board = Board.of(5)
+        node = Node(board.goal_state(), None, 0)
+        self.assertIs(node.board, board)
+        self.assertEqual(node.blank_coords, [4, 4])
+        node.move_tile(3, 4)
+        self.assertEqual(node.state[4][4], 20)
+        self.assertEqual(len(node.expand_all()), 3)
+        self.assertEqual(Heuristics(node.state).a_star_manhattan_distance(verbose=False).depth, 1)
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_streaming_file_mode(self):
+        """Test --input solves every puzzle line and writes one JSON result per line to --output"""
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "puzzles.txt")
+            output_path = os.path.join(directory, "results.jsonl")
+            with open(input_path, "w") as file:
+                file.write("1,2,3,4,5,6,0,7,8\n\n# 15-puzzle\n1 2 3 4 5 6 0 8 9 10 7 11 13 14 15 12\n1,2,3\n")
+            self.assertEqual(main(["--input", input_path, "--output", output_path, "--algorithm", "ida_manhattan"]),
+                             0)
+            with open(output_path) as file:
+                results = [json.loads(line) for line in file]
+
+        self.assertEqual([result["status"] for result in results], ["solved", "solved", "invalid"])
+        self.assertEqual([result.get("depth") for result in results], [2, 3, None])
+        self.assertTrue(all(result["algorithm"] == "ida_manhattan" for result in results))
+
+    def test_standard_input_one_line_at_a_time(self):
+        """Test each puzzle on standard input is answered before the next one is sent"""
+        process = subprocess.Popen([sys.executable, cs170_project1.__file__, "--input", "-"], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, text=True)
+        # a solver waiting for more input before answering would never answer
+        watchdog = threading.Timer(30, process.kill)
+        watchdog.start()
+        try:
+            results = []
+            for line in ["1,2,3,4,5,6,0,7,8", "7,1,2,4,8,5,6,3,0"]:
+                process.stdin.write(line + "\n")
+                process.stdin.flush()
+                results.append(json.loads(process.stdout.readline()))
+            process.stdin.close()
+            self.assertEqual(process.wait(), 0)
+        finally:
+            watchdog.cancel()
+            process.kill()
+        self.assertEqual([result["depth"] for result in results], [2, 20])
+
+    def test_puzzle_lines_are_read_lazily(self):
+        """Test puzzle lines are yielded one at a time without reading the whole input first"""
+        source = io.StringIO("1,2,3,4,5,6,7,8,0\n" * 3)
+        lines = read_puzzle_lines(source)
+        self.assertEqual(next(lines), "1,2,3,4,5,6,7,8,0")
+        self.assertLess(source.tell(), len(source.getvalue()))
+
+    def test_algorithm_flag_skips_menu(self):
+        """Test interactive mode runs the algorithm given with --algorithm without asking for it"""
+        answers = iter(["3", "1, 2, 3", "4, 5, 6", "0, 7, 8"])
+        output = io.StringIO()
+        with mock.patch("builtins.input", lambda _: next(answers)), redirect_stdout(output):
+            self.assertEqual(main(["--algorithm", "bidirectional_ucs"]), 0)
+        self.assertIn("Depth of solution: 2", output.getvalue())
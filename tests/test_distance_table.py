@@ -0,0 +1,109 @@
+import os
+import random
+import tempfile
+import unittest
+from heuristics import BOARD, Heuristics
+from distance_table import DistanceTable
+
+
+class TestDistanceTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # build the table once into a temporary cache directory
+        cls.cache = tempfile.TemporaryDirectory()
+        os.environ["CS170_CACHE_DIR"] = cls.cache.name
+        DistanceTable.instances.clear()
+        cls.distance_table = DistanceTable.get(BOARD)
+
+    @classmethod
+    def tearDownClass(cls):
+        DistanceTable.instances.clear()
+        del os.environ["CS170_CACHE_DIR"]
+        cls.cache.cleanup()
+
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.depth_24_puzzle = [[0, 7, 2],
+                                [4, 6, 1],
+                                [3, 5, 8]]
+
+        self.no_solution_puzzle = [[8, 1, 2],
+                                   [0, 4, 3],
+                                   [7, 6, 5]]
+
+    def test_whole_state_space_is_reached(self):
+        """Test every canonical state gets a distance, with 31 the hardest, in two thirds of a byte per state"""
+        self.assertEqual(len(self.distance_table.table), 120960)
+        distances = bytes(self.distance_table.table).replace(b"\xff", b"")
+        # at least one state of every pair of a state and its transpose out of the 181,440 reachable ones
+        self.assertGreaterEqual(len(distances), 181440 // 2)
+        self.assertEqual(max(distances), 31)
+
+    def test_transposed_states_share_entries(self):
+        """Test a state and its transpose are looked up in the same entry and solved with transposed paths"""
+        key = BOARD.pack(self.depth_24_puzzle)
+        transposed_key = BOARD.transpose(key)
+        self.assertEqual(self.distance_table.index(key), self.distance_table.index(transposed_key))
+        self.assertEqual(self.distance_table.distance(transposed_key), 24)
+        path = self.distance_table.solve(transposed_key)
+        self.assertEqual(len(path), 25)
+        self.assertEqual(path[-1], BOARD.goal_key)
+
+    def test_known_distances(self):
+        """Test distances of the known test puzzles"""
+        self.assertEqual(self.distance_table.distance(BOARD.goal_key), 0)
+        self.assertEqual(self.distance_table.distance(BOARD.pack(self.depth_20_puzzle)), 20)
+        self.assertEqual(self.distance_table.distance(BOARD.pack(self.depth_24_puzzle)), 24)
+        self.assertIsNone(self.distance_table.distance(BOARD.pack(self.no_solution_puzzle)))
+
+    def test_table_solve(self):
+        """Test walking the table gives an optimal path of legal moves"""
+        result = Heuristics(self.depth_24_puzzle).distance_table_solve(verbose=False)
+        self.assertEqual(result.depth, 24)
+        self.assertEqual(result.path[0], self.depth_24_puzzle)
+        self.assertEqual(result.path[-1], Heuristics.goal_state)
+        for key, next_key in zip(result.path_keys, result.path_keys[1:]):
+            self.assertIn(next_key, [child for child, _, _ in BOARD.successors(key, BOARD.find_blank(key))])
+
+        self.assertFalse(Heuristics(self.no_solution_puzzle).distance_table_solve(verbose=False).solved)
+
+    def test_perfect_heuristic_search(self):
+        """Test A* with the table as heuristic finds the optimal depth"""
+        result = Heuristics(self.depth_20_puzzle).a_star_distance_table(verbose=False)
+        self.assertEqual(result.depth, 20)
+        self.assertLess(result.nodes_expanded, Heuristics(self.depth_20_puzzle).a_star_pattern_database(
+            verbose=False).nodes_expanded)
+
+    def test_heuristics_are_admissible(self):
+        """Test no heuristic ever overestimates the exact distance, checked on states along a random walk"""
+        rng = random.Random(170)
+        heuristics = Heuristics(Heuristics.goal_state)
+        functions = [heuristics.calculate_misplaced_tile, heuristics.calculate_manhattan_distance,
+                     heuristics.calculate_linear_conflict, heuristics.calculate_walking_distance,
+                     heuristics.calculate_pattern_database]
+        key, blank = BOARD.goal_key, BOARD.goal_blank
+        for _ in range(3000):
+            key, blank, _ = rng.choice(list(BOARD.successors(key, blank)))
+            distance = self.distance_table.distance(key)
+            for function in functions:
+                self.assertLessEqual(function(key), distance)
+
+    def test_cached_table_is_reloaded(self):
+        """Test the table is memory-mapped from the cache directory on the next load"""
+        loaded = DistanceTable.load_or_build(BOARD)
+        self.assertIsInstance(loaded.table, memoryview)
+        self.assertEqual(bytes(loaded.table), bytes(self.distance_table.table))
+
+    def test_solvability_check_matches_table(self):
+        """Test the inversion parity check agrees with the table on every state one move from a solvable one"""
+        key, blank = BOARD.pack(self.depth_24_puzzle), 0
+        unsolvable_key = BOARD.pack(self.no_solution_puzzle)
+        for child_key, _, _ in BOARD.successors(key, blank):
+            self.assertTrue(BOARD.is_solvable(child_key))
+            self.assertIsNotNone(self.distance_table.distance(child_key))
+        for child_key, _, _ in BOARD.successors(unsolvable_key, BOARD.find_blank(unsolvable_key)):
+            self.assertFalse(BOARD.is_solvable(child_key))
+            self.assertIsNone(self.distance_table.distance(child_key))
@@ -0,0 +1,103 @@
+import unittest
+from heuristics import Heuristics, Node
+from frontier import BucketFrontier, HeapFrontier
+
+
+class TestFrontier(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.depth_24_puzzle = [[0, 7, 2],
+                                [4, 6, 1],
+                                [3, 5, 8]]
+
+    def node(self, depth, heuristic_cost):
+        node = Node(Heuristics.goal_state, None, depth)
+        node.heuristic_cost = heuristic_cost
+        return node
+
+    def test_pop_order(self):
+        """Test frontiers pop the lowest f(n) first, breaking ties as asked"""
+        costs = [(3, 4), (0, 2), (5, 2), (2, 5), (1, 1)]
+        frontiers = [frontier_type(tie_break) for frontier_type in (HeapFrontier, BucketFrontier)
+                     for tie_break in (None, "high_g", "low_g")]
+        for frontier in frontiers:
+            for depth, heuristic_cost in costs:
+                frontier.push(self.node(depth, heuristic_cost))
+            self.assertEqual(len(frontier), 5)
+            popped = [frontier.pop() for _ in costs]
+            self.assertEqual([node.depth + node.heuristic_cost for node in popped], [2, 2, 7, 7, 7])
+            self.assertEqual(len(frontier), 0)
+            self.assertRaises(IndexError, frontier.pop)
+
+        for frontier_type in (HeapFrontier, BucketFrontier):
+            for tie_break, depths in [(None, [1, 0, 2, 5, 3]), ("high_g", [1, 0, 5, 3, 2]), ("low_g", [0, 1, 2, 3, 5])]:
+                frontier = frontier_type(tie_break)
+                for depth, heuristic_cost in costs:
+                    frontier.push(self.node(depth, heuristic_cost))
+                self.assertEqual([frontier.pop().depth for _ in costs], depths)
+
+        frontier = BucketFrontier()
+        # a lower f(n) pushed after popping is still popped next
+        frontier.push(self.node(0, 9))
+        frontier.push(self.node(0, 3))
+        self.assertEqual(frontier.pop().heuristic_cost, 3)
+        self.assertEqual(frontier.pop().heuristic_cost, 9)
+
+    def test_weighted_order(self):
+        """Test weighted frontiers order by g(n) + weight * h(n), the bucket frontier only taking whole weights"""
+        costs = [(0, 4), (5, 2), (3, 3), (1, 6)]
+        # f(n) of 4, 7, 6 and 7 unweighted
+        for frontier, depths in [(HeapFrontier("high_g", 2), [0, 5, 3, 1]), (BucketFrontier("high_g", 2), [0, 5, 3, 1]),
+                                 (HeapFrontier(None, 1.5), [0, 3, 5, 1])]:
+            for depth, heuristic_cost in costs:
+                frontier.push(self.node(depth, heuristic_cost))
+            self.assertEqual([frontier.pop().depth for _ in costs], depths)
+        self.assertRaises(ValueError, BucketFrontier, None, 1.5)
+        self.assertRaises(ValueError, HeapFrontier, None, 0.5)
+
+    def test_frontiers_find_same_depth(self):
+        """Test every frontier gives optimal searches"""
+        for puzzle, depth in [(self.depth_20_puzzle, 20), (self.depth_24_puzzle, 24)]:
+            heuristics = Heuristics(puzzle)
+            for frontier, tie_break in [("heap", None), ("heap", "high_g"), ("bucket", None), ("bucket", "high_g"),
+                                        ("bucket", "low_g")]:
+                result = heuristics.a_star_search(heuristics.calculate_manhattan_distance,
+                                                  heuristics.board.manhattan_delta, False, frontier=frontier,
+                                                  tie_break=tie_break)
+                self.assertEqual(result.depth, depth)
+
+        heuristics = Heuristics(self.depth_20_puzzle)
+        self.assertRaises(ValueError, heuristics.a_star_search, lambda _: 0, None, False, frontier="stack")
+        self.assertRaises(ValueError, heuristics.a_star_search, lambda _: 0, None, False, frontier="bucket",
+                          tie_break="f")
+
+    def test_fractional_heuristic(self):
+        """Test a heuristic with fractional costs works with the default frontier and is rejected by buckets"""
+        heuristics = Heuristics(self.depth_20_puzzle)
+
+        def half_manhattan_distance(state):
+            return 0.5 * heuristics.calculate_manhattan_distance(state)
+
+        self.assertEqual(heuristics.a_star_search(half_manhattan_distance, None, False).depth, 20)
+        with self.assertRaisesRegex(ValueError, "heap"):
+            heuristics.a_star_search(half_manhattan_distance, None, False, frontier="bucket")
+        # whole number floats still fit in buckets
+        result = heuristics.a_star_search(lambda state: float(heuristics.calculate_manhattan_distance(state)), None,
+                                          False, frontier="bucket")
+        self.assertEqual(result.depth, 20)
+
+    def test_duplicates_rejected_when_pushed(self):
+        """Test the best g(n) table and tie breaking shrink the frontier and give the same nodes on every run"""
+        heuristics = Heuristics(self.depth_24_puzzle)
+        for frontier in ["heap", "bucket"]:
+            first, second = [heuristics.a_star_search(heuristics.calculate_manhattan_distance,
+                                                      heuristics.board.manhattan_delta, False, frontier=frontier)
+                             for _ in range(2)]
+            self.assertEqual(first.path_keys, second.path_keys)
+            self.assertEqual((first.nodes_expanded, first.max_queue_size),
+                             (second.nodes_expanded, second.max_queue_size))
+            # a frontier pushing every duplicate held 862 nodes
+            self.assertLess(first.max_queue_size, 862)
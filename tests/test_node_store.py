@@ -0,0 +1,79 @@
+import itertools
+import resource
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from board import Board
+from heuristics import BOARD, Heuristics
+from node_store import UNSEEN, NodeStore
+
+
+def exhaustion_memory(algorithm: str) -> int:
+    # kilobytes the peak resident set size grows by while searching every state reachable from an unsolvable puzzle
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = Heuristics([[8, 1, 2], [0, 4, 3], [7, 6, 5]], check_solvable=False).solve(algorithm)
+    assert (result.status, result.nodes_expanded) == ("exhausted", 181440)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+
+class TestNodeStore(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.depth_24_puzzle = [[0, 7, 2],
+                                [4, 6, 1],
+                                [3, 5, 8]]
+
+        self.no_solution_puzzle = [[8, 1, 2],
+                                   [0, 4, 3],
+                                   [7, 6, 5]]
+
+    def test_rank(self):
+        """Test every permutation gets its own rank, in lexicographic order"""
+        board = Board.of(2)
+        store = NodeStore(board)
+        keys = [board.pack([list(tiles[:2]), list(tiles[2:])]) for tiles in itertools.permutations(range(4))]
+        self.assertEqual([store.rank(key) for key in keys], list(range(24)))
+        store = NodeStore(BOARD)
+        self.assertEqual(store.rank(BOARD.pack([[0, 1, 2], [3, 4, 5], [6, 7, 8]])), 0)
+        self.assertEqual(store.rank(BOARD.pack([[8, 7, 6], [5, 4, 3], [2, 1, 0]])), store.states - 1)
+        self.assertEqual(len(store.depths), 362880)
+        self.assertRaises(ValueError, NodeStore, Board.of(4))
+
+    def test_path_replay(self):
+        """Test a path is rebuilt from the recorded moves alone"""
+        store = NodeStore(BOARD)
+        path = Heuristics(self.depth_20_puzzle).a_star_manhattan_distance(verbose=False).path_keys
+        for depth, (key, child_key) in enumerate(zip(path, path[1:])):
+            store.reach(store.rank(child_key), depth + 1, BOARD.find_blank(key), BOARD.find_blank(child_key))
+        self.assertEqual(store.path(BOARD.goal_key, BOARD.goal_blank, path[0]), path)
+        self.assertEqual(store.depths[store.rank(BOARD.goal_key)], 20)
+        self.assertEqual(store.depths[store.rank(BOARD.transpose(path[0]))], UNSEEN)
+
+    def test_compact_search(self):
+        """Test compact searches expand the same nodes as A* and find solutions just as short"""
+        for puzzle, depth in [(Heuristics.goal_state, 0), (self.depth_20_puzzle, 20), (self.depth_24_puzzle, 24)]:
+            heuristics = Heuristics(puzzle)
+            for algorithm, compact_algorithm in [("ucs", "compact_ucs"), ("manhattan", "compact_manhattan")]:
+                result = heuristics.solve(algorithm)
+                compact_result = heuristics.solve(compact_algorithm)
+                self.assertEqual(compact_result.depth, depth)
+                self.assertEqual(compact_result.path_keys[0], BOARD.pack(puzzle))
+                self.assertEqual(compact_result.nodes_expanded, result.nodes_expanded)
+                self.assertEqual(compact_result.max_queue_size, result.max_queue_size)
+        self.assertEqual(Heuristics(self.depth_20_puzzle).compact_a_star_manhattan_distance().depth, 20)
+        self.assertEqual(Heuristics(self.no_solution_puzzle).solve("compact_ucs").status, "unsolvable")
+        self.assertEqual(Heuristics(self.depth_24_puzzle, max_nodes=50).solve("compact_manhattan").status,
+                         "budget_exceeded")
+
+    def test_exhaustion_memory(self):
+        """Test searching every reachable state takes an order of magnitude less memory with a compact store"""
+        peaks = []
+        for algorithm in ("manhattan", "compact_manhattan"):
+            # a fresh process for each, so neither reuses memory the other freed, forked from a small server process
+            # since a spawned one starts out with the peak of this one
+            with ProcessPoolExecutor(1, mp_context=get_context("forkserver")) as executor:
+                peaks.append(executor.submit(exhaustion_memory, algorithm).result())
+        self.assertLess(peaks[1] * 10, peaks[0])
@@ -0,0 +1,82 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from benchmark import depth_layers
+from board import Board
+from heuristics import BOARD, Heuristics
+from parallel_search import ParallelAStar, fifteen_puzzles, main, owner
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.depth_24_puzzle = [[0, 7, 2],
+                                [4, 6, 1],
+                                [3, 5, 8]]
+
+        self.depth_28_15_puzzle = [[1, 10, 2, 7],
+                                   [13, 5, 3, 8],
+                                   [9, 6, 11, 4],
+                                   [14, 0, 15, 12]]
+
+        self.no_solution_puzzle = [[8, 1, 2],
+                                   [0, 4, 3],
+                                   [7, 6, 5]]
+
+    def test_owner(self):
+        """Test states are spread evenly over the workers"""
+        keys = [key for layer in depth_layers(BOARD, 12) for key in layer]
+        for workers in (2, 3, 4):
+            counts = [0] * workers
+            for key in keys:
+                counts[owner(key, workers)] += 1
+            self.assertLess(max(counts), 1.2 * len(keys) / workers)
+
+    def test_optimal_solutions(self):
+        """Test the parallel search finds optimal solutions with any number of workers"""
+        for workers in (1, 3):
+            with ParallelAStar(workers) as search:
+                for puzzle, depth in [(Heuristics.goal_state, 0), (self.depth_20_puzzle, 20),
+                                      (self.depth_24_puzzle, 24), (self.depth_28_15_puzzle, 28)]:
+                    result = search.solve(Heuristics(puzzle))
+                    self.assertEqual(result.depth, depth)
+                    path = result.path_keys
+                    self.assertEqual(path[0], Board.of(len(puzzle)).pack(puzzle))
+                    # every step is a legal move
+                    board = Board.of(len(puzzle))
+                    for key, next_key in zip(path, path[1:]):
+                        self.assertIn(next_key, [child for child, _, _ in board.successors(key, board.find_blank(key))])
+                self.assertGreater(search.rounds, 0)
+
+        with ParallelAStar(2, "ucs") as search:
+            self.assertEqual(search.solve(Heuristics(self.depth_20_puzzle)).depth, 20)
+        self.assertRaises(ValueError, ParallelAStar, 2, "pattern_database")
+
+    def test_unsolved(self):
+        """Test unsolvable puzzles, exhausted state spaces and node budgets end the parallel search"""
+        with ParallelAStar(2) as search:
+            self.assertEqual(search.solve(Heuristics(self.no_solution_puzzle)).status, "unsolvable")
+            # only 12 states are reachable on the 2 x 2 board
+            result = search.solve(Heuristics([[2, 1], [3, 0]], check_solvable=False))
+            self.assertEqual((result.status, result.nodes_expanded), ("exhausted", 12))
+            result = search.solve(Heuristics(self.depth_24_puzzle, max_nodes=100))
+            self.assertEqual(result.status, "budget_exceeded")
+            self.assertGreaterEqual(result.nodes_expanded, 100)
+            # the workers are still usable afterwards
+            self.assertEqual(search.solve(Heuristics(self.depth_20_puzzle)).depth, 20)
+
+    def test_speedup_report(self):
+        """Test the speedup report compares both searches on 8-puzzles and 15-puzzles"""
+        self.assertEqual(fifteen_puzzles(2, 20), fifteen_puzzles(2, 20))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--workers", "2", "--min-depth", "28", "--fifteen", "1"])
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["workers"], 2)
+        self.assertEqual([puzzle["size"] for puzzle in report["puzzles"]], [3, 3, 3, 3, 4])
+        self.assertEqual([puzzle["depth"] for puzzle in report["puzzles"]][:4], [28, 29, 30, 31])
+        self.assertGreater(report["speedup"], 0)
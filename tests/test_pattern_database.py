@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from heuristics import BOARD, Heuristics
+from pattern_database import PatternDatabase
+
+
+class TestPatternDatabase(unittest.TestCase):
+    def setUp(self):
+        # keep cached tables out of the user's cache directory
+        self.cache = tempfile.TemporaryDirectory()
+        os.environ["CS170_CACHE_DIR"] = self.cache.name
+        PatternDatabase.instances.clear()
+
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.depth_24_puzzle = [[0, 7, 2],
+                                [4, 6, 1],
+                                [3, 5, 8]]
+
+    def tearDown(self):
+        PatternDatabase.instances.clear()
+        del os.environ["CS170_CACHE_DIR"]
+        self.cache.cleanup()
+
+    def test_goal_cost_is_zero(self):
+        """Test the pattern database gives 0 for the goal state"""
+        self.assertEqual(PatternDatabase.get(BOARD)(BOARD.goal_key), 0)
+
+    def test_dominates_manhattan_and_admissible(self):
+        """Test the pattern database is at least manhattan distance and never above the optimal depth"""
+        heuristics = Heuristics(self.depth_24_puzzle)
+        for puzzle, depth in [(self.depth_20_puzzle, 20), (self.depth_24_puzzle, 24)]:
+            cost = heuristics.calculate_pattern_database(puzzle)
+            self.assertGreaterEqual(cost, heuristics.calculate_manhattan_distance(puzzle))
+            self.assertLessEqual(cost, depth)
+
+    def test_search_expands_fewer_nodes(self):
+        """Test A* with the pattern database finds the optimal depth with fewer expansions than manhattan"""
+        heuristics = Heuristics(self.depth_24_puzzle)
+        pattern_database_result = heuristics.a_star_pattern_database(verbose=False)
+        manhattan_result = heuristics.a_star_manhattan_distance(verbose=False)
+        self.assertEqual(pattern_database_result.depth, 24)
+        self.assertLess(pattern_database_result.nodes_expanded, manhattan_result.nodes_expanded)
+
+    def test_cached_tables_are_reloaded(self):
+        """Test tables are written to the cache directory and memory-mapped on the next load"""
+        built = PatternDatabase.get(BOARD)
+        for group in built.groups:
+            self.assertTrue(os.path.exists(os.path.join(self.cache.name, PatternDatabase.file_name(BOARD, group))))
+
+        loaded = PatternDatabase.load_or_build(BOARD, built.groups)
+        self.assertTrue(all(isinstance(table, memoryview) for table in loaded.tables))
+        self.assertEqual([bytes(table) for table in loaded.tables], [bytes(table) for table in built.tables])
@@ -0,0 +1,101 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from batch_solver import solve_batch
+from cs170_project1 import main
+from heuristics import Heuristics, packed_heuristic
+from search_profile import SearchProfile
+
+
+class TestSearchProfile(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+    def test_a_star_counters(self):
+        """Test a profiled A* search counts every part of the search consistently with its result"""
+        progress = []
+        profile = SearchProfile(progress=lambda p: progress.append(p.counters["expansions"]), progress_interval=50)
+        heuristics = Heuristics(self.depth_20_puzzle, profile=profile)
+        result = heuristics.a_star_linear_conflict(verbose=False)
+        self.assertIs(result.profile, profile)
+        counters = profile.counters
+        self.assertEqual(counters["expansions"], result.nodes_expanded)
+        self.assertEqual(counters["generations"], result.nodes_generated)
+        # the root is pushed too, and the goal is popped without being expanded
+        self.assertEqual(counters["pushes"], result.nodes_generated + 1)
+        self.assertEqual(counters["pops"], result.nodes_expanded + counters["stale_pops"] + 1)
+        self.assertEqual(counters["heuristic_calls"], counters["pushes"])
+        self.assertGreater(counters["duplicates"], 0)
+        self.assertEqual(progress, list(range(50, result.nodes_expanded + 1, 50)))
+        self.assertGreaterEqual(profile.timers["total"], profile.timers["heuristic"])
+
+        # incremental heuristics are counted as updates, and the profile starts over for every search
+        result = heuristics.a_star_manhattan_distance(verbose=False)
+        self.assertEqual(counters["heuristic_calls"], 1)
+        self.assertEqual(counters["heuristic_updates"], result.nodes_generated)
+        self.assertEqual(result.to_dict()["profile"]["counters"]["expansions"], result.nodes_expanded)
+
+    def test_progress_snapshots(self):
+        """Test progress callbacks see the counters of the search so far, not zeros until it's done"""
+        snapshots = []
+        profile = SearchProfile(progress=lambda p: snapshots.append(dict(p.counters)), progress_interval=20000)
+        depth_24_puzzle = [[0, 7, 2], [4, 6, 1], [3, 5, 8]]
+        result = Heuristics(depth_24_puzzle, profile=profile).uniform_cost_search(verbose=False)
+        self.assertGreater(result.nodes_expanded, 20000)
+        snapshot = snapshots[0]
+        self.assertEqual(snapshot["expansions"], 20000)
+        self.assertGreater(snapshot["generations"], 20000)
+        self.assertLess(snapshot["generations"], result.nodes_generated)
+        self.assertGreater(snapshot["duplicates"], 0)
+        # every child pushed, and the root
+        self.assertEqual(snapshot["pushes"], snapshot["generations"] + 1)
+        self.assertEqual(snapshot["pops"], snapshot["expansions"] + snapshot["stale_pops"])
+
+    def test_other_engines(self):
+        """Test other engines fill in the profile without frontier counters, and unprofiled results have none"""
+        for method in ["ida_star_linear_conflict", "bidirectional_manhattan_distance",
+                       "ara_star_manhattan_distance", "compact_a_star_manhattan_distance"]:
+            snapshots = []
+            profile = SearchProfile(progress=lambda p: snapshots.append(dict(p.counters)), progress_interval=100)
+            result = getattr(Heuristics(self.depth_20_puzzle, profile=profile), method)(verbose=False)
+            self.assertEqual(result.profile.counters["expansions"], result.nodes_expanded, method)
+            self.assertGreater(result.profile.counters["generations"], 0, method)
+            self.assertGreater(result.profile.counters["heuristic_calls"], 0, method)
+            self.assertNotIn("pushes", result.profile.counters, method)
+            self.assertNotIn("push", result.profile.timers, method)
+            self.assertGreater(snapshots[0]["generations"], 0, method)
+        result = Heuristics(self.depth_20_puzzle).a_star_manhattan_distance(verbose=False)
+        self.assertIsNone(result.profile)
+        self.assertNotIn("profile", result.to_dict())
+
+    def test_heuristic_calls(self):
+        """Test heuristic calls count the evaluations of the search, not rebuilding the solution path"""
+        heuristics = Heuristics(self.depth_20_puzzle, profile=SearchProfile())
+        calls = []
+        manhattan_distance = packed_heuristic(lambda key: calls.append(key) or
+                                              heuristics.calculate_manhattan_distance(key))
+        zero = packed_heuristic(lambda key: calls.append(key) or 0)
+        for search in [lambda: heuristics.compact_a_star_search(manhattan_distance, None, False),
+                       lambda: heuristics.ida_star_search(manhattan_distance, None, False),
+                       lambda: heuristics.bidirectional_search(manhattan_distance, zero, False)]:
+            calls.clear()
+            result = search()
+            self.assertEqual(result.depth, 20)
+            # the 21 states of the solution path are given their h(n) too, uncounted
+            self.assertEqual(result.profile.counters["heuristic_calls"], len(calls) - 21)
+
+    def test_profile_flag(self):
+        """Test --profile prints the profile interactively and adds it to batch results"""
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=["3", "7, 1, 2", "4, 8, 5", "6, 3, 0"]), redirect_stdout(output):
+            main(["--algorithm", "manhattan", "--profile"])
+        self.assertIn("Profile:", output.getvalue())
+        self.assertIn("heuristic_updates:", output.getvalue())
+
+        results = list(solve_batch([self.depth_20_puzzle], "manhattan", workers=1, profile=True))
+        self.assertEqual(results[0]["profile"]["counters"]["expansions"], results[0]["nodes_expanded"])
+        json.dumps(results)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from heuristics import BOARD, Heuristics
+from solution_cache import SolutionCache
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+
+        self.no_solution_puzzle = [[8, 1, 2],
+                                   [0, 4, 3],
+                                   [7, 6, 5]]
+
+    def test_repeated_solve_hits_cache(self):
+        """Test solving the same puzzle twice only searches once"""
+        cache = SolutionCache()
+        first = Heuristics(self.depth_20_puzzle).solve("manhattan", cache)
+        second = Heuristics(self.depth_20_puzzle).solve("manhattan", cache)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.nodes_expanded, 0)
+        self.assertEqual(second.path, first.path)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # other algorithms are cached separately
+        self.assertFalse(Heuristics(self.depth_20_puzzle).solve("misplaced", cache).cached)
+
+    def test_states_along_path_are_cached(self):
+        """Test every state on a solution path is answered from the cache with the rest of the path"""
+        cache = SolutionCache()
+        path = Heuristics(self.depth_20_puzzle).solve("manhattan", cache).path
+        self.assertEqual(len(cache), 21)
+
+        result = Heuristics(path[5]).solve("manhattan", cache)
+        self.assertTrue(result.cached)
+        self.assertEqual(result.depth, 15)
+        self.assertEqual(result.path, path[5:])
+
+    def test_transposed_states_hit(self):
+        """Test a state is answered from the cached solution of its transpose, with the path transposed back"""
+        cache = SolutionCache()
+        first = Heuristics(self.depth_20_puzzle).solve("manhattan", cache)
+        transposed = BOARD.unpack(BOARD.transpose(BOARD.pack(self.depth_20_puzzle)))
+        result = Heuristics(transposed).solve("manhattan", cache)
+        self.assertTrue(result.cached)
+        self.assertEqual(result.path[0], transposed)
+        self.assertEqual(result.path_keys, [BOARD.transpose(key) for key in first.path_keys])
+
+    def test_bounded_solutions_are_not_shared(self):
+        """Test weighted A* solutions are only cached for their initial state, with their bound, and anytime ones
+        cut short by the node budget aren't cached at all"""
+        cache = SolutionCache()
+        first = Heuristics(self.depth_20_puzzle).solve("weighted_manhattan", cache)
+        self.assertEqual(len(cache), 1)
+        second = Heuristics(self.depth_20_puzzle).solve("weighted_manhattan", cache)
+        self.assertTrue(second.cached)
+        self.assertEqual((second.path, second.bound), (first.path, 2.0))
+        self.assertFalse(Heuristics(first.path[1]).solve("weighted_manhattan", cache).cached)
+
+        Heuristics(self.depth_20_puzzle, max_nodes=100).solve("anytime_manhattan", cache)
+        self.assertFalse(Heuristics(self.depth_20_puzzle).solve("anytime_manhattan", cache).cached)
+        self.assertEqual(Heuristics(self.depth_20_puzzle).solve("anytime_manhattan", cache).bound, 1.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solutions.json")
+            cache.save(path)
+            loaded = SolutionCache(path=path)
+            self.assertEqual(len(loaded), len(cache))
+            self.assertFalse(Heuristics(first.path[2]).solve("weighted_manhattan", loaded).cached)
+
+    def test_unsolvable_results_are_cached(self):
+        """Test unsolvable puzzles are cached with their status"""
+        cache = SolutionCache()
+        Heuristics(self.no_solution_puzzle).solve("manhattan", cache)
+        result = Heuristics(self.no_solution_puzzle).solve("manhattan", cache)
+        self.assertTrue(result.cached)
+        self.assertEqual(result.status, "unsolvable")
+        self.assertIsNone(result.depth)
+
+    def test_least_recently_used_eviction(self):
+        """Test the cache never holds more than its maximum and evicts the least recently used entries first"""
+        cache = SolutionCache(max_entries=3)
+        path = Heuristics(self.depth_20_puzzle).solve("manhattan").path_keys
+        cache.store("manhattan", 3, path[0], "solved", path)
+        self.assertEqual(len(cache), 3)
+        # the initial state is the most recently stored, the goal end of the path was evicted
+        self.assertIsNotNone(cache.lookup("manhattan", 3, path[0]))
+        self.assertIsNone(cache.lookup("manhattan", 3, BOARD.goal_key))
+
+    def test_persistence(self):
+        """Test a saved cache is loaded back with the same solutions"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solutions.json")
+            cache = SolutionCache(path=path)
+            Heuristics(self.depth_20_puzzle).solve("manhattan", cache)
+            Heuristics(self.no_solution_puzzle).solve("manhattan", cache)
+            cache.save()
+
+            loaded = SolutionCache(path=path)
+            self.assertEqual(len(loaded), len(cache))
+            self.assertTrue(Heuristics(self.depth_20_puzzle).solve("manhattan", loaded).cached)
+            self.assertEqual(Heuristics(self.no_solution_puzzle).solve("manhattan", loaded).status, "unsolvable")
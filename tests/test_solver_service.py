@@ -0,0 +1,174 @@
+import asyncio
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from heuristics import Heuristics
+from load_generator import request_stream, run_load
+from solver_service import SolverService, request
+
+
+class TestSolverService(unittest.TestCase):
+    def setUp(self):
+        self.depth_20_puzzle = [[7, 1, 2],
+                                [4, 8, 5],
+                                [6, 3, 0]]
+        # threads instead of processes keep the tests quick, the service doesn't care which
+        self.executor = ThreadPoolExecutor(2)
+        self.service = SolverService(self.executor)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_node_budget(self):
+        """Test every search engine gives up with status budget_exceeded after expanding max_nodes nodes"""
+        for algorithm in ("manhattan", "ida_manhattan", "bidirectional_manhattan"):
+            result = Heuristics(self.depth_20_puzzle, max_nodes=10).solve(algorithm)
+            self.assertEqual(result.status, "budget_exceeded", algorithm)
+            self.assertEqual(result.nodes_expanded, 10, algorithm)
+            self.assertFalse(result.solved, algorithm)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                Heuristics(self.depth_20_puzzle, max_nodes=10).report(result)
+            self.assertIn("Gave up after expanding 10 nodes", output.getvalue())
+            # a budget already used up stops the search before it expands anything
+            self.assertEqual(Heuristics(self.depth_20_puzzle, max_nodes=0).solve(algorithm).nodes_expanded, 0)
+            # a big enough budget changes nothing
+            self.assertEqual(Heuristics(self.depth_20_puzzle, max_nodes=100000).solve(algorithm).depth, 20)
+
+    def test_solve(self):
+        """Test a request is answered with the search result, given as a nested list or a puzzle line"""
+        response = asyncio.run(self.service.solve({"id": 1, "puzzle": self.depth_20_puzzle}))
+        self.assertEqual(response["id"], 1)
+        self.assertEqual(response["status"], "solved")
+        self.assertEqual(response["depth"], 20)
+        self.assertEqual(response["algorithm"], "manhattan")
+        response = asyncio.run(self.service.solve({"puzzle": "7, 1, 2, 4, 8, 5, 6, 3, 0",
+                                                   "algorithm": "ida_manhattan"}))
+        self.assertEqual(response["depth"], 20)
+
+    def test_coalescing(self):
+        """Test requests for a puzzle that is already being solved wait for that search instead of starting another"""
+        async def solve_all():
+            return await asyncio.gather(*(self.service.solve({"id": i, "puzzle": self.depth_20_puzzle})
+                                          for i in range(3)),
+                                        self.service.solve({"id": 3, "puzzle": self.depth_20_puzzle, "max_nodes": 10}))
+
+        responses = asyncio.run(solve_all())
+        self.assertEqual([response["id"] for response in responses], [0, 1, 2, 3])
+        self.assertEqual([response["status"] for response in responses], ["solved"] * 3 + ["budget_exceeded"])
+        # a different node budget is a different search
+        self.assertEqual(self.service.stats, {"requests": 4, "searches": 2, "coalesced": 2, "timeouts": 0,
+                                              "invalid": 0, "errors": 0})
+        self.assertEqual(self.service.in_flight, {})
+
+    def test_timeout_and_budget(self):
+        """Test a request that isn't answered in time gets status timeout, and the service caps node budgets"""
+        service = SolverService(self.executor, timeout=0.001, max_nodes=5000)
+        self.assertEqual(service.node_budget(None), 5000)
+        self.assertEqual(service.node_budget(100), 100)
+        self.assertEqual(service.node_budget(10 ** 9), 5000)
+        for max_nodes in (-1, 0, 1.5, "100", True):
+            self.assertRaises(ValueError, service.node_budget, max_nodes)
+
+        async def solve_twice():
+            timed_out = await service.solve({"puzzle": self.depth_20_puzzle, "algorithm": "ucs"})
+            # waits for the search the first request gave up on
+            return timed_out, await service.solve({"puzzle": self.depth_20_puzzle, "algorithm": "ucs", "timeout": 30})
+
+        timed_out, response = asyncio.run(solve_twice())
+        self.assertEqual(timed_out["status"], "timeout")
+        self.assertEqual(response["status"], "budget_exceeded")
+        self.assertEqual(response["nodes_expanded"], 5000)
+        self.assertEqual(service.stats, {"requests": 2, "searches": 1, "coalesced": 1, "timeouts": 1, "invalid": 0,
+                                         "errors": 0})
+
+    def test_invalid_requests(self):
+        """Test malformed requests are answered with status invalid instead of breaking the service"""
+        requests = [{"id": 1}, {"id": 2, "puzzle": "1, 2, 3"}, {"id": 3, "puzzle": self.depth_20_puzzle,
+                                                                "algorithm": "nope"},
+                    {"id": 4, "puzzle": self.depth_20_puzzle, "timeout": "soon"}]
+        # node budgets that could get past the service's own
+        requests += [{"id": 5 + i, "puzzle": self.depth_20_puzzle, "max_nodes": max_nodes}
+                     for i, max_nodes in enumerate([-1, 0, 1.5, "100", True])]
+        for payload in requests:
+            response = asyncio.run(self.service.solve(payload))
+            self.assertEqual(response["id"], payload["id"])
+            self.assertEqual(response["status"], "invalid")
+            self.assertIn("error", response)
+        self.assertEqual(self.service.stats["invalid"], 9)
+        self.assertEqual(self.service.stats["searches"], 0)
+
+    def test_search_errors(self):
+        """Test a search that raises fails only its own request, with status error, also over TCP"""
+        fifteen_puzzle = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 0, 15]]
+        response = asyncio.run(self.service.solve({"id": 1, "puzzle": fifteen_puzzle, "algorithm": "distance_table"}))
+        self.assertEqual((response["id"], response["status"]), (1, "error"))
+        self.assertIn("8-puzzle", response["error"])
+        self.assertEqual(self.service.stats["errors"], 1)
+        self.assertEqual(self.service.in_flight, {})
+
+        async def session():
+            server = await self.service.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(json.dumps({"id": "bad", "puzzle": fifteen_puzzle, "algorithm": "compact_ucs"}).encode()
+                             + b"\n" + json.dumps({"id": "good", "puzzle": self.depth_20_puzzle}).encode() + b"\n")
+                # closing the sending side still gets both answers
+                writer.write_eof()
+                responses = [json.loads(await reader.readline()) for _ in range(2)]
+                writer.close()
+                await writer.wait_closed()
+            return responses
+
+        responses = {response["id"]: response for response in asyncio.run(session())}
+        self.assertEqual(responses["bad"]["status"], "error")
+        self.assertEqual((responses["good"]["status"], responses["good"]["depth"]), ("solved", 20))
+        self.assertEqual(self.service.stats["errors"], 2)
+
+    def test_connection(self):
+        """Test requests over TCP are answered one JSON line each, including bad JSON and the service counters"""
+        async def session():
+            server = await self.service.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                solved = await request(reader, writer, {"id": "a", "puzzle": self.depth_20_puzzle})
+                writer.write(b"not json\n[1, 2]\n")
+                bad = [json.loads(await reader.readline()) for _ in range(2)]
+                stats = await request(reader, writer, {"stats": True})
+                writer.close()
+                await writer.wait_closed()
+            return solved, bad, stats
+
+        solved, bad, stats = asyncio.run(session())
+        self.assertEqual((solved["id"], solved["depth"]), ("a", 20))
+        self.assertEqual([response["status"] for response in bad], ["invalid", "invalid"])
+        self.assertEqual(stats["stats"]["invalid"], 2)
+        self.assertEqual(stats["stats"]["searches"], 1)
+
+    def test_load_generator(self):
+        """Test the load generator's requests are all answered and repeated puzzles are coalesced or solved"""
+        puzzles = request_stream(40, 1, 170)
+        self.assertEqual(puzzles, request_stream(40, 1, 170))
+        # only 32 distinct puzzles to draw 40 requests from
+        self.assertLess(len(set(puzzles)), len(puzzles))
+
+        async def session():
+            server = await self.service.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await run_load("127.0.0.1", port, puzzles, concurrency=4, algorithm="ida_manhattan")
+
+        report = asyncio.run(session())
+        self.assertEqual(report["requests"], 40)
+        self.assertEqual(report["statuses"], {"solved": 40})
+        self.assertEqual(report["service"]["requests"], 40)
+        self.assertEqual(report["service"]["searches"] + report["service"]["coalesced"], 40)
+        latency = report["latency"]
+        self.assertLessEqual(latency["p50"], latency["p90"])
+        self.assertLessEqual(latency["p90"], latency["p99"])
+        self.assertLessEqual(latency["p99"], latency["max"])
+        self.assertGreater(report["throughput"], 0)
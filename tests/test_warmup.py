@@ -0,0 +1,93 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from board import Board
+from cs170_project1 import main
+from distance_table import DistanceTable
+from pattern_database import PatternDatabase
+from startup_benchmark import measure_startup
+from table_cache import HEADER_PREFIX, load_or_build_table, load_table, save_table
+from walking_distance import WalkingDistance
+from warmup import warmup
+
+
+def clear_instances():
+    for table in (DistanceTable, PatternDatabase, WalkingDistance):
+        table.instances.clear()
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        # every test gets an empty cache directory, and tables loaded from another one are dropped
+        self.cache = tempfile.TemporaryDirectory()
+        os.environ["CS170_CACHE_DIR"] = self.cache.name
+        clear_instances()
+
+    def tearDown(self):
+        clear_instances()
+        del os.environ["CS170_CACHE_DIR"]
+        self.cache.cleanup()
+
+    def test_table_format(self):
+        """Test tables written for another table format or header are rebuilt, and only those"""
+        path = os.path.join(self.cache.name, "table.bin")
+        builds = []
+
+        def build():
+            builds.append(1)
+            return b"\x01\x02\x03"
+
+        # a table saved before tables had a format version
+        with open(path, "wb") as file:
+            file.write(HEADER_PREFIX + b"test size=3\n\x09\x09\x09")
+        self.assertIsNone(load_table(path, "test size=3"))
+        self.assertEqual(bytes(load_or_build_table(path, "test size=3", build)), b"\x01\x02\x03")
+        self.assertEqual(bytes(load_or_build_table(path, "test size=3", build)), b"\x01\x02\x03")
+        self.assertEqual(len(builds), 1)
+        self.assertIsInstance(load_table(path, "test size=3"), memoryview)
+        self.assertIsNone(load_table(path, "test size=4"))
+        save_table(path, "test size=4", b"\x04")
+        self.assertEqual(bytes(load_or_build_table(path, "test size=4", build)), b"\x04")
+        self.assertEqual(len(builds), 1)
+
+    def test_walking_distance_cache(self):
+        """Test a walking distance table loaded from the cache directory is the one that was built"""
+        board = Board.of(4)
+        built = WalkingDistance.load_or_build(board)
+        self.assertEqual(os.listdir(self.cache.name), ["walking_distance_4x4.bin"])
+        loaded = WalkingDistance.load_or_build(board)
+        self.assertEqual(loaded.table, built.table)
+        key = board.pack([[5, 1, 2, 3], [9, 6, 7, 4], [13, 10, 11, 8], [0, 14, 15, 12]])
+        self.assertEqual(loaded(key), built(key))
+        self.assertEqual(loaded(board.goal_key), 0)
+
+    def test_warmup(self):
+        """Test warming up builds every table once, and later runs only load them"""
+        results = warmup([2, 3])
+        self.assertEqual([(result["table"], result["size"]) for result in results],
+                         [("walking_distance", 2), ("distance_table", 3), ("pattern_database", 3),
+                          ("walking_distance", 3)])
+        self.assertEqual(sorted(file for result in results for file in result["written"]),
+                         sorted(os.listdir(self.cache.name)))
+        self.assertEqual(len(os.listdir(self.cache.name)), 5)
+        clear_instances()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(["--warmup"]), 0)
+        self.assertEqual(output.getvalue().count("Loaded"), 3)
+        self.assertNotIn("Built", output.getvalue())
+        self.assertEqual(warmup([3], ["walking_distance"])[0]["written"], [])
+
+    def test_startup_benchmark(self):
+        """Test cold and warm starts are both measured in fresh processes"""
+        report = measure_startup(["walking_distance"], repeat=1)
+        self.assertEqual(report["repeat"], 1)
+        timings = report["results"]["walking_distance"]
+        for start in ("cold", "warm"):
+            self.assertEqual(sorted(timings[start]), ["first_solve", "import", "process"])
+            self.assertGreater(timings[start]["process"], timings[start]["import"])
+        self.assertGreater(timings["warm_speedup"], 0)
+        # measuring never touches the cache directory of this process
+        self.assertEqual(os.listdir(self.cache.name), [])